@@ -0,0 +1,285 @@
+"""Asyncio API, every call runs on a dedicated connection thread."""
+
+# pylint: disable=protected-access
+
+from asyncio import AbstractEventLoop, CancelledError, Semaphore, get_running_loop, wrap_future
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Any, AsyncGenerator, Callable, Generic, Iterable, Optional, Type, TypeVar
+from weakref import WeakKeyDictionary
+
+from .database import Database, Columns
+from .column import Column
+from .table import Table
+from .models import BaseModel, QueryBuilder
+from .query_builder.typings import Condition
+from .typings import Data, Orders
+
+T = TypeVar("T")
+ModelT = TypeVar("ModelT", bound=BaseModel)
+DEFAULT_MAX_PENDING = 64
+_DONE = object()
+
+__all__ = ["AsyncDatabase", "AsyncTable", "AsyncQueryBuilder"]
+
+
+class AsyncDatabase:
+    """Asyncio flavored Database. The connection is owned by a single thread,
+    awaiting callers are limited to `max_pending` in-flight jobs and cancelling
+    a running job interrupts the statement. The limit applies per event loop."""
+
+    def __init__(self, path: str, max_pending: int = DEFAULT_MAX_PENDING, **kwargs) -> None:
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="AsyncDB")
+        self._slots: WeakKeyDictionary[AbstractEventLoop, Semaphore] = WeakKeyDictionary()
+        self._max_pending = max_pending
+        self._running: object | None = None
+        self._running_lock = Lock()
+        self._database: Database = self._executor.submit(Database, path, **kwargs).result()
+
+    def _job(self, token: object, fn: Callable[..., T], *args, **kwargs) -> T:
+        with self._running_lock:
+            self._running = token
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._running_lock:
+                self._running = None
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run a callable on the connection thread"""
+        loop = get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = Semaphore(self._max_pending)
+        async with slots:
+            token = object()
+            fut = self._executor.submit(self._job, token, fn, *args, **kwargs)
+            try:
+                return await wrap_future(fut)
+            except CancelledError:
+                with self._running_lock:
+                    if self._running is token:
+                        self._database.sql.interrupt()
+                raise
+
+    @property
+    def database(self):
+        """Underlying synchronous database, pass this to `model()`"""
+        return self._database
+
+    async def create_table(self, table: str, columns: Columns):
+        """Create table"""
+        return AsyncTable(self, await self.run(self._database.create_table, table, columns))
+
+    async def table(self, table: str, columns: Optional[Iterable[Column]] = None):
+        """Fetch table"""
+        return AsyncTable(self, await self.run(self._database.table, table, columns))
+
+    async def delete_table(self, table: str):
+        """Delete an existing table"""
+        return await self.run(self._database.delete_table, table)
+
+    async def tables(self):
+        """Return tuple containing all table except internal tables"""
+        tables = await self.run(self._database.tables)
+        return tuple(AsyncTable(self, table) for table in tables)
+
+    async def check_table(self, table: str):
+        """Check if table is exists or not."""
+        return await self.run(self._database.check_table, table)
+
+    async def commit(self):
+        """Commit changes to database"""
+        return await self.run(self._database.commit)
+
+    async def rollback(self):
+        """Rollback changes"""
+        return await self.run(self._database.rollback)
+
+    def query(self, model: Type[ModelT]) -> "AsyncQueryBuilder[ModelT]":
+        """Return async Query Builder of a model bound to this database"""
+        return AsyncQueryBuilder(model, self)
+
+    def where(self, model: Type[ModelT], **kwargs) -> "AsyncQueryBuilder[ModelT]":
+        """Basic async select operation of a model"""
+        return self.query(model).where(**kwargs)
+
+    async def close(self):
+        """Close database and stop the connection thread"""
+        await self.run(self._database.close)
+        self._executor.shutdown(wait=False)
+
+    @property
+    def closed(self):
+        """Is database closed?"""
+        return self._database.closed
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.close()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {id(self)}>"
+
+
+class AsyncTable:
+    """Asyncio flavored Table"""
+
+    def __init__(self, parent: AsyncDatabase, table: Table) -> None:
+        self._parent = parent
+        self._table = table
+
+    @property
+    def name(self):
+        """Table name"""
+        return self._table.name
+
+    @property
+    def table(self):
+        """Underlying synchronous table"""
+        return self._table
+
+    async def select(self, *args, **kwargs):
+        """See `Table.select`"""
+        return await self._parent.run(self._table.select, *args, **kwargs)
+
+    async def select_one(self, *args, **kwargs):
+        """See `Table.select_one`"""
+        return await self._parent.run(self._table.select_one, *args, **kwargs)
+
+    async def paginate_select(self, *args, **kwargs) -> AsyncGenerator:
+        """See `Table.paginate_select`, use with `async for`. Leaving the loop
+        early closes the underlying generator on the connection thread."""
+        pages = self._table.paginate_select(*args, **kwargs)
+        try:
+            while (page := await self._parent.run(next, pages, _DONE)) is not _DONE:
+                yield page
+        finally:
+            await self._parent.run(pages.close)
+
+    async def insert(self, data: Data):
+        """See `Table.insert`"""
+        return await self._parent.run(self._table.insert, data)
+
+    async def insert_many(self, datas: list[Data]):
+        """See `Table.insert_many`"""
+        return await self._parent.run(self._table.insert_many, datas)
+
+    insert_multiple = insert_many
+
+    async def update(
+        self,
+        where: Condition | None = None,
+        data: Data | None = None,
+        limit: int = 0,
+        order: Optional[Orders] = None,
+    ):
+        """See `Table.update`"""
+        return await self._parent.run(self._table.update, where, data, limit, order)
+
+    async def update_one(
+        self, where: Condition | None = None, data: Data | None = None, order: Orders | None = None
+    ):
+        """See `Table.update_one`"""
+        return await self._parent.run(self._table.update_one, where, data, order)
+
+    async def delete(self, where: Condition = None, limit: int = 0, order: Optional[Orders] = None):
+        """See `Table.delete`"""
+        return await self._parent.run(self._table.delete, where, limit, order)
+
+    async def delete_one(self, where: Condition = None, order: Optional[Orders] = None):
+        """See `Table.delete_one`"""
+        return await self._parent.run(self._table.delete_one, where, order)
+
+    async def count(self):
+        """See `Table.count`"""
+        return await self._parent.run(self._table.count)
+
+    async def commit(self):
+        """Commit changes"""
+        return await self._parent.run(self._table.commit)
+
+    async def rollback(self):
+        """Rollback"""
+        return await self._parent.run(self._table.rollback)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}({self.name}) -> {self._parent!r}>"
+
+
+class AsyncQueryBuilder(Generic[ModelT]):
+    """Query builder for Model ORM whose terminal operations are awaitable. Wraps
+    a `QueryBuilder`, see it for the chained methods."""
+
+    def __init__(self, model: Type[ModelT], parent: AsyncDatabase) -> None:
+        self._builder: QueryBuilder[ModelT] = QueryBuilder(model)
+        self._parent = parent
+
+    @property
+    def builder(self):
+        """Underlying synchronous query builder"""
+        return self._builder
+
+    def throw(self):
+        """Set when fetch() returns nothing, will raise an error"""
+        self._builder.throw()
+        return self
+
+    def with_(self, *relations: str):
+        """Load relations of the fetched models, see `QueryBuilder.with_`"""
+        self._builder.with_(*relations)
+        return self
+
+    def with_count(self, related: Type[BaseModel] | str, alias: str | None = None):
+        """Set the amount of related models, see `QueryBuilder.with_count`"""
+        self._builder.with_count(related, alias)
+        return self
+
+    def with_sum(self, related: Type[BaseModel] | str, column: str, alias: str | None = None):
+        """Set the sum of a column of related models, see `QueryBuilder.with_sum`"""
+        self._builder.with_sum(related, column, alias)
+        return self
+
+    def where(self, **kwargs: Any):
+        """Sets conditioning"""
+        self._builder.where(**kwargs)
+        return self
+
+    def limit(self, value: int):
+        """Sets limit"""
+        self._builder.limit(value)
+        return self
+
+    def offset(self, value: int):
+        """Sets offset"""
+        self._builder.offset(value)
+        return self
+
+    def order_by(self, column: str, descending: bool = False):
+        """Order the query by a column"""
+        self._builder.order_by(column, descending)
+        return self
+
+    async def fetch(self) -> list[ModelT]:
+        """Fetch data from table"""
+        return await self._parent.run(self._builder.fetch)
+
+    async def fetch_one(self) -> ModelT | None:
+        """Fetch one data from table"""
+        return await self._parent.run(self._builder.fetch_one)
+
+    async def patch(self, **kwargs: Any):
+        """Update a data based on the filter according to passed keyword args"""
+        return await self._parent.run(self._builder.patch, **kwargs)
+
+    async def delete(self):
+        """Delete data based on the filter"""
+        return await self._parent.run(self._builder.delete)
+
+    async def count(self) -> int:
+        """Count how much data is within this operation"""
+        return await self._parent.run(self._builder.count)
+
+    update = patch
@@ -0,0 +1,122 @@
+"""Result cache of tables, see `Table.enable_cache`"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from re import compile as re_compile
+from threading import Lock
+from time import monotonic
+from typing import Any, Hashable
+
+DEFAULT_CACHE_SIZE = 256
+_PARAMETER = re_compile(r":(\w+)")
+
+__all__ = ["ResultCache", "HitCounter", "DEFAULT_CACHE_SIZE"]
+
+
+@lru_cache(maxsize=1024)
+def _canonical(query: str) -> tuple[str, tuple[str, ...]]:
+    """Query with positional placeholders and its parameter names, in order.
+    Built parameter names differ per build, the canonical query doesn't."""
+    return _PARAMETER.sub("?", query), tuple(_PARAMETER.findall(query))
+
+
+@dataclass(slots=True)
+class HitCounter:
+    """Hits and misses of lookups in a cache, guarded by the cache's own lock"""
+
+    hits: int = 0
+    misses: int = 0
+
+    def hit(self):
+        """Count a lookup that found its entry"""
+        self.hits += 1
+
+    def miss(self):
+        """Count a lookup that didn't"""
+        self.misses += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Hits, misses and hit rate"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class ResultCache:
+    """LRU of query results keyed by query and bound values. Holds at most `size`
+    results, each dropped `ttl` seconds after it was stored when `ttl` is set.
+
+    The whole cache is emptied by writes and when `PRAGMA data_version` reports
+    a commit from another connection."""
+
+    def __init__(self, size: int = DEFAULT_CACHE_SIZE, ttl: float | None = None) -> None:
+        if size < 1:
+            raise ValueError("Result cache needs room for at least 1 result")
+        self.size = size
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float | None, Any]] = OrderedDict()
+        self._lock = Lock()
+        self._version: Any = None
+        self._generation = 0
+        self._counter = HitCounter()
+
+    @staticmethod
+    def key(query: str, data: Any, fetch: str) -> Hashable | None:
+        """Cache key of a statement, None when its values can't be hashed"""
+        canonical, names = _canonical(query)
+        values = tuple(data[name] for name in names) if isinstance(data, dict) else tuple(data)
+        key = (canonical, fetch, values)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def lookup(self, key: Hashable, version: Any) -> tuple[bool, Any, int]:
+        """Cached result of `key` as `(hit, result, generation)`. Pass the
+        generation back to `store`. Everything is dropped when `version` changed."""
+        with self._lock:
+            if version != self._version:
+                self._clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > monotonic()):
+                self._entries.move_to_end(key)
+                self._counter.hit()
+                return True, entry[1], self._generation
+            if entry is not None:
+                del self._entries[key]
+            self._counter.miss()
+            return False, None, self._generation
+
+    def store(self, key: Hashable, value: Any, generation: int):
+        """Cache a result, unless the cache was cleared since its lookup"""
+        with self._lock:
+            if generation != self._generation:
+                return
+            expires = None if self.ttl is None else monotonic() + self.ttl
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def _clear(self):
+        self._entries.clear()
+        self._generation += 1
+
+    def clear(self):
+        """Drop every cached result"""
+        with self._lock:
+            self._clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Cached results, hits, misses and hit rate"""
+        with self._lock:
+            return {"size": len(self._entries), **self._counter.stats()}
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,8 +1,11 @@
 """SQLite Database"""
 
-from atexit import register as finalize
-from sqlite3 import OperationalError, connect
-from typing import Iterable, Literal, Optional
+import os
+from atexit import register as finalize, unregister
+from concurrent.futures import Future
+from contextlib import contextmanager, nullcontext
+from sqlite3 import Connection, OperationalError, connect
+from typing import Any, Callable, Iterable, Literal, Optional
 
 from sqlite_database._debug import if_debug_print
 
@@ -11,11 +14,13 @@ from .utils import (
     check_iter,
     check_one,
     dict_factory,
+    open_reader,
     sqlite_multithread_check,
 )
 from .column import BuilderColumn, Column
 from .query_builder.table_creation import extract_table_creations
-from .table import Table
+from .cache import ResultCache
+from .table import Table, _snapshots
 from .errors import DatabaseExistsError, DatabaseMissingError
 from .index import Index
 
@@ -25,8 +30,35 @@ __all__ = ["Database"]
 
 IGNORE_TABLE_CHECKS = ("sqlite_master", "sqlite_temp_schema", "sqlite_temp_master")
 
+# Bumped in forked children. Connections opened before the fork belong to the
+# parent: children reopen their own and park the inherited ones here, never
+# using nor closing them (closing could checkpoint or unlink the parent's WAL).
+_fork_generation = 0
+_inherited: list[Any] = []
+# Databases restored by unpickling, one per class, path and options per process
+_restored: dict[tuple, "Database"] = {}
 
-class Database: # pylint: disable=too-many-instance-attributes
+
+def _after_fork():
+    global _fork_generation  # pylint: disable=global-statement
+    _fork_generation += 1
+    _restored.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+def _restore_database(cls: type["Database"], path: str, options: dict[str, Any]):
+    """Unpickle a database, reusing the one already restored in this process"""
+    key = (cls, path, repr(sorted(options.items())))
+    database = _restored.get(key)
+    if database is None or database.closed:
+        database = _restored[key] = cls(path, **options)
+    return database
+
+
+class Database: # pylint: disable=too-many-instance-attributes,too-many-public-methods
     """Sqlite3 database, this provide basic integration.
 
     Custom flags:
@@ -35,6 +67,8 @@ class Database: # pylint: disable=too-many-instance-attributes
                  when a table exists"""
 
     def __init__(self, path: str, **kwargs) -> None:
+        self._options = dict(kwargs)
+        self._generation = _fork_generation
         kwargs["check_same_thread"] = sqlite_multithread_check() != 3
         self._path = path
         self._strict: bool = kwargs.get("strict", True)
@@ -47,6 +81,12 @@ class Database: # pylint: disable=too-many-instance-attributes
         self._config = None
         self._closed = False
         self._table_class = Table
+        self._result_caches: dict[str, ResultCache] = {}
+        # Known tables and their columns (None until a handle read them)
+        self._tables: dict[str, list[Column] | None] = {}
+        self._schema_version: Any = None
+        self._schema_changed = True
+        self._write_lock = nullcontext()
         if not self._closed or self.__dict__.get("_initiated", False) is False:
             finalize(self._finalizer)
             self._initiated = True
@@ -60,9 +100,133 @@ class Database: # pylint: disable=too-many-instance-attributes
     def _finalizer(self):
         self.close()
 
+    def _check_schema(self):
+        """Forget known tables when the schema changed since last time, whichever
+        connection changed it"""
+        self._schema_changed = False
+        sql = self.sql
+        operation = getattr(sql, "operation", None)
+        if operation is not None:
+            version = operation("PRAGMA schema_version", (), fetch="one")
+        else:
+            version = sql.execute("PRAGMA schema_version").fetchone()
+        if version != self._schema_version:
+            self._tables.clear()
+            self._schema_version = version
+
+    def _forget(self, *tables: str, results: bool = True):
+        """Forget tables whose schema changed, and their result caches unless
+        `results` is False"""
+        self._schema_changed = True
+        for table in tables:
+            self._tables.pop(table, None)
+            if results:
+                self._result_caches.pop(table, None)
+
+    def _remember(self, table: str, columns: list[Column]):
+        """Keep columns a handle read from the schema for the next handles"""
+        if table in self._tables:
+            self._tables[table] = list(columns)
+
+    def _invalidate(self, table: str | None = None):
+        """Empty the result cache of `table`, or all of them. Called on writes,
+        the schema is checked again before the next known table is used."""
+        self._schema_changed = True
+        if table is None:
+            for cache in tuple(self._result_caches.values()):
+                cache.clear()
+        elif (cache := self._result_caches.get(table)) is not None:
+            cache.clear()
+
+    @property
+    def _stale(self):
+        """Were the connections inherited from a parent process?"""
+        return self._generation != _fork_generation
+
+    def _reconnect(self):
+        """Reopen connections in a forked child, parking the inherited ones"""
+        _inherited.append(self._database)
+        self._generation = _fork_generation
+        self._kwargs = {
+            key: value for key, value in self._options.items() if key not in ("strict", "forgive")
+        }
+        self._kwargs["check_same_thread"] = sqlite_multithread_check() != 3
+        self._create_connection()
+
+    def _restore_options(self) -> dict[str, Any]:
+        """Constructor keyword arguments used to reopen this database elsewhere"""
+        return dict(self._options)
+
+    def __reduce__(self):
+        if self._memory:
+            raise TypeError(f"Cannot pickle in-memory {type(self).__name__}")
+        return _restore_database, (type(self), self._path, self._restore_options())
+
+    @contextmanager
+    def _reading(self):
+        """Borrow a connection for read-only statements. Plain databases only have one."""
+        yield self.sql
+
+    @contextmanager
+    def _streaming(self):
+        """Connection for a stream, held while the stream is suspended"""
+        with self._reading() as conn:
+            yield conn
+
+    def _open_reader(self) -> Connection | None:
+        """Open a new read-only connection, None if this database cannot be shared"""
+        if self._memory:
+            return None
+        return open_reader(self._path, self._kwargs.get("timeout", 5.0))
+
+    @contextmanager
+    def _scanning(self):
+        """Connection for a long read running next to others, closed afterwards.
+        Only used for file databases."""
+        conn = self._open_reader()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def snapshot(self):
+        """Pin one read transaction for the block, so every select made within it
+        (in the current context) sees the same state of the database. Writes made
+        meanwhile are not visible and, in WAL mode, not blocked either. Nested
+        snapshots share the outer one. File databases only."""
+        pinned = _snapshots.get()
+        if self in pinned:
+            yield self
+            return
+        conn = self._open_reader()
+        if conn is None:
+            raise ValueError("In-memory databases cannot take snapshots")
+        try:
+            # The read transaction, and so the snapshot, starts at the first read
+            conn.execute("BEGIN")
+            conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchall()
+            token = _snapshots.set(pinned | {self: conn})
+            try:
+                yield self
+            finally:
+                _snapshots.reset(token)
+        finally:
+            conn.close()
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Run `fn` against this database and return its future. Plain databases
+        run it right away, see `DatabaseWorker.submit` for the queued flavor."""
+        fut: Future = Future()
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            fut.set_exception(exc)
+        return fut
+
     def cursor(self) -> WithCursor:
         """Create cursor"""
-        return self._database.cursor(WithCursor)  # type: ignore
+        return self.sql.cursor(WithCursor)  # type: ignore
 
     def create_table(self, table: str, columns: Columns):
         """Create table
@@ -74,7 +238,7 @@ class Database: # pylint: disable=too-many-instance-attributes
         Returns:
             Table: Newly created table
         """
-        columns = (
+        columns = tuple(
             column.to_column() if isinstance(column, BuilderColumn) else column
             for column in columns
         )
@@ -87,9 +251,9 @@ class Database: # pylint: disable=too-many-instance-attributes
             return self.table(table, columns)
 
         try:
-            cursor = self._database.cursor()
+            cursor = self.sql.cursor()
             cursor.execute(query)
-            self._database.commit()
+            self.sql.commit()
         except OperationalError as error:
             if "already exists" in str(error):
                 dberror = DatabaseExistsError(f"table {table} already exists.")
@@ -97,8 +261,10 @@ class Database: # pylint: disable=too-many-instance-attributes
                 raise dberror from error
             error.add_note(f"Query: {query}")
             raise error
+        self._forget(table)
         table_ = self.table(table, columns)
         table_._deleted = False  # pylint: disable=protected-access
+        self._tables[table] = list(columns)
         return table_
 
     def delete_table(self, table: str):
@@ -109,12 +275,19 @@ class Database: # pylint: disable=too-many-instance-attributes
         """
         check_one(table)
         table_ = self.table(table)
-        self._database.cursor().execute(f"drop table {table}")
+        self.sql.cursor().execute(f"drop table {table}")
+        self._forget(table)
         # pylint: disable-next=protected-access
         table_._delete_hook()  # pylint: disable=protected-access
 
     def table(self, table: str, __columns: Optional[Iterable[Column]] = None):  # type: ignore
-        """fetch table"""
+        """fetch table. Every call returns a new handle, tables already seen skip
+        the existence check and share their columns, until the schema changes.
+        The schema is only checked again after a write through this database."""
+        if self._schema_changed:
+            self._check_schema()
+        if __columns is None and table in self._tables:
+            return self._table_class(self, table, self._tables[table])
 
         if self._strict and not self.check_table(table):
             raise DatabaseMissingError(f"table {table} does not exists.")
@@ -125,6 +298,8 @@ class Database: # pylint: disable=too-many-instance-attributes
             dberror = DatabaseMissingError(f"table {table} does not exists")
             dberror.add_note(f"{type(exc).__name__}: {exc!s}")
             raise dberror from None
+        if __columns is None:
+            self._tables[table] = None
         return this_table
 
     def reset_table(self, table: str, columns: Columns) -> Table:
@@ -141,6 +316,7 @@ class Database: # pylint: disable=too-many-instance-attributes
         cursor = self.sql.cursor()
         cursor.execute(f"alter table {old_table} rename to {new_table}")
         self.sql.commit()
+        self._forget(old_table, new_table)
         return self.table(new_table)
 
     def check_table(self, table: str):
@@ -164,6 +340,7 @@ class Database: # pylint: disable=too-many-instance-attributes
         """Create an index"""
         with self.sql as dbcursor:
             dbcursor.execute(Index(name, target, columns, unique).build_sql())
+        self._forget(target, results=False)
 
     def delete_index(self, name: str | Index, exists_ok: bool = False):
         """Drop an index"""
@@ -172,6 +349,7 @@ class Database: # pylint: disable=too-many-instance-attributes
         with self.sql as dbcursor:
             if_ok = "if exists" if exists_ok else ""
             dbcursor.execute(f"drop index {if_ok} {_name}")
+        self._schema_changed = True
 
     def __repr__(self) -> str:
         return f"<{type(self).__name__} {id(self)}>"
@@ -180,11 +358,10 @@ class Database: # pylint: disable=too-many-instance-attributes
         """Close database"""
         if self._closed:
             return
-        self._database.close()
-        if self.path == ":memory:":
-            self._closed = True
-            return
+        if not self._stale:
+            self._database.close()
         self._closed = True
+        unregister(self._finalizer)
 
     def tables(self) -> tuple[Table, ...]:
         """Return tuple containing all table except internal tables"""
@@ -197,31 +374,33 @@ class Database: # pylint: disable=too-many-instance-attributes
 
     def commit(self):
         """Commit changes to database"""
-        self._database.commit()
+        self.sql.commit()
+        self._invalidate()
 
     def rollback(self):
         """Rollback changes"""
-        self._database.rollback()
+        self.sql.rollback()
+        self._invalidate()
 
     def foreign_pragma(self, bool_state: Literal["ON", "OFF", ""] = ""):
         """Enable/disable foreign key pragma"""
         if bool_state not in ("ON", "OFF", ""):
             raise ValueError("Either ON/OFF for foreign key pragma.")
-        return self._database.execute(
+        return self.sql.execute(
             f"PRAGMA foreign_keys{'='+bool_state if bool_state else ''}"
         ).fetchone()  # pylint: disable=line-too-long
 
     def optimize(self):
         """Optimize current database"""
-        return self._database.execute("PRAGMA optimize").fetchone()
+        return self.sql.execute("PRAGMA optimize").fetchone()
 
     def shrink_memory(self):
         """Shrink memories from database as much as it can."""
-        return self._database.execute("PRAGMA shrink_memory").fetchone()
+        return self.sql.execute("PRAGMA shrink_memory").fetchone()
 
     def vacuum(self):
         """Vacuum this database"""
-        return self._database.execute("VACUUM").fetchone()
+        return self.sql.execute("VACUUM").fetchone()
 
     @property
     def closed(self):
@@ -236,6 +415,11 @@ class Database: # pylint: disable=too-many-instance-attributes
             return
         raise ValueError("Expected non-false/non-null value")
 
+    @property
+    def _memory(self):
+        """Is this an in-memory database?"""
+        return str(self._path) in ("", ":memory:") or "mode=memory" in str(self._path)
+
     @property
     def path(self):
         """Path to SQL Connection"""
@@ -243,5 +427,7 @@ class Database: # pylint: disable=too-many-instance-attributes
 
     @property
     def sql(self):
-        """SQL Connection"""
+        """SQL Connection, reopened on first use in a forked child"""
+        if self._generation != _fork_generation and not self._closed:
+            self._reconnect()
         return self._database
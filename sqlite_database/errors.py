@@ -3,6 +3,9 @@
 class Rejection(RuntimeError):
     """Cannot push into worker db"""
 
+class DeadlineExceeded(Rejection):
+    """Job deadline passed before the worker got to it"""
+
 class DependencyError(ImportError):
     """Specific dependency is missing"""
 
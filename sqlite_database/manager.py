@@ -0,0 +1,223 @@
+"""Database manager, keeps a bounded LRU of open per-tenant database files"""
+
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from os import altsep, sep
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable
+
+from .cache import HitCounter
+from .database import Database
+
+DEFAULT_MAX_OPEN = 64
+
+__all__ = ["DatabaseManager"]
+
+
+@dataclass(slots=True)
+class _Entry:
+    """Open database of a tenant, when it was last used and its active leases"""
+
+    database: Database
+    used: float = field(default_factory=monotonic)
+    leases: int = 0
+
+
+class DatabaseManager:
+    """Per-tenant databases, opened on demand with at most `max_open` of them open.
+
+    Opening a tenant past the limit closes the least recently used one. With
+    `idle_timeout` set, databases unused for that many seconds are closed on the
+    next access or by `close_idle()`. Open databases are reused as they are,
+    warm page cache included.
+
+    `path` is a template formatted with `tenant` (e.g. "data/{tenant}.db") or a
+    callable returning the path of a tenant. Other keyword arguments are passed
+    to `database_class`.
+
+    A database returned by `get()` may be closed by a later eviction, hold it
+    with `lease()` while working with it. Leased databases are never evicted,
+    the manager goes over `max_open` instead.
+
+    Databases are opened outside the manager lock, callers of other tenants
+    don't wait on it. Concurrent callers of the same tenant share one open."""
+
+    def __init__(
+        self,
+        path: str | Callable[[str], str],
+        max_open: int = DEFAULT_MAX_OPEN,
+        idle_timeout: float | None = None,
+        database_class: type[Database] = Database,
+        **kwargs,
+    ) -> None:
+        if max_open < 1:
+            raise ValueError("Database manager needs room for at least 1 database")
+        self._path = path
+        self._max_open = max_open
+        self._idle_timeout = idle_timeout
+        self._connect: Callable[[str], Database] = partial(database_class, **kwargs)
+        self._open: OrderedDict[str, _Entry] = OrderedDict()
+        self._opening: dict[str, Lock] = {}
+        self._lock = Lock()
+        self._counter = HitCounter()
+        self._closes = Counter(evictions=0, expired=0)
+        self._closed = False
+
+    def path_for(self, tenant: str) -> str:
+        """Database path of a tenant"""
+        if callable(self._path):
+            return self._path(tenant)
+        if tenant in ("", ".", "..") or sep in tenant or (altsep and altsep in tenant):
+            raise ValueError(f"Invalid tenant name: {tenant!r}")
+        return self._path.format(tenant=tenant)
+
+    def _expire(self, now: float, idle: float, closing: list[Database]):
+        """Drop unleased entries unused for `idle` seconds, caller holds the lock"""
+        for tenant, entry in tuple(self._open.items()):
+            if now - entry.used <= idle:
+                break  # Entries are in least recently used order
+            if not entry.leases:
+                del self._open[tenant]
+                closing.append(entry.database)
+                self._closes["expired"] += 1
+
+    def _evict(self, keep: str, closing: list[Database]):
+        """Drop least recently used unleased entries above the limit, but never
+        `keep`, the one being handed out. Caller holds the lock."""
+        excess = len(self._open) - self._max_open
+        for tenant, entry in tuple(self._open.items()):
+            if excess <= 0:
+                break
+            if not entry.leases and tenant != keep:
+                del self._open[tenant]
+                closing.append(entry.database)
+                self._closes["evictions"] += 1
+                excess -= 1
+
+    def _lookup(self, tenant: str) -> _Entry | None:
+        """Entry of a tenant if its database is open, caller holds the lock"""
+        if self._closed:
+            raise ConnectionError("Database manager is already closed.")
+        entry = self._open.get(tenant)
+        if entry is not None and entry.database.closed:
+            del self._open[tenant]
+            entry = None
+        return entry
+
+    def _use(self, tenant: str, entry: _Entry, lease: int) -> list[Database]:
+        """Hand out `entry`, returns the databases it pushed out to be closed
+        once the lock is released. Caller holds the lock."""
+        closing: list[Database] = []
+        self._open[tenant] = entry
+        self._open.move_to_end(tenant)
+        entry.used = monotonic()
+        entry.leases += lease
+        if self._idle_timeout is not None:
+            self._expire(entry.used, self._idle_timeout, closing)
+        self._evict(tenant, closing)
+        return closing
+
+    def _open_tenant(self, tenant: str, lease: int, opening: Lock):
+        """Open the database of a tenant without holding the manager lock.
+        Callers of the same tenant wait on `opening` and reuse the result."""
+        with opening:
+            with self._lock:
+                entry = self._lookup(tenant)
+                if entry is not None:  # Opened while this caller waited
+                    self._counter.hit()
+                    return entry, self._use(tenant, entry, lease)
+            database = self._connect(self.path_for(tenant))
+            with self._lock:
+                if not self._closed:
+                    self._counter.miss()
+                    entry = _Entry(database)
+                    return entry, self._use(tenant, entry, lease)
+        database.close()
+        raise ConnectionError("Database manager is already closed.")
+
+    def _acquire(self, tenant: str, lease: int) -> _Entry:
+        closing: list[Database] = []
+        opening: Lock | None = None
+        with self._lock:
+            entry = self._lookup(tenant)
+            if entry is not None:
+                self._counter.hit()
+                closing = self._use(tenant, entry, lease)
+            else:
+                opening = self._opening.setdefault(tenant, Lock())
+        if opening is not None:
+            try:
+                entry, closing = self._open_tenant(tenant, lease, opening)
+            finally:
+                with self._lock:
+                    if self._opening.get(tenant) is opening:
+                        del self._opening[tenant]
+        for database in closing:
+            database.close()
+        return entry
+
+    def get(self, tenant: str) -> Database:
+        """Database of a tenant, opened if it's not open yet"""
+        return self._acquire(tenant, 0).database
+
+    __getitem__ = get
+
+    @contextmanager
+    def lease(self, tenant: str):
+        """Database of a tenant, kept open until the block ends"""
+        entry = self._acquire(tenant, 1)
+        try:
+            yield entry.database
+        finally:
+            with self._lock:
+                entry.leases -= 1
+                entry.used = monotonic()
+                if self._open.get(tenant) is entry:
+                    self._open.move_to_end(tenant)
+
+    def close_idle(self, idle: float | None = None) -> int:
+        """Close databases unused for `idle` seconds (default `idle_timeout`, or
+        every unleased one without it). Returns the amount of closed databases."""
+        closing: list[Database] = []
+        with self._lock:
+            limit = idle if idle is not None else self._idle_timeout
+            self._expire(monotonic(), -1.0 if limit is None else limit, closing)
+        for database in closing:
+            database.close()
+        return len(closing)
+
+    def stats(self) -> dict[str, Any]:
+        """Open databases, cache hits, misses, evictions and idle closes"""
+        with self._lock:
+            return {"open": len(self._open), **self._counter.stats(), **self._closes}
+
+    def __contains__(self, tenant: str):
+        return tenant in self._open
+
+    def __len__(self):
+        return len(self._open)
+
+    @property
+    def closed(self):
+        """Is the manager closed?"""
+        return self._closed
+
+    def close(self):
+        """Close every open database"""
+        with self._lock:
+            self._closed = True
+            entries, self._open = tuple(self._open.values()), OrderedDict()
+        for entry in entries:
+            entry.database.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} open={len(self._open)}/{self._max_open} {id(self)}>"
@@ -24,6 +24,9 @@ from .helpers import (
 
 from .helpers import VALID_HOOKS_NAME, hook, validate, initiate_hook, initiate_validators
 from .query_builder import QueryBuilder
+from .identity import IdentityMap, current_unit, unit_of_work
+from .relations import Relation, register
+from .hydration import Hydrator
 from .errors import ConstraintError
 from ..errors import DatabaseExistsError
 from ..database import Database, Table
@@ -51,8 +54,10 @@ class BaseModel:  # pylint: disable=too-few-public-methods,too-many-public-metho
     __hooks__: "dict[str, list[Callable[[Self], None] | str]]" = {}
     __hidden__: tuple[str, ...] = ()
     __auto_id__: Callable[[], Any] = noop_autoid
+    __identity__: IdentityMap | None = None
     _tbl: Table
     _primary: str | None
+    _relations: dict[str, Relation] = {}
 
     @classmethod
     def create_table(cls, db: Database):
@@ -100,6 +105,24 @@ class BaseModel:  # pylint: disable=too-few-public-methods,too-many-public-metho
         except DatabaseExistsError:
             cls._tbl = db.table(cls.__table_name__.lower())
 
+    @classmethod
+    def _identities(cls) -> IdentityMap | None:
+        """Identity map in use, the current unit of work or `__identity__`"""
+        if not cls._primary:
+            return None
+        unit = current_unit()
+        return unit if unit is not None else cls.__identity__
+
+    @classmethod
+    def _hydrate(cls, columns: tuple[str, ...], rows: list[tuple]) -> list[Self]:
+        """Instances of rows with these columns, see `Hydrator`"""
+        if not rows:
+            return []
+        hydrator = cls.__dict__.get("_hydrator")
+        if hydrator is None:
+            hydrator = cls._hydrator = Hydrator(cls)
+        return hydrator.hydrate(columns, rows)
+
     @classmethod
     def _execute_hooks(cls, name: str, instance: Self):
         for hook_fn in cls.__hooks__.get(name, ()):
@@ -159,29 +182,109 @@ class BaseModel:  # pylint: disable=too-few-public-methods,too-many-public-metho
         if primary and cls.__auto_id__ and not id_present:  # type: ignore
             kwargs[primary] = cls.__auto_id__()  # type: ignore
         instance = cls(**kwargs)
-
-        cls._execute_hooks("before_create", instance)
-        for key in kwargs:
-            cls._execute_validators(key, instance)
-        cls._tbl.insert(kwargs)
-        cls._execute_hooks("after_create", instance)
+        instance._insert(kwargs)
         return instance
 
+    def _insert(self, values: dict[str, Any]):
+        self._execute_hooks("before_create", self)
+        for key in values:
+            self._execute_validators(key, self)
+        self._tbl.insert(values)
+        self._remember()
+        identities = self._identities()
+        if identities is not None:
+            identities.replace(self)
+        self._execute_hooks("after_create", self)
+
+    def _values(self) -> dict[str, Any]:
+        return {field.name: getattr(self, field.name) for field in fields(self)}  # type: ignore
+
+    def _remember(self):
+        """Take current values as the stored ones, see `changes()`"""
+        self.__dict__["_loaded"] = self._values()
+
+    def changes(self) -> dict[str, Any]:
+        """Fields changed since the model was loaded or last written, with their
+        current values. Every field for models that were never stored."""
+        loaded = self.__dict__.get("_loaded")
+        current = self._values()
+        if loaded is None:
+            return current
+        return {
+            name: value
+            for name, value in current.items()
+            if name not in loaded or loaded[name] != value
+        }
+
+    def is_dirty(self, *names: str) -> bool:
+        """Has any field (or any of `names`) changed since the model was loaded?"""
+        changes = self.changes()
+        return any(name in changes for name in names) if names else bool(changes)
+
+    def _write(self, primary: str, values: dict[str, Any]):
+        """Update the stored row with `values`"""
+        loaded = self.__dict__.get("_loaded")
+        key = loaded[primary] if loaded and primary in loaded else getattr(self, primary)
+        self._execute_hooks("before_update", self)
+        for name in values:
+            self._execute_validators(name, self)
+        self._tbl.update({primary: key}, values)
+        for name, value in values.items():
+            setattr(self, name, value)
+        if loaded is not None:
+            loaded.update(values)
+        identities = self._identities()
+        if identities is not None:
+            if getattr(self, primary) != key:
+                identities.clear()  # Cascaded to rows referencing the old key
+            else:
+                identities.replace(self)
+        self._execute_hooks("after_update", self)
+
     def update(self, __primary: str | object = NULL, /, **kwargs):
-        """Update current data"""
+        """Update current data. Values the row already has are left out, nothing
+        is run when none changes."""
         # pylint: disable=protected-access
         primary = self._primary or __primary
         if primary is NULL:
             raise ValueError(
                 "The table does not have any primary key, cannot update due to undefined selection"
             )
-        self._execute_hooks("before_update", self)
-        for key in kwargs:
-            self._execute_validators(key, self)
-        self._tbl.update({primary: getattr(self, primary)}, kwargs)  # type: ignore
-        for key, value in kwargs.items():
-            setattr(self, key, value)
-        self._execute_hooks("after_update", self)
+        loaded = self.__dict__.get("_loaded")
+        values = kwargs
+        if loaded is not None:
+            values = {
+                name: value
+                for name, value in kwargs.items()
+                if name not in loaded or loaded[name] != value
+            }
+        for name in kwargs.keys() - values.keys():
+            setattr(self, name, kwargs[name])
+        if values:
+            self._write(primary, values)  # type: ignore
+        return self
+
+    def save(self, __primary: str | object = NULL, /):
+        """Write the fields changed since the model was loaded, nothing is run when
+        none did. Models that were never stored are inserted."""
+        if "_loaded" not in self.__dict__:
+            values = self._values()
+            primary = self._primary
+            if primary and self.__auto_id__ and not values[primary]:  # type: ignore
+                auto_id = self.__auto_id__()  # type: ignore
+                if auto_id is not None:
+                    setattr(self, primary, auto_id)
+                    values[primary] = auto_id
+            self._insert(values)
+            return self
+        primary = self._primary or __primary
+        if primary is NULL:
+            raise ValueError(
+                "The table does not have any primary key, cannot save due to undefined selection"
+            )
+        changes = self.changes()
+        if changes:
+            self._write(primary, changes)  # type: ignore
         return self
 
     def delete(self, __primary=NULL, /):
@@ -194,13 +297,22 @@ class BaseModel:  # pylint: disable=too-few-public-methods,too-many-public-metho
             )
         self._execute_hooks("before_delete", self)
         self._tbl.delete_one({primary: getattr(self, primary)})  # type: ignore
+        self.__dict__.pop("_loaded", None)
+        self._forget_all()
         self._execute_hooks("after_delete", self)
 
     @classmethod
     def bulk_create(cls, records: list[dict]):
         """Insert multiple records at once."""
         cls._tbl.insert_many(records)
-        return [cls(**record) for record in records]  # Return list of instances
+        instances = [cls(**record) for record in records]
+        for instance in instances:
+            instance._remember()
+        identities = cls._identities()
+        if identities is not None:
+            for instance in instances:
+                identities.replace(instance)
+        return instances
 
     @classmethod
     def bulk_update(cls, records: list[dict], key: str | object = NULL):
@@ -214,11 +326,23 @@ class BaseModel:  # pylint: disable=too-few-public-methods,too-many-public-metho
             if key_ not in record:
                 raise ValueError(f"Missing primary key '{key_}' in record: {record}")
             cls._tbl.update({key_: record[key_]}, record)  # type: ignore
+            identities = cls._identities()
+            if identities is not None:
+                identities.discard(cls, record[key_])
 
     @classmethod
     def bulk_delete(cls, keys: list[Any], key: str):
         """Delete multiple records using a primary key."""
         cls._tbl.delete({key: in_(keys)})
+        cls._forget_all()
+
+    @classmethod
+    def _forget_all(cls):
+        """Empty the identity map after deletes, rows of other models may be
+        gone too through ON DELETE clauses"""
+        identities = cls._identities()
+        if identities is not None:
+            identities.clear()
 
     @classmethod
     def first_or_fail(cls, **kwargs):
@@ -272,7 +396,11 @@ class BaseModel:  # pylint: disable=too-few-public-methods,too-many-public-metho
     def atomic(cls):
         """Perform operations within a transaction."""
         with cls._tbl:  # Assuming `transaction()` exists
-            yield
+            try:
+                yield
+            except BaseException:
+                cls._forget_all()  # Instances may hold rolled back values
+                raise
 
     @classmethod
     def upsert(cls, key: str, **kwargs):
@@ -303,65 +431,58 @@ class BaseModel:  # pylint: disable=too-few-public-methods,too-many-public-metho
         """Raw SQL query"""
         return self._tbl._sql.execute(query, params)  # pylint: disable=protected-access
 
+    @classmethod
+    def _relation_to(cls, related: "Type[BaseModel]", *kinds: str) -> Relation | None:
+        """First relation of one of `kinds` to `related`, from the relations
+        registered by `model()`"""
+        for relation in cls._relations.values():
+            if relation.table == related.__table_name__ and relation.kind in kinds:
+                return relation
+        return None
+
     def has_many(self, related: "Type[T]", foreign_key: str | object = NULL):
         """Ensure related_model has a Foreign key pointing to self"""
-        foreign_key = None
-
         if not self._primary:
             raise ConstraintError(
                 f"The table {self.__table_name__} does not have any primary key "
                 "required for has_many()"
             )
 
-        # Scan __schema__ of related model to find a Foreign key linking back
-        for constraint in related.__schema__:
-            if isinstance(constraint, Foreign):
-                table_ref, _ = constraint.target.split("/")  # type: ignore
-                if table_ref == self.__class__.__name__.lower():
-                    foreign_key = constraint.column
-                    break
-
-        if not foreign_key:
-            raise ValueError(
-                f"{related.__name__} does not have a Foreign key pointing "
-                f"to {self.__class__.__name__}"
-            )
+        key = self._primary
+        if foreign_key is NULL:
+            relation = self._relation_to(related, "has_many", "has_one")
+            if relation is None:
+                raise ValueError(
+                    f"{related.__name__} does not have a Foreign key pointing "
+                    f"to {self.__class__.__name__}"
+                )
+            foreign_key, key = relation.remote, relation.local
 
         # Perform the actual query
-        return related.where(**{foreign_key: getattr(self, self._primary)}).fetch()
+        return related.where(**{foreign_key: getattr(self, key)}).fetch()  # type: ignore
 
     def belongs_to(self, related_model: "Type[T]"):
         """Retrieve the related model that this instance belongs to."""
-        # Find the Foreign() constraint that references `related_model`
-        for constraint in self.__schema__:
-            if isinstance(constraint, Foreign) and constraint.target.startswith(  # type: ignore
-                related_model.__table_name__ + "/"
-            ):
-                foreign_key = constraint.column
-                referenced_column = constraint.target.split("/")[1]  # type: ignore
-                return related_model.where(
-                    **{referenced_column: getattr(self, foreign_key)}
-                ).fetch_one()
-
-        raise ValueError(
-            f"{self.__class__.__name__} does not belong to {related_model.__name__}"
-        )
+        relation = self._relation_to(related_model, "belongs_to")
+        if relation is None:
+            raise ValueError(
+                f"{self.__class__.__name__} does not belong to {related_model.__name__}"
+            )
+        return related_model.where(
+            **{relation.remote: getattr(self, relation.local)}
+        ).fetch_one()
 
     def has_one(self, related_model: "Type[T]"):
         """Retrieve the related model where this instance is referenced."""
-        # Find the Foreign() constraint in `related_model` that references this model
-        for constraint in related_model.__schema__:
-            if (
-                isinstance(constraint, Foreign)
-                and constraint.target == f"{self.__table_name__}/{self._primary}"
-            ):
-                foreign_key = constraint.column
-                return related_model.where(**{foreign_key: self._primary}).fetch_one()
-
-        raise ValueError(
-            f"{related_model.__name__} does not have a one-to-one relationship "
-            f"with {self.__class__.__name__}"
-        )
+        relation = self._relation_to(related_model, "has_one", "has_many")
+        if relation is None:
+            raise ValueError(
+                f"{related_model.__name__} does not have a one-to-one relationship "
+                f"with {self.__class__.__name__}"
+            )
+        return related_model.where(
+            **{relation.remote: getattr(self, relation.local)}
+        ).fetch_one()
 
     @classmethod
     def get_table(cls):
@@ -390,6 +511,8 @@ def model(db: Database, type_checking: bool = False):
         if not is_dataclass(cls):
             cls = dataclass(cls)
         cls.create_table(db)
+        register(db, cls)
+        cls._hydrator = Hydrator(cls)
         if type_checking:
             for fn in typecheck(cls):
                 initiate_validators(cls, fn)
@@ -409,6 +532,9 @@ __all__ = [
     "Primary",
     "Foreign",
     "QueryBuilder",
+    "IdentityMap",
+    "Relation",
+    "unit_of_work",
     "CASCADE",
     "DEFAULT",
     "NOACT",
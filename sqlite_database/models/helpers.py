@@ -83,12 +83,34 @@ class Foreign(Constraint):
         self._base = target
         self._on_delete = DEFAULT
         self._on_update = DEFAULT
+        self._name: str | None = None
+        self._inverse: str | None = None
 
     @property
     def target(self):
         """Target foreign constraint"""
         return self._target
 
+    @property
+    def name(self):
+        """Relation name on this model, defaults to the column without its "_id" suffix"""
+        return self._name
+
+    @property
+    def inverse_name(self):
+        """Relation name on the target model, defaults to this table name"""
+        return self._inverse
+
+    def named(self, name: str):
+        """Name the relation to the target, as used by `QueryBuilder.with_`"""
+        self._name = name
+        return self
+
+    def inverse(self, name: str):
+        """Name the relation from the target back to this model"""
+        self._inverse = name
+        return self
+
     def on_delete(self, constraint: ConstraintEnum):
         """On delete constraint"""
         self._on_delete = constraint
@@ -101,7 +123,9 @@ class Foreign(Constraint):
 
     def resolve(self):
         """Resolve if current target is a Model"""
-        if issubclass(self._target, sqlite_database.BaseModel):  # type: ignore
+        if isinstance(self._target, type) and issubclass(
+            self._target, sqlite_database.BaseModel
+        ):
             name = self._target.__table_name__
             target = self._target._primary  # pylint: disable=protected-access
             if not target:
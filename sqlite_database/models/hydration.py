@@ -0,0 +1,93 @@
+"""Model hydration, building instances from tuple rows without `__init__`"""
+
+from dataclasses import MISSING, fields
+from inspect import getattr_static
+from types import MemberDescriptorType
+from typing import Any, Callable
+
+__all__ = ["Hydrator"]
+
+
+class Hydrator:
+    """Builds instances of a dataclass model from rows of a given shape (column
+    names), assigning values by position. Fields absent from the shape get their
+    default, `__post_init__` still runs. Fields in `__slots__` are supported.
+    Values as read are kept in `_loaded`, see `BaseModel.changes()`.
+
+    Each shape is checked against the fields and compiled once, further rows of
+    that shape cost one function call."""
+
+    def __init__(self, model: type) -> None:
+        self._model = model
+        self._fields = fields(model)  # type: ignore
+        self._post_init = getattr(model, "__post_init__", None)
+        self._shapes: dict[tuple[str, ...], Callable[[tuple], Any]] = {}
+
+    def _check(self, columns: tuple[str, ...]):
+        names = {field.name for field in self._fields}
+        unexpected = [column for column in columns if column not in names]
+        if unexpected:
+            raise TypeError(
+                f"{self._model.__name__}() got unexpected columns: {', '.join(unexpected)}"
+            )
+        missing = [
+            field.name
+            for field in self._fields
+            if field.init
+            and field.name not in columns
+            and field.default is MISSING
+            and field.default_factory is MISSING
+        ]
+        if missing:
+            raise TypeError(f"{self._model.__name__}() missing columns: {', '.join(missing)}")
+
+    def _compile(self, columns: tuple[str, ...]) -> Callable[[tuple], Any]:
+        self._check(columns)
+        namespace: dict[str, Any] = {"new": object.__new__, "cls": self._model}
+        loaded: list[str] = []
+        slots: list[str] = []
+        attributes: list[str] = []
+        for index, field in enumerate(self._fields):
+            if field.name in columns:
+                value = f"row[{columns.index(field.name)}]"
+            elif field.default is not MISSING:
+                namespace[f"default_{index}"] = field.default
+                value = f"default_{index}"
+            elif field.default_factory is not MISSING:
+                namespace[f"factory_{index}"] = field.default_factory
+                value = f"factory_{index}()"
+            else:
+                continue  # Not set by __init__ either
+            loaded.append(f"{field.name!r}: {value}")
+            descriptor = getattr_static(self._model, field.name, None)
+            if isinstance(descriptor, MemberDescriptorType):
+                namespace[f"set_{index}"] = descriptor.__set__
+                slots.append(f"    set_{index}(instance, loaded[{field.name!r}])")
+            else:
+                attributes.append(f"{field.name!r}: loaded[{field.name!r}]")
+        lines = [f"    loaded = {{{', '.join(loaded)}}}", *slots]
+        if not slots:
+            lines.append("    instance.__dict__.update(loaded)")
+        elif attributes:
+            lines.append(f"    instance.__dict__.update({{{', '.join(attributes)}}})")
+        lines.append("    instance.__dict__['_loaded'] = loaded")
+        if self._post_init is not None:
+            namespace["post_init"] = self._post_init
+            lines.append("    post_init(instance)")
+        source = "\n".join(
+            ["def hydrate(row):", "    instance = new(cls)", *lines, "    return instance"]
+        )
+        exec(source, namespace)  # pylint: disable=exec-used
+        return namespace["hydrate"]
+
+    def __call__(self, columns: tuple[str, ...]) -> Callable[[tuple], Any]:
+        """Hydrate function of rows with these columns"""
+        hydrate = self._shapes.get(columns)
+        if hydrate is None:
+            hydrate = self._shapes[columns] = self._compile(columns)
+        return hydrate
+
+    def hydrate(self, columns: tuple[str, ...], rows: list[tuple]) -> list[Any]:
+        """Instances of rows with these columns"""
+        hydrate = self(columns)
+        return [hydrate(row) for row in rows]
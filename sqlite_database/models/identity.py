@@ -0,0 +1,112 @@
+"""Identity map of models, one instance per primary key"""
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Hashable
+
+from ..cache import HitCounter
+
+DEFAULT_IDENTITY_SIZE = 1024
+
+_units: ContextVar["IdentityMap | None"] = ContextVar("identity_unit", default=None)
+
+__all__ = ["IdentityMap", "unit_of_work", "DEFAULT_IDENTITY_SIZE"]
+
+
+class IdentityMap:
+    """Model instances keyed by model and primary key, the least recently used
+    ones dropped past `size` (unbounded when None).
+
+    Set it as `__identity__` of one or more models, or open a `unit_of_work()`.
+    Writes through the Model API keep it up to date, writes made elsewhere
+    (Table API, other connections) are not seen until `clear()`."""
+
+    def __init__(self, size: int | None = DEFAULT_IDENTITY_SIZE) -> None:
+        if size is not None and size < 1:
+            raise ValueError("Identity map needs room for at least 1 instance")
+        self.size = size
+        self._entries: OrderedDict[tuple[type, Hashable], Any] = OrderedDict()
+        self._lock = Lock()
+        self._counter = HitCounter()
+
+    def get(self, model: type, key: Any) -> Any:
+        """Instance of `model` with primary key `key`, None if not mapped"""
+        with self._lock:
+            instance = self._entries.get((model, key))
+            if instance is None:
+                self._counter.miss()
+                return None
+            self._entries.move_to_end((model, key))
+            self._counter.hit()
+            return instance
+
+    def add(self, instance: Any) -> Any:
+        """Map an instance, returns the one already mapped to its key if any"""
+        model = type(instance)
+        key = (model, getattr(instance, model._primary))  # pylint: disable=protected-access
+        with self._lock:
+            mapped = self._entries.setdefault(key, instance)
+            self._entries.move_to_end(key)
+            if self.size is not None and len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+            return mapped
+
+    def replace(self, instance: Any):
+        """Map an instance in place of the one mapped to its key"""
+        model = type(instance)
+        key = (model, getattr(instance, model._primary))  # pylint: disable=protected-access
+        with self._lock:
+            self._entries.pop(key, None)
+        self.add(instance)
+
+    def discard(self, model: type, key: Any):
+        """Forget the instance of `model` with primary key `key`"""
+        with self._lock:
+            self._entries.pop((model, key), None)
+
+    def discard_model(self, model: type):
+        """Forget every instance of `model`"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] is model]:
+                del self._entries[key]
+
+    def clear(self):
+        """Forget every instance"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Mapped instances, hits, misses and hit rate"""
+        with self._lock:
+            return {"size": len(self._entries), **self._counter.stats()}
+
+    def __contains__(self, instance: Any):
+        model = type(instance)
+        key = (model, getattr(instance, model._primary))  # pylint: disable=protected-access
+        return self._entries.get(key) is instance
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def current_unit() -> IdentityMap | None:
+    """Identity map of the innermost `unit_of_work()` of this context"""
+    return _units.get()
+
+
+@contextmanager
+def unit_of_work(size: int | None = None):
+    """Identity map used by every model until the block ends, in place of their
+    `__identity__`. Nested blocks share the outer map."""
+    unit = _units.get()
+    if unit is not None:
+        yield unit
+        return
+    unit = IdentityMap(size)
+    token = _units.set(unit)
+    try:
+        yield unit
+    finally:
+        _units.reset(token)
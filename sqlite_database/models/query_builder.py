@@ -5,7 +5,9 @@
 from __future__ import annotations
 from typing import Any, Generic, Type, TypeVar
 from .errors import NoDataReturnedError
+from .relations import Relation, load
 from ..column import check_one
+from ..query_builder import build_select
 from ..functions import Function
 from .. import models  # pylint: disable=unused-import
 
@@ -32,12 +34,88 @@ class QueryBuilder(Generic[T]):
         self._offset = 0
         self._order = None
         self._failing = False
+        self._with: list[str] = []
+        self._aggregates: dict[str, tuple[Relation, str]] = {}
 
     def throw(self):
         """Set when fetch() returns nothing, will raise an error"""
         self._failing = True
         return self
 
+    def with_(self, *relations: str):
+        """Load relations of the fetched models, one query per relation rather
+        than one per model. Nested relations are dotted, e.g. "comments.author"."""
+        self._with.extend(relations)
+        return self
+
+    def _aggregated(self, related: Type[models.BaseModel] | str) -> Relation:
+        """Relation to aggregate, by related model or relation name"""
+        if isinstance(related, str):
+            relation = self._model._relations.get(related)
+        else:
+            relation = self._model._relation_to(related, "has_many", "has_one")
+        if relation is None or relation.kind == "belongs_to":
+            name = related if isinstance(related, str) else related.__name__
+            raise ValueError(f"{self._model.__name__} has no related {name!r} to aggregate")
+        return relation
+
+    def with_count(self, related: Type[models.BaseModel] | str, alias: str | None = None):
+        """Set the amount of related models on each fetched model, as
+        `<relation>_count` unless `alias` is given. Counted in the same select."""
+        relation = self._aggregated(related)
+        self._aggregates[check_one(alias or f"{relation.name}_count")] = (relation, "count(*)")
+        return self
+
+    def with_sum(
+        self, related: Type[models.BaseModel] | str, column: str, alias: str | None = None
+    ):
+        """Set the sum of `column` of related models on each fetched model, as
+        `<relation>_sum_<column>` unless `alias` is given. 0 without related models."""
+        relation = self._aggregated(related)
+        check_one(column)
+        self._aggregates[check_one(alias or f"{relation.name}_sum_{column}")] = (
+            relation,
+            f"coalesce(sum(_related.{column}), 0)",
+        )
+        return self
+
+    def _select(self, limit: int, offset: int) -> tuple[tuple[str, ...], list[tuple]]:
+        """Column names and tuple rows of the query. Aggregates of `with_count`
+        and `with_sum` are correlated subqueries, selected last."""
+        table = self._model._tbl
+        if not self._aggregates:
+            return table._select_rows(self._filters, limit, offset, self._order)
+        name = table.name
+        query, data = build_select(name, self._filters, "*", limit, offset, self._order)
+        subqueries = ", ".join(
+            f"(select {expression} from {relation.table} as _related "
+            f"where _related.{relation.remote} = {name}.{relation.local}) as {alias}"
+            for alias, (relation, expression) in self._aggregates.items()
+        )
+        query = f"select {name}.*, {subqueries}{query[len('select *'):]}"
+        table._control()
+        table._query_control()
+        with table._reading() as sql:
+            return table._operation(query, data, fetch="rows", sql=sql)
+
+    def _build(self, columns: tuple[str, ...], rows: list[tuple]) -> list[T]:
+        """Models of rows, mapped, with their aggregates set and relations loaded"""
+        width = len(columns) - len(self._aggregates)
+        try:
+            instances = self._model._hydrate(columns[:width], rows)
+        except TypeError as exc:
+            add_excnote(exc)
+            raise exc
+        identities = self._model._identities()
+        if identities is not None:
+            instances = [identities.add(instance) for instance in instances]
+        for index, alias in enumerate(columns[width:], width):
+            for instance, row in zip(instances, rows):
+                setattr(instance, alias, row[index])
+        if self._with and instances:
+            load(self._model, instances, self._with)
+        return instances
+
     def where(self, **kwargs: Any):
         """Sets conditioning"""
         self._filters.update(kwargs)
@@ -60,41 +138,51 @@ class QueryBuilder(Generic[T]):
 
     def fetch(self) -> list[T]:
         """Fetch data from table"""
-        records = self._model._tbl.select(  # pylint: disable=protected-access
-            self._filters, limit=self._limit, offset=self._offset, order=self._order
-        )
-
-        if len(records) == 0 and self._failing:
+        columns, rows = self._select(self._limit, self._offset)
+        if len(rows) == 0 and self._failing:
             raise NoDataReturnedError(
                 f"Model {self._model.__name__} has no data for current scope"
             )
-        try:
-            return [self._model(**record) for record in records]
-        except TypeError as exc:
-            add_excnote(exc)
-            raise exc
+        return self._build(columns, rows)
+
+    def _mapped(self):
+        """Mapped instance when filtering on the primary key only"""
+        identities = self._model._identities()
+        if identities is None or len(self._filters) != 1 or self._aggregates:
+            return None
+        value = self._filters.get(self._model._primary, None)
+        if not isinstance(value, (str, int, float, bytes)):
+            return None
+        return identities.get(self._model, value)
 
     def fetch_one(self) -> T | None:
         """Fetch one data from table"""
         # pylint: disable=protected-access
-        record = self._model._tbl.select_one(self._filters, order=self._order)
-        if not record and self._failing:
+        instance = self._mapped()
+        if instance is not None:
+            if self._with:
+                load(self._model, [instance], self._with)
+            return instance
+        columns, rows = self._select(1, 0)
+        if not rows and self._failing:
             raise NoDataReturnedError(
                 f"Model {self._model.__name__} has no data for current scope"
             )
-        if not record:
+        if not rows:
             return None
-        try:
-            return self._model(**record)
-        except TypeError as exc:
-            add_excnote(exc)
-            raise exc
+        return self._build(columns, rows[:1])[0]
 
     def patch(self, **kwargs: Any):
         """Update a data based on the filter according to passed keyword args"""
         affected_rows = self._model._tbl.update(
             self._filters, kwargs, self._limit, self._order
         )
+        identities = self._model._identities()
+        if identities is not None and affected_rows:
+            if self._model._primary in kwargs:
+                identities.clear()  # Cascaded to rows referencing the old keys
+            else:
+                identities.discard_model(self._model)
 
         if affected_rows == 0 and self._failing:
             raise NoDataReturnedError(
@@ -105,6 +193,8 @@ class QueryBuilder(Generic[T]):
     def delete(self):
         """Delete data based on the filter"""
         affected_rows = self._model._tbl.delete(self._filters, self._limit, self._order)
+        if affected_rows:
+            self._model._forget_all()
 
         if affected_rows == 0 and self._failing:
             raise NoDataReturnedError(
@@ -0,0 +1,143 @@
+"""Model relationships, read from `Foreign` constraints once at `model()` time"""
+
+# pylint: disable=protected-access
+
+from dataclasses import dataclass, field, fields
+from typing import Any, Iterable, NamedTuple
+from weakref import WeakKeyDictionary
+
+from .helpers import Foreign, Primary, Unique
+from ..database import Database
+from ..operators import in_
+
+# Keys bound per IN query, below SQLite's default limit of 999 variables
+CHUNK_SIZE = 900
+
+__all__ = ["Relation", "register", "related_model", "load", "CHUNK_SIZE"]
+
+
+class Relation(NamedTuple):
+    """Relationship of a model to the model of `table`, joining on
+    `local` (this model's column) = `remote` (related model's column)"""
+
+    name: str
+    kind: str  # belongs_to, has_many or has_one
+    table: str
+    local: str
+    remote: str
+
+
+@dataclass(slots=True)
+class _Registry:
+    """Models of a database by table name, and the relations of each table"""
+
+    models: dict[str, type] = field(default_factory=dict)
+    relations: dict[str, dict[str, Relation]] = field(default_factory=dict)
+
+
+_registries: "WeakKeyDictionary[Database, _Registry]" = WeakKeyDictionary()
+
+
+def register(db: Database, model: Any):
+    """Record a model and the relations of its foreign keys, on both ends"""
+    registry = _registries.setdefault(db, _Registry())
+    table = model.__table_name__
+    registry.models[table] = model
+    relations = registry.relations.setdefault(table, {})
+    model._relations = relations
+    model._registry = registry
+    unique = {
+        constraint.column
+        for constraint in model.__schema__
+        if isinstance(constraint, (Primary, Unique))
+    }
+    for constraint in model.__schema__:
+        if not isinstance(constraint, Foreign):
+            continue
+        parent, column = constraint.target.split("/")
+        name = constraint.name or (
+            constraint.column[:-3] if constraint.column.endswith("_id") else parent
+        )
+        relations[name] = Relation(name, "belongs_to", parent, constraint.column, column)
+        inverse = constraint.inverse_name or table
+        kind = "has_one" if constraint.column in unique else "has_many"
+        registry.relations.setdefault(parent, {})[inverse] = Relation(
+            inverse, kind, table, column, constraint.column
+        )
+
+
+def related_model(model: Any, relation: Relation):
+    """Model on the other end of a relation"""
+    try:
+        return model._registry.models[relation.table]
+    except KeyError:
+        raise ValueError(
+            f"Relation {relation.name!r} of {model.__name__} targets {relation.table!r}, "
+            "which is not a registered model"
+        ) from None
+
+
+def _chunks(values: list[Any]) -> Iterable[list[Any]]:
+    for start in range(0, len(values), CHUNK_SIZE):
+        yield values[start : start + CHUNK_SIZE]
+
+
+def _nested(names: Iterable[str]) -> dict[str, list[str]]:
+    """Relation names mapped to the dotted names to load on their models"""
+    nested: dict[str, list[str]] = {}
+    for name in names:
+        head, _, rest = name.partition(".")
+        nested.setdefault(head, [])
+        if rest:
+            nested[head].append(rest)
+    return nested
+
+
+def _relation(model: Any, name: str) -> Relation:
+    relation = model._relations.get(name)
+    if relation is None:
+        raise ValueError(f"{model.__name__} has no relation named {name!r}")
+    if name in {column.name for column in fields(model)}:
+        raise ValueError(f"Relation {name!r} of {model.__name__} shadows a field")
+    return relation
+
+
+def _fetch(related: Any, relation: Relation, instances: list[Any]) -> list[Any]:
+    """Related models of `instances`, one IN query per `CHUNK_SIZE` keys"""
+    keys = list({getattr(instance, relation.local) for instance in instances} - {None})
+    loaded = []
+    for chunk in _chunks(keys):
+        loaded.extend(related.where(**{relation.remote: in_(chunk)}).fetch())
+    return loaded
+
+
+def _set_many(instances: list[Any], relation: Relation, loaded: list[Any]):
+    groups: dict[Any, list[Any]] = {}
+    for child in loaded:
+        groups.setdefault(getattr(child, relation.remote), []).append(child)
+    for instance in instances:
+        setattr(instance, relation.name, groups.get(getattr(instance, relation.local), []))
+
+
+def _set_one(instances: list[Any], relation: Relation, loaded: list[Any]):
+    found = {}
+    for other in loaded:
+        found.setdefault(getattr(other, relation.remote), other)
+    for instance in instances:
+        setattr(instance, relation.name, found.get(getattr(instance, relation.local)))
+
+
+def load(model: Any, instances: list[Any], names: Iterable[str]):
+    """Load relations of `instances` with one IN query per relation (per
+    `CHUNK_SIZE` keys) and set them as attributes. A name like "comments.author"
+    loads "author" of the loaded comments too."""
+    for name, inner in _nested(names).items():
+        relation = _relation(model, name)
+        related = related_model(model, relation)
+        loaded = _fetch(related, relation, instances)
+        if relation.kind == "has_many":
+            _set_many(instances, relation, loaded)
+        else:
+            _set_one(instances, relation, loaded)
+        if inner and loaded:
+            load(related, loaded, inner)
@@ -0,0 +1,288 @@
+"""Pooled Database, one writer connection and several read-only readers"""
+
+from contextlib import contextmanager
+from queue import Empty, Queue
+from sqlite3 import Connection, connect
+from threading import Condition, Lock, get_ident, local
+from typing import Literal
+from weakref import finalize
+
+from .database import Database, _inherited
+from .utils import check_one, dict_factory
+
+DEFAULT_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+}
+WRITER_ONLY_PRAGMAS = ("journal_mode",)
+
+__all__ = ["PooledDatabase", "FairLock", "ReaderPool", "ThreadReaders"]
+
+
+def apply_pragmas(conn: Connection, pragmas: dict[str, str | int], writer: bool = True):
+    """Apply PRAGMA setup to a freshly opened connection"""
+    for name, value in pragmas.items():
+        if not writer and name in WRITER_ONLY_PRAGMAS:
+            continue
+        check_one(name)
+        if not str(value).replace("-", "", 1).isalnum():
+            raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+        conn.execute(f"PRAGMA {name}={value}")
+
+
+class FairLock:
+    """Reentrant lock that is handed to waiting threads in arrival order."""
+
+    def __init__(self) -> None:
+        self._cond = Condition(Lock())
+        self._next_ticket = 0
+        self._serving = 0
+        self._owner: int | None = None
+        self._depth = 0
+
+    def acquire(self):
+        """Acquire the lock, waiting for every thread that came before"""
+        ident = get_ident()
+        with self._cond:
+            if self._owner == ident:
+                self._depth += 1
+                return True
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            while self._serving != ticket:
+                self._cond.wait()
+            self._owner = ident
+            self._depth = 1
+            return True
+
+    def release(self):
+        """Release the lock"""
+        with self._cond:
+            if self._owner != get_ident():
+                raise RuntimeError("Cannot release un-acquired lock")
+            self._depth -= 1
+            if self._depth == 0:
+                self._owner = None
+                self._serving += 1
+                self._cond.notify_all()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *_):
+        self.release()
+
+
+class ReaderPool:
+    """Bounded pool of read-only connections, checked out per statement."""
+
+    def __init__(self, factory, size: int) -> None:
+        if size < 1:
+            raise ValueError("Reader pool needs at least 1 connection")
+        self._factory = factory
+        self._size = size
+        self._idle: Queue[Connection] = Queue()
+        self._lock = Lock()
+        self._opened: list[Connection] = []
+
+    def acquire(self) -> Connection:
+        """Check out a reader, opening one if the pool is not full yet"""
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+        with self._lock:
+            if len(self._opened) < self._size:
+                conn = self._factory()
+                self._opened.append(conn)
+                return conn
+        return self._idle.get()
+
+    def release(self, conn: Connection):
+        """Return a reader to the pool"""
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a reader for the duration of the block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    @property
+    def size(self):
+        """Maximum amount of readers"""
+        return self._size
+
+    @property
+    def opened(self):
+        """Amount of readers opened so far"""
+        return len(self._opened)
+
+    def close(self):
+        """Close every reader"""
+        with self._lock:
+            for conn in self._opened:
+                conn.close()
+            self._opened.clear()
+
+
+class _ThreadReader:  # pylint: disable=too-few-public-methods
+    """Thread-local holder of a reader, dropped when its thread ends"""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: Connection) -> None:
+        self.conn = conn
+
+
+class ThreadReaders:
+    """One read-only connection per thread, opened on first use. Threads never
+    wait on each other for a reader. A reader is closed once its thread ends,
+    or on `close()`."""
+
+    def __init__(self, factory) -> None:
+        self._factory = factory
+        self._local = local()
+        self._lock = Lock()
+        self._opened: list[Connection] = []
+
+    @contextmanager
+    def connection(self):
+        """Reader of the calling thread"""
+        reader = getattr(self._local, "reader", None)
+        if reader is None:
+            conn = self._factory()
+            reader = self._local.reader = _ThreadReader(conn)
+            with self._lock:
+                self._opened.append(conn)
+            finalize(reader, self._discard, conn)
+        yield reader.conn
+
+    def _discard(self, conn: Connection):
+        """Close the reader of a thread that ended"""
+        with self._lock:
+            if conn not in self._opened:
+                return
+            self._opened.remove(conn)
+        conn.close()
+
+    @property
+    def size(self):
+        """Readers are not bounded"""
+        return None
+
+    @property
+    def opened(self):
+        """Amount of readers open, one per live thread that read"""
+        return len(self._opened)
+
+    def close(self):
+        """Close every reader"""
+        with self._lock:
+            for conn in self._opened:
+                conn.close()
+            self._opened.clear()
+
+
+class PooledDatabase(Database):
+    """Database with one writer connection and a pool of read-only readers.
+
+    Selects outside of a transaction are routed to readers, everything else goes
+    to the writer and is serialized by a fair write lock. In-memory databases
+    cannot be shared between connections and always read from the writer.
+
+    Pass `readers="thread"` to give every thread its own reader instead of a
+    bounded pool, which lets reads scale with threads on free-threaded builds."""
+
+    def __init__(
+        self,
+        path: str,
+        readers: int | Literal["thread"] = 4,
+        pragmas: dict[str, str | int] | None = None,
+        **kwargs,
+    ) -> None:
+        self._pragmas = DEFAULT_PRAGMAS | (pragmas or {})
+        self._readers: ReaderPool | ThreadReaders | None = None
+        self._reader_count = readers
+        super().__init__(path, **kwargs)
+        self._write_lock = FairLock()
+
+    def _create_connection(self):
+        self._kwargs["check_same_thread"] = False
+        self._database = connect(self._path, **self._kwargs)
+        self._database.row_factory = dict_factory
+        if self._memory:
+            return
+        apply_pragmas(self._database, self._pragmas)
+        if self._reader_count == "thread":
+            self._readers = ThreadReaders(self._create_reader)
+        else:
+            self._readers = ReaderPool(self._create_reader, self._reader_count)
+
+    def _create_reader(self):
+        conn = self._open_reader()
+        apply_pragmas(conn, self._pragmas, writer=False)  # type: ignore
+        return conn
+
+    @contextmanager
+    def _reading(self):
+        if self._stale and not self._closed:
+            self._reconnect()
+        if self._readers is None:
+            yield self._database
+            return
+        with self._readers.connection() as conn:
+            yield conn
+
+    @contextmanager
+    def _scanning(self):
+        """Private reader for a scan thread, closed afterwards. Scans would hold
+        pooled readers for their whole length, and open one per short-lived
+        thread with `readers="thread"`."""
+        conn = self._create_reader()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _streaming(self):
+        """Private reader for a stream, which may stay suspended for long"""
+        if self._readers is None:
+            yield self.sql
+            return
+        with self._scanning() as conn:
+            yield conn
+
+    def _reconnect(self):
+        if self._readers is not None:
+            _inherited.append(self._readers)
+        # The lock may have been held by a parent thread that doesn't exist here
+        self._write_lock = FairLock()
+        super()._reconnect()
+
+    def _restore_options(self):
+        return super()._restore_options() | {
+            "readers": self._reader_count,
+            "pragmas": self._pragmas,
+        }
+
+    @property
+    def readers(self):
+        """Reader pool, None for in-memory databases"""
+        return self._readers
+
+    @property
+    def write_lock(self):
+        """Fair lock guarding the writer connection"""
+        return self._write_lock
+
+    def close(self):
+        if self._closed:
+            return
+        if self._readers is not None and not self._stale:
+            self._readers.close()
+        super().close()
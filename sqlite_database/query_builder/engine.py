@@ -2,13 +2,13 @@
 
 from typing import Optional, Any
 from dataclasses import dataclass
-from functools import lru_cache
 
 from .typings import CacheCond, OnlyColumn, CacheOrders, CacheData, Condition, SubQuery
 from .utils import (
     parse_orders,
     format_paramable,
     setup_limit_patch,
+    thread_cache,
     MAX_SUBQUERY_STACK_LIMIT,
     NAMING_FORMAT,
 )
@@ -39,7 +39,7 @@ class QueryParams:
             raise TypeError("Expected limit/offset to be integer")
 
     def __hash__(self):
-        """Custom hash function to ensure compatibility with lru_cache."""
+        """Custom hash function to ensure compatibility with the builder caches."""
         return hash(
             (
                 self.table_name,
@@ -53,7 +53,7 @@ class QueryParams:
         )
 
 
-@lru_cache
+@thread_cache
 def _build_select(query_params: QueryParams, depth: int = 0):
     if depth < 0 or depth >= MAX_SUBQUERY_STACK_LIMIT:
         raise RecursionError(
@@ -90,7 +90,7 @@ def _build_select(query_params: QueryParams, depth: int = 0):
     return query, data
 
 
-@lru_cache
+@thread_cache
 def _build_update(query_params: QueryParams):
     check_one(query_params.table_name)
     cond, data = extract_signature(query_params.condition)
@@ -108,7 +108,7 @@ def _build_update(query_params: QueryParams):
     # ? our cache data only contain keys not values (v0.3.0)
 
 
-@lru_cache
+@thread_cache
 def _build_delete(query_params: QueryParams):
     check_one(query_params.table_name)
     cond, data = extract_signature(query_params.condition)
@@ -121,7 +121,7 @@ def _build_delete(query_params: QueryParams):
     return query, data
 
 
-@lru_cache
+@thread_cache
 def _build_insert(table_name: str, data: CacheData):
     check_one(table_name)
     converged = format_paramable(data)
@@ -248,7 +248,7 @@ def extract_signature(  # pylint: disable=too-many-locals
     return where_clause, data
 
 
-@lru_cache
+@thread_cache
 def extract_subquery(subquery: SubQuery, depth: int = 1):
     """Extract subquery into a valid SQL statement"""
     return _build_select(
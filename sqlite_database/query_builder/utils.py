@@ -1,6 +1,8 @@
 """Utility"""
 
-from typing import Optional, Any
+from functools import wraps
+from threading import local
+from typing import Callable, Optional, Any, TypeVar
 
 from ..typings import Orders, Data
 from ..functions import ParsedFn, _function_extract
@@ -10,11 +12,38 @@ from ..locals import _SQLITETYPES
 from .typings import Condition, CacheOrders, CacheData
 
 
+T = TypeVar("T")
 DEFAULT_MAPPINGS = {value: value for value in _SQLITETYPES}
 SQL_ACTIONS = {"null": "set null"}
 MAX_SUBQUERY_STACK_LIMIT = 10
 
 NAMING_FORMAT = "{key}{suffix}__{call_id}_{depth}_{condition_id}"
+BUILDER_CACHE_SIZE = 1024
+
+
+def thread_cache(fn: Callable[..., T]) -> Callable[..., T]:
+    """Memoize a builder per thread. Unlike `lru_cache` there's no shared lock or
+    shared result, so builders scale with threads on free-threaded builds. A
+    thread's cache is emptied once it holds `BUILDER_CACHE_SIZE` entries."""
+    storage = local()
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        cache: dict | None = getattr(storage, "cache", None)
+        if cache is None:
+            cache = storage.cache = {}
+        key = (args, tuple(kwargs.items())) if kwargs else args
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        result = fn(*args, **kwargs)
+        if len(cache) >= BUILDER_CACHE_SIZE:
+            cache.clear()
+        cache[key] = result
+        return result
+
+    return wrapper
 
 
 def set_subquery_stack_limit(value: int):
@@ -0,0 +1,105 @@
+"""Schema introspection, read from the PRAGMA table-valued functions instead of
+parsing CREATE TABLE statements"""
+
+from typing import Any, Iterable
+
+from .column import Column
+from .index import Index
+from .utils import Row, check_one
+from .errors import SecurityError
+
+# Columns with their primary key, foreign key and single column UNIQUE flags.
+# Foreign keys without an explicit column reference the parent's primary key.
+COLUMNS_QUERY = """SELECT c.name, c.type, c."notnull", c.dflt_value, c.pk,
+    f."table" AS ref_table,
+    coalesce(f."to", (SELECT p.name FROM pragma_table_info(f."table") AS p WHERE p.pk = 1))
+        AS ref_column,
+    f.on_update, f.on_delete,
+    EXISTS (
+        SELECT 1 FROM pragma_index_list(:table) AS l
+        WHERE l."unique" AND l.origin != 'pk'
+        AND (SELECT group_concat(i.name) FROM pragma_index_info(l.name) AS i) = c.name
+    ) AS is_unique
+FROM pragma_table_xinfo(:table) AS c
+LEFT JOIN pragma_foreign_key_list(:table) AS f ON f."from" = c.name
+WHERE c.hidden != 1
+ORDER BY c.cid"""
+
+INDEXES_QUERY = """SELECT l.name, l."unique", (
+    SELECT group_concat(i.name, ',') FROM (
+        SELECT name FROM pragma_index_info(l.name) ORDER BY seqno
+    ) AS i
+) AS columns
+FROM pragma_index_list(:table) AS l
+ORDER BY l.seq"""
+
+__all__ = ["COLUMNS_QUERY", "INDEXES_QUERY", "to_columns", "to_indexes"]
+
+
+def _type(declared: str) -> str:
+    """Declared type when usable as is, its affinity otherwise"""
+    try:
+        return check_one(declared.lower()) if declared else "blob"
+    except SecurityError:
+        pass
+    upper = declared.upper()
+    if "INT" in upper:
+        return "integer"
+    if any(name in upper for name in ("CHAR", "CLOB", "TEXT")):
+        return "text"
+    if "BLOB" in upper:
+        return "blob"
+    if any(name in upper for name in ("REAL", "FLOA", "DOUB")):
+        return "real"
+    return "numeric"
+
+
+def _default(value: str | None) -> Any:
+    """Python value of a DEFAULT expression, kept as written when not a literal"""
+    if value is None or value.upper() == "NULL":
+        return None
+    if len(value) > 1 and value[0] == value[-1] == "'":
+        return value[1:-1].replace("''", "'")
+    for kind in (int, float):
+        try:
+            return kind(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _action(action: str | None):
+    action = (action or "no action").lower()
+    return "null" if action == "set null" else action
+
+
+def to_columns(rows: Iterable[Row]) -> list[Column]:
+    """Columns of `COLUMNS_QUERY` rows"""
+    columns: dict[str, Column] = {}
+    for row in rows:
+        if row["name"] in columns:
+            continue  # Referenced by several foreign keys, the first one is kept
+        foreign = row["ref_table"] is not None
+        columns[row["name"]] = Column(
+            row["name"],
+            _type(row["type"]),
+            foreign,
+            f"{row['ref_table']}/{row['ref_column']}" if foreign else None,
+            bool(row["pk"]),
+            bool(row["is_unique"]),
+            not row["notnull"],
+            _default(row["dflt_value"]),
+            _action(row["on_delete"]),  # type: ignore
+            _action(row["on_update"]),  # type: ignore
+        )
+    return list(columns.values())
+
+
+def to_indexes(table: str, rows: Iterable[Row]) -> list[Index]:
+    """Indexes of `INDEXES_QUERY` rows, including those SQLite creates for
+    PRIMARY KEY and UNIQUE constraints. Expressions are left out of the columns."""
+    indexes = []
+    for row in rows:
+        columns = tuple(filter(None, (row["columns"] or "").split(",")))
+        indexes.append(Index(row["name"], table, columns, bool(row["unique"])))  # type: ignore
+    return indexes
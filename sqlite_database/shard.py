@@ -0,0 +1,480 @@
+"""Sharded Database, spread tables across multiple SQLite files"""
+
+# pylint: disable=too-many-arguments,protected-access
+
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional, Sequence, TypeVar
+from sqlite3 import connect
+from zlib import crc32
+
+from .column import Column
+from .database import Database, Columns
+from .errors import DatabaseMissingError
+from .functions import ParsedFn, Function
+from .query_builder.typings import Condition
+from .signature import Signature
+from .table import Table
+from .typings import Data, Orders
+from .utils import Row, check_one, crunch, dict_factory
+
+T = TypeVar("T")
+ShardRouter = Callable[[Any], int]
+MERGEABLE_AGGREGATES = ("COUNT", "SUM", "TOTAL", "MIN", "MAX", "AVG")
+
+__all__ = ["ShardedDatabase", "ShardedTable", "hash_router", "range_router"]
+
+
+def hash_router(shards: int) -> ShardRouter:
+    """Route a shard key by a process-independent hash"""
+
+    def route(value: Any) -> int:
+        if isinstance(value, int):
+            return value % shards
+        if isinstance(value, str):
+            value = value.encode()
+        if not isinstance(value, bytes):
+            value = repr(value).encode()
+        return crc32(value) % shards
+
+    return route
+
+
+def range_router(bounds: Sequence[Any]) -> ShardRouter:
+    """Route a shard key by sorted upper bounds, shard `i` holds keys below `bounds[i]`
+    and the last shard holds everything else."""
+    bounds = tuple(bounds)
+    if list(bounds) != sorted(bounds):
+        raise ValueError("Range bounds must be sorted")
+
+    def route(value: Any) -> int:
+        return bisect_right(bounds, value)
+
+    return route
+
+
+def _key_values(where: Condition, key: str) -> tuple[Any, ...] | None:
+    """Values of shard key in `where` that route a query, None if it must fan out"""
+    if where is None:
+        return None
+    items = where.items() if isinstance(where, dict) else where
+    for name, value in items:
+        if name != key:
+            continue
+        if not isinstance(value, Signature):
+            return (value,)
+        if value.negated:
+            return None
+        if value.kind_sign == "eq":
+            return (value.value,)
+        if value.is_in:
+            return tuple(value.data)  # type: ignore
+    return None
+
+
+def _order_rows(rows: list, order: Orders, columns: tuple[str, ...] | None = None):
+    """Merge per-shard sorted rows, NULLs first on ascending order like SQLite.
+    Tuple rows need their `columns`."""
+    orders = (order,) if isinstance(order[0], str) else order
+    for column, direction in reversed(orders):  # type: ignore
+        index = column if columns is None else columns.index(column)
+        rows.sort(
+            key=lambda row, col=index: (row[col] is not None, row[col]),
+            reverse=direction.lower() == "desc",
+        )
+    return rows
+
+
+def _combine_aggregate(name: str, values: list[Any]):
+    present = [value for value in values if value is not None]
+    if name in ("COUNT", "TOTAL"):
+        return sum(present)
+    if not present:
+        return None
+    if name == "SUM":
+        return sum(present)
+    if name == "MIN":
+        return min(present)
+    return max(present)
+
+
+class ShardedTable:
+    """Table spread across shards. Operations with the shard key in `where` are
+    routed, the rest fan out in parallel and their results are merged."""
+
+    def __init__(self, parent: "ShardedDatabase", tables: Sequence[Table], shard_key: str):
+        self._parent = parent
+        self._tables = tuple(tables)
+        self._key = check_one(shard_key)
+
+    @property
+    def name(self):
+        """Table name"""
+        return self._tables[0].name
+
+    @property
+    def shard_key(self):
+        """Column used to route rows"""
+        return self._key
+
+    @property
+    def shards(self):
+        """Per-shard tables"""
+        return self._tables
+
+    @property
+    def deleted(self):
+        """Is table deleted"""
+        return self._tables[0].deleted
+
+    def _targets(self, where: Condition) -> tuple[Table, ...]:
+        values = _key_values(where, self._key)
+        if values is None:
+            return self._tables
+        indexes = sorted({self._parent.shard_for(value) for value in values})
+        return tuple(self._tables[index] for index in indexes)
+
+    def _fan_out(self, tables: Sequence[Table], fn: Callable[[Table], T]) -> list[T]:
+        if len(tables) == 1:
+            return [fn(tables[0])]
+        return list(self._parent._executor.map(fn, tables))
+
+    def _limited(
+        self,
+        tables: Sequence[Table],
+        limit: int,
+        order: Optional[Orders],
+        fn: Callable[[Table, int], int],
+    ):
+        """Run limited writes shard after shard until the limit is consumed"""
+        if order and len(tables) > 1:
+            raise ValueError(
+                "Ordered limited writes cannot span shards, add the shard key to the filter"
+            )
+        affected = 0
+        for table in tables:
+            affected += fn(table, limit - affected)
+            if affected >= limit:
+                break
+        return affected
+
+    def insert(self, data: Data):
+        """Insert data to its shard"""
+        if self._key not in data:
+            raise ValueError(f"Shard key {self._key!r} is missing from inserted data")
+        return self._tables[self._parent.shard_for(data[self._key])].insert(data)
+
+    def insert_many(self, datas: list[Data]):
+        """Insert multiple values, grouped per shard"""
+        groups: dict[int, list[Data]] = {}
+        for data in datas:
+            if self._key not in data:
+                raise ValueError(f"Shard key {self._key!r} is missing from inserted data")
+            groups.setdefault(self._parent.shard_for(data[self._key]), []).append(data)
+        self._fan_out(
+            tuple(groups), lambda index: self._tables[index].insert_many(groups[index])  # type: ignore
+        )
+
+    insert_multiple = insert_many
+
+    def update(
+        self,
+        where: Condition | None = None,
+        data: Data | None = None,
+        limit: int = 0,
+        order: Optional[Orders] = None,
+    ):
+        """Update rows on every targeted shard"""
+        if data is None:
+            raise ValueError("data parameter must not be None")
+        tables = self._targets(where)
+        if self._key in data and tables != (self._tables[self._parent.shard_for(data[self._key])],):
+            raise ValueError(f"Shard key {self._key!r} cannot be updated, rows can't move shards")
+        if limit:
+            return self._limited(
+                tables, limit, order, lambda table, left: table.update(where, data, left, order)
+            )
+        return sum(self._fan_out(tables, lambda table: table.update(where, data, 0, order)))
+
+    def update_one(
+        self, where: Condition | None = None, data: Data | None = None, order: Orders | None = None
+    ) -> int:
+        """Update 1 data only"""
+        return self.update(where, data, 1, order)
+
+    def delete(self, where: Condition = None, limit: int = 0, order: Optional[Orders] = None):
+        """Delete rows on every targeted shard"""
+        tables = self._targets(where)
+        if limit:
+            return self._limited(
+                tables, limit, order, lambda table, left: table.delete(where, left, order)
+            )
+        return sum(self._fan_out(tables, lambda table: table.delete(where, 0, order)))
+
+    def delete_one(self, where: Condition = None, order: Optional[Orders] = None):
+        """Delete a row"""
+        return self.delete(where, 1, order)
+
+    def _aggregate(self, tables: Sequence[Table], where: Condition, what: ParsedFn):
+        name = what.name.upper()
+        if name not in MERGEABLE_AGGREGATES:
+            raise ValueError(
+                f"{what.name}() cannot be combined across shards, "
+                f"only {', '.join(MERGEABLE_AGGREGATES).lower()}() can"
+            )
+        if name == "AVG":
+            sums = self._fan_out(
+                tables, lambda table: table.select(where, Function("SUM")(*what.values))
+            )
+            counts = self._fan_out(
+                tables, lambda table: table.select(where, Function("COUNT")(*what.values))
+            )
+            total = sum(counts)
+            return None if total == 0 else _combine_aggregate("SUM", sums) / total
+        return _combine_aggregate(
+            name, self._fan_out(tables, lambda table: table.select(where, what))
+        )
+
+    def select(  # pylint: disable=too-many-locals
+        self,
+        where: Condition = None,
+        what: Any = "*",
+        limit: int = 0,
+        offset: int = 0,
+        order: Optional[Orders] = None,
+        flatten: bool = False,
+    ):
+        """Select data across shards, see `Table.select`"""
+        tables = self._targets(where)
+        if isinstance(what, ParsedFn):
+            return self._aggregate(tables, where, what)
+        just_a_column = (isinstance(what, tuple) and len(what) == 1) or (
+            isinstance(what, str) and what != "*"
+        )
+        wanted = (what,) if isinstance(what, str) and what != "*" else what
+        fetched = wanted
+        if order and wanted != "*":
+            orders = (order,) if isinstance(order[0], str) else order
+            missing = tuple(col for col, _ in orders if col not in wanted)  # type: ignore
+            fetched = (*wanted, *missing)
+        single = len(tables) == 1
+        shard_limit, shard_offset = (limit, offset) if single else (limit and limit + offset, 0)
+        results = self._fan_out(
+            tables,
+            lambda table: table.select(where, fetched, shard_limit, shard_offset, order),
+        )
+        rows: list[Row] = [row for result in results for row in result]
+        if not single:
+            if order:
+                _order_rows(rows, order)
+            rows = rows[offset : offset + limit if limit else None]
+        if fetched is not wanted:
+            rows = [Row({col: row[col] for col in wanted}) for row in rows]
+        if just_a_column:
+            column = wanted[0]
+            return [row[column] for row in rows]
+        if flatten:
+            return crunch(rows)
+        return rows
+
+    def _select_rows(
+        self,
+        where: Condition = None,
+        limit: int = 0,
+        offset: int = 0,
+        order: Optional[Orders] = None,
+    ) -> tuple[tuple[str, ...], list[tuple]]:
+        """Column names and tuple rows across shards, see `Table._select_rows`"""
+        tables = self._targets(where)
+        if len(tables) == 1:
+            return tables[0]._select_rows(where, limit, offset, order)
+        results = self._fan_out(
+            tables, lambda table: table._select_rows(where, limit and limit + offset, 0, order)
+        )
+        columns = results[0][0]
+        rows = [row for _, result in results for row in result]
+        if order:
+            _order_rows(rows, order, columns)
+        return columns, rows[offset : offset + limit if limit else None]
+
+    def select_one(self, where: Condition = None, what: Any = "*", order: Optional[Orders] = None):
+        """Select one data across shards"""
+        if isinstance(what, ParsedFn):
+            return self.select(where, what)
+        rows = self.select(where, what, 1, 0, order)
+        if not rows:
+            return Row()
+        return rows[0]
+
+    def paginate_select(
+        self,
+        where: Condition = None,
+        what: Any = "*",
+        page: int = 0,
+        length: int = 10,
+        order: Optional[Orders] = None,
+        flatten: bool = False,
+    ):
+        """Paginate select across shards"""
+        if page < 0:
+            page = 0
+            order = "desc" if order in ("asc", None) else "asc"  # type: ignore
+        start = page * length
+        while True:
+            fetched = self.select(where, what, length, start, order, flatten)
+            if len(fetched) == 0:
+                return
+            yield fetched
+            if flatten:
+                column = next(iter(fetched.values()), None)
+                if column is None or len(column) != length:
+                    return
+            elif len(fetched) != length:
+                return
+            start += length
+
+    def count(self):
+        """Count rows on every shard"""
+        return self.select(what=Function("COUNT")("*"))
+
+    def columns(self):
+        """Table columns"""
+        return self._tables[0].columns()
+
+    def add_column(self, column):
+        """Add column to every shard"""
+        for table in self._tables:
+            table.add_column(column)
+
+    def rename_column(self, old_column: str, new_column: str):
+        """Rename existing column on every shard"""
+        for table in self._tables:
+            table.rename_column(old_column, new_column)
+
+    def commit(self):
+        """Commit changes on every shard"""
+        for table in self._tables:
+            table.commit()
+
+    def rollback(self):
+        """Rollback every shard"""
+        for table in self._tables:
+            table.rollback()
+
+    def __enter__(self):
+        """Open a transaction on every shard. Shards commit one after another,
+        a crash in between is not atomic across files."""
+        for table in self._tables:
+            table.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        for table in reversed(self._tables):
+            table.__exit__(exc_type, exc, traceback)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__}({self.name}) -> {self._parent!r}>"
+
+
+class _ShardDatabase(Database):
+    """Shard connection, used from the fan-out pool threads"""
+
+    def _create_connection(self):
+        self._kwargs["check_same_thread"] = False
+        self._database = connect(self._path, **self._kwargs)
+        self._database.row_factory = dict_factory
+
+
+class ShardedDatabase:
+    """Database spread across multiple SQLite files.
+
+    Rows are routed by `shard_key` using a stable hash, or by `ranges` when given
+    (sorted upper bounds, one less than the amount of paths)."""
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        shard_key: str = "id",
+        ranges: Sequence[Any] | None = None,
+        workers: int | None = None,
+        **kwargs,
+    ) -> None:
+        if not paths:
+            raise ValueError("At least 1 shard is required")
+        if ranges is not None and len(ranges) != len(paths) - 1:
+            raise ValueError("Expected exactly one less range bound than shards")
+        self._shards = tuple(_ShardDatabase(path, **kwargs) for path in paths)
+        self._router = range_router(ranges) if ranges is not None else hash_router(len(paths))
+        self._shard_key = check_one(shard_key)
+        self._shard_keys: dict[str, str] = {}
+        self._executor = ThreadPoolExecutor(workers or len(paths), thread_name_prefix="ShardDB")
+
+    @property
+    def shards(self):
+        """Per-shard databases"""
+        return self._shards
+
+    def shard_for(self, value: Any) -> int:
+        """Index of the shard holding `value`"""
+        return self._router(value)
+
+    def _fan_out(self, fn: Callable[[Database], T]) -> list[T]:
+        return list(self._executor.map(fn, self._shards))
+
+    def _wrap(self, tables: Iterable[Table], table: str, shard_key: str | None):
+        if shard_key is not None:
+            self._shard_keys[table] = check_one(shard_key)
+        return ShardedTable(self, tuple(tables), self._shard_keys.get(table, self._shard_key))
+
+    def create_table(self, table: str, columns: Columns, shard_key: str | None = None):
+        """Create table on every shard"""
+        columns = tuple(columns)
+        return self._wrap(
+            self._fan_out(lambda db: db.create_table(table, columns)), table, shard_key
+        )
+
+    def table(
+        self,
+        table: str,
+        columns: Optional[Iterable[Column]] = None,
+        shard_key: str | None = None,
+    ):
+        """Fetch table"""
+        if not self.check_table(table):
+            raise DatabaseMissingError(f"table {table} does not exists.")
+        return self._wrap((db.table(table, columns) for db in self._shards), table, shard_key)
+
+    def check_table(self, table: str):
+        """Check if table exists on every shard"""
+        return all(self._fan_out(lambda db: db.check_table(table)))
+
+    def delete_table(self, table: str):
+        """Delete table on every shard"""
+        self._fan_out(lambda db: db.delete_table(table))
+        self._shard_keys.pop(table, None)
+
+    def tables(self):
+        """Return tuple containing all sharded tables"""
+        return tuple(self.table(table.name) for table in self._shards[0].tables())
+
+    def commit(self):
+        """Commit every shard"""
+        self._fan_out(lambda db: db.commit())
+
+    def rollback(self):
+        """Rollback every shard"""
+        self._fan_out(lambda db: db.rollback())
+
+    @property
+    def closed(self):
+        """Is database closed?"""
+        return all(db.closed for db in self._shards)
+
+    def close(self):
+        """Close every shard"""
+        for db in self._shards:
+            db.close()
+        self._executor.shutdown()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} shards={len(self._shards)} {id(self)}>"
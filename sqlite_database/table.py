@@ -2,13 +2,19 @@
 
 # pylint: disable=too-many-arguments,too-many-public-methods,R0801
 
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from contextvars import ContextVar
+from functools import reduce
+from operator import add
 from sqlite3 import Connection, Error, OperationalError
 from typing import (
     Any,
+    Callable,
     Generator,
     Iterable,
     Literal,
+    NamedTuple,
     Optional,
     overload,
     TYPE_CHECKING
@@ -18,7 +24,10 @@ from sqlite_database.functions import ParsedFn, Function, count
 from sqlite_database.subquery import SubQuery
 
 
-from .utils import check_iter, check_one, Row, crunch
+from .utils import check_iter, check_one, Row, crunch, open_reader, run_operation, stream_rows
+from .cache import DEFAULT_CACHE_SIZE, ResultCache
+from .index import Index
+from .schema import COLUMNS_QUERY, INDEXES_QUERY, to_columns, to_indexes
 from ._debug import if_debug_print
 from .column import BuilderColumn, Column
 from .errors import TableRemovedError
@@ -32,7 +41,7 @@ from .query_builder import (
 )
 from .query_builder.typings import Condition
 from .query_builder.table_creation import extract_single_column
-# from .signature import op
+from .signature import op
 from .typings import (
     Data,
     Orders,
@@ -49,6 +58,47 @@ if TYPE_CHECKING:
 # Let's add a little bit of 'black' magic here.
 _null = Function("__NULL__")()
 _tx_stack = ContextVar("_tx_stack", default=[])
+# Read connections pinned by `Database.snapshot()` in the current context
+_snapshots: ContextVar[dict["Database", Connection]] = ContextVar("_snapshots", default={})
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class _HandleState(NamedTuple):
+    """Settings of a table handle and whether it has uncommitted writes"""
+
+    auto: bool = True
+    dirty: bool = False
+    force_dirty: bool = False
+
+
+_CLEAN = _HandleState()
+# Like `_tx_stack`, per context so threads sharing a handle don't share its state.
+# Handles back to the default state are dropped.
+_handle_states: ContextVar[dict["Table", _HandleState]] = ContextVar(
+    "_handle_states", default={}
+)
+
+
+def _scan_range(
+    path: str, timeout: float, query: str, data: dict[str, Any], fn: Callable[[list[Row]], Any]
+):
+    """Scan a rowid range on a private read-only connection, used by process pools"""
+    conn = open_reader(path, timeout)
+    try:
+        return fn(conn.execute(query, data).fetchall())
+    finally:
+        conn.close()
+
+
+def _restore_table(database: "Database", table: str) -> "Table":
+    """Unpickle a table through its (already restored) database"""
+    return database.table(table)
+
+
+def _rowid_ranges(low: int, high: int, parts: int) -> list[tuple[int, int]]:
+    """Split an inclusive rowid span into at most `parts` ranges"""
+    step = max(1, -(-(high - low + 1) // parts))
+    return [(start, min(start + step - 1, high)) for start in range(low, high + 1, step)]
 
 class Table: # pylint: disable=too-many-instance-attributes
     """Table. Make sure you remember how the table goes."""
@@ -64,37 +114,64 @@ class Table: # pylint: disable=too-many-instance-attributes
             raise ConnectionError("Connection to database is already closed.")
         self._parent_repr = repr(parent)
         self._db = parent
-        self._sql: Connection = parent.sql
         # pylint: disable-next=protected-access
         self._sql_path = parent._path
         self._deleted = False
-        self._force_dirty = False
-        self._dirty = False
-        self._auto = True
         self._table = check_one(table)
-        self._prev_autocommit = None
-        self._prev_auto = True
         self._columns: Optional[list[Column]] = list(columns) if columns else None
+        self._indexes: Optional[tuple[Index, ...]] = None
 
-    def __enter__(self):
-        self._prev_auto = self._auto
-        self._prev_autocommit = self._sql.isolation_level
+    @property
+    def _state(self) -> _HandleState:
+        return _handle_states.get().get(self, _CLEAN)
 
-        self._auto = False
-        self._sql.isolation_level = None
-        self._begin_transaction()
+    def _set_state(self, **changes: bool):
+        current = self._state
+        state = current._replace(**changes)
+        if state == current:
+            return
+        states = dict(_handle_states.get())  # copy since ContextVar values are immutable
+        if state == _CLEAN:
+            states.pop(self, None)
+        else:
+            states[self] = state
+        _handle_states.set(states)
+
+    @property
+    def _sql(self) -> Connection:
+        # Looked up every time, a forked child reopens the database connection.
+        return self._db.sql
+
+    def __reduce__(self):
+        return _restore_table, (self._db, self._table)
+
+    def __enter__(self):
+        # Transaction state lives in the caller's context (`_tx_stack`), not on
+        # the table, so other threads keep reading committed data meanwhile.
+        self._db._write_lock.__enter__()  # pylint: disable=protected-access
+        previous = self._sql.isolation_level
+        try:
+            self._sql.isolation_level = None
+            self._begin_transaction(previous)
+        except BaseException:
+            self._sql.isolation_level = previous
+            self._db._write_lock.__exit__(None, None, None)  # pylint: disable=protected-access
+            raise
         return self
 
     def __exit__(self, exc_type, _, __):
-        if exc_type is None:
-            self._commit_transaction()
-            self._dirty = False
-        else:
-            self._rollback_transaction()
-            self._dirty = False
-
-        self._sql.isolation_level = self._prev_autocommit
-        self._auto = self._prev_auto
+        previous = _tx_stack.get()[-1]
+        try:
+            if exc_type is None:
+                self._commit_transaction()
+            else:
+                self._rollback_transaction()
+        finally:
+            self._set_state(dirty=False)
+            self._sql.isolation_level = previous
+            # Results cached meanwhile by other threads predate the commit
+            self._db._invalidate()  # pylint: disable=protected-access
+            self._db._write_lock.__exit__(None, None, None)  # pylint: disable=protected-access
 
     @property
     def deleted(self):
@@ -108,31 +185,32 @@ class Table: # pylint: disable=too-many-instance-attributes
 
     @property
     def force_dirty(self):
-        """Force dirty state, whether .selecting() on dirty/uncommitted data is allowed or not"""
-        return self._force_dirty
+        """Force dirty state, whether .selecting() on dirty/uncommitted data is allowed or not.
+        Like `auto_commit`, set for the current thread (context) only."""
+        return self._state.force_dirty
 
     @force_dirty.setter
     def force_dirty(self, value: bool):
         """Force dirty state, whether .selecting() on dirty/uncommitted data is allowed or not"""
         if not isinstance(value, bool):
             return
-        self._force_dirty = value
+        self._set_state(force_dirty=value)
 
     @property
     def auto_commit(self):
-        """Auto commit state of this instance"""
-        return self._auto
+        """Auto commit state of this instance, in the current thread (context)"""
+        return self._state.auto
 
     @auto_commit.setter
     def auto_commit(self, value: bool):
         if not isinstance(value, bool):
             return
-        self._auto = value
+        self._set_state(auto=value)
 
     @property
     def in_transaction(self):
         """Returns True if the table is in an active transaction."""
-        return not self._auto or self._sql.isolation_level is None
+        return not self._state.auto or self._sql.isolation_level is None
 
     def _finalize(self):
         pass
@@ -140,7 +218,7 @@ class Table: # pylint: disable=too-many-instance-attributes
     def _delete_hook(self):
         try:
             self.select()
-        except OperationalError:
+        except (OperationalError, TableRemovedError):
             self._deleted = True
 
     def _exec(
@@ -148,32 +226,140 @@ class Table: # pylint: disable=too-many-instance-attributes
         query: str,
         data: dict[str, Any] | list[dict[str, Any]],
         which: Literal["execute", "executemany"] = "execute",
+        sql: Connection | None = None,
     ):
         """Execute a sql query"""
         if_debug_print(query, '\n', data)
-        cursor = self._sql.cursor()
+        cursor = (sql or self._sql).cursor()
         fn = cursor.execute if which == "execute" else cursor.executemany
         try:
             fn(query, data)
         except Error as exc:
-            if str(exc).startswith("no such table:"):
-                raise TableRemovedError(f"Table {self._table} doesn't exists anymore") from None
-            exc.add_note(f"SQL query: {query}")
-            exc.add_note(f"Arguments: {data}")
-            exc.add_note(
-                f"There's about {1 if isinstance(data, dict) else len(data)} value(s) inserted"
-            )
-            raise exc
+            raise self._failed(exc, query, data) from None
         return cursor
 
+    def _operation(  # pylint: disable=too-many-arguments
+        self,
+        query: str,
+        data: dict[str, Any] | list[dict[str, Any]],
+        which: Literal["execute", "executemany"] = "execute",
+        fetch: Literal["all", "one", "rows", "status"] = "all",
+        commit: bool = False,
+        sql: Connection | None = None,
+    ):
+        """Execute a sql query and fetch its result. Worker connections run the
+        whole operation as one job instead of a job per cursor call."""
+        if_debug_print(query, '\n', data)
+        sql = sql or self._sql
+        run = getattr(sql, "operation", None)
+        try:
+            if run is None:
+                return run_operation(sql, query, data, which, fetch, commit)
+            return run(query, data, which, fetch, commit)
+        except Error as exc:
+            raise self._failed(exc, query, data) from None
+
+    def _failed(self, exc: Error, query: str, data):
+        if str(exc).startswith("no such table:"):
+            return TableRemovedError(f"Table {self._table} doesn't exists anymore")
+        exc.add_note(f"SQL query: {query}")
+        exc.add_note(f"Arguments: {data}")
+        exc.add_note(
+            f"There's about {1 if isinstance(data, dict) else len(data)} value(s) inserted"
+        )
+        return exc
+
     def _control(self):
         if self._deleted:
             raise TableRemovedError(f"{self._table} is already removed")
 
     def _query_control(self):
-        if self._dirty and self._force_dirty is False:
-            self._sql.commit()
-            self._dirty = False
+        state = self._state
+        if state.dirty and state.force_dirty is False:
+            with self._db._write_lock:  # pylint: disable=protected-access
+                self._sql.commit()
+            self._set_state(dirty=False)
+            self._db._invalidate()  # pylint: disable=protected-access
+
+    def _on_writer(self):
+        """Whether reads must see uncommitted work on the writer"""
+        state = self._state
+        return bool(_tx_stack.get()) or not state.auto or state.dirty
+
+    @contextmanager
+    def _reading(self):
+        """Connection to read from. Uncommitted work is only visible on the writer,
+        which is only touched while holding the write lock. Inside a snapshot,
+        reads go to its pinned connection."""
+        if self._on_writer():
+            with self._db._write_lock:  # pylint: disable=protected-access
+                yield self._sql
+            return
+        pinned = _snapshots.get().get(self._db)
+        if pinned is not None:
+            yield pinned
+            return
+        with self._db._reading() as sql:  # pylint: disable=protected-access
+            yield sql
+
+    def _write(
+        self,
+        query: str,
+        data: dict[str, Any] | list[dict[str, Any]],
+        which: Literal["execute", "executemany"] = "execute",
+    ):
+        """Execute a write statement and commit it unless a transaction is active"""
+        with self._db._write_lock:  # pylint: disable=protected-access
+            commit = not self.in_transaction
+            status = self._operation(query, data, which, "status", commit)
+            if not commit and not _tx_stack.get():
+                self._set_state(dirty=True)
+            # Cascades and triggers may change other tables too
+            self._db._invalidate()  # pylint: disable=protected-access
+        return status
+
+    def _read(
+        self, query: str, data: dict[str, Any], fetch: Literal["all", "one", "rows"] = "all"
+    ):
+        """Run a select, answered by the result cache when it's enabled. Reads
+        that must see uncommitted work or a snapshot skip it."""
+        cache = self._db._result_caches.get(self._table)  # pylint: disable=protected-access
+        key = None
+        if cache is not None and not self._on_writer() and self._db not in _snapshots.get():
+            key = cache.key(query, data, fetch)
+        if key is None:
+            with self._reading() as sql:
+                return self._operation(query, data, fetch=fetch, sql=sql)
+        # Only bumped by commits of other connections, ours clear the cache
+        version = self._operation("PRAGMA data_version", (), fetch="one")
+        hit, result, generation = cache.lookup(key, version)  # type: ignore
+        if not hit:
+            with self._reading() as sql:
+                result = self._operation(query, data, fetch=fetch, sql=sql)
+            cache.store(key, result, generation)  # type: ignore
+        return list(result) if fetch == "all" else result
+
+    def enable_cache(self, size: int = DEFAULT_CACHE_SIZE, ttl: float | None = None):
+        """Cache the results of `select` and `select_one` on this table, for every
+        handle of it. Any write through this database empties the caches of every
+        table, as cascades and triggers reach other tables. Commits of other
+        connections (seen through `PRAGMA data_version`) empty it too, raw SQL run
+        on `Database.sql` does not. Cached rows are shared, don't modify them.
+
+        Args:
+            size (int, optional): Maximum amount of cached results. Defaults to 256.
+            ttl (float, optional): Seconds a result stays cached. Defaults to None.
+
+        Returns:
+            ResultCache: The cache, see `ResultCache.stats()`
+        """
+        cache = ResultCache(size, ttl)
+        self._db._result_caches[self._table] = cache  # pylint: disable=protected-access
+        return cache
+
+    def disable_cache(self):
+        """Stop caching results of this table"""
+        self._db._result_caches.pop(self._table, None)  # pylint: disable=protected-access
 
     def force_nodelete(self):
         """Force "undelete" table. Used if table was mistakenly assigned as
@@ -199,13 +385,7 @@ class Table: # pylint: disable=too-many-instance-attributes
         """
         query, data = build_delete(self._table, where, limit, order)  # type: ignore
         self._control()
-        cursor = self._exec(query, data)
-        rcount = cursor.rowcount
-        if not self.in_transaction:
-            self._sql.commit()
-        else:
-            self._dirty = True
-        return rcount
+        return self._write(query, data).rowcount
 
     def delete_one(self, where: Condition = None, order: Optional[Orders] = None):
         """Delete a row
@@ -228,13 +408,7 @@ class Table: # pylint: disable=too-many-instance-attributes
         """
         query, _ = build_insert(self._table, data)  # type: ignore
         self._control()
-        cursor = self._exec(query, data)
-        rlastrowid = cursor.lastrowid
-        if not self.in_transaction:
-            self._sql.commit()
-        else:
-            self._dirty = True
-        return rlastrowid
+        return self._write(query, data).lastrowid
 
     def insert_multiple(self, datas: list[Data]):
         """Insert multiple values
@@ -244,11 +418,7 @@ class Table: # pylint: disable=too-many-instance-attributes
         """
         self._control()
         query, _ = build_insert(self._table, datas[0])  # type: ignore
-        self._exec(query, datas, "executemany")
-        if not self.in_transaction:
-            self._sql.commit()
-        else:
-            self._dirty = True
+        self._write(query, datas, "executemany")
 
     def insert_many(self, datas: list[Data]):
         """Alias to `insert_multiple`"""
@@ -279,13 +449,7 @@ class Table: # pylint: disable=too-many-instance-attributes
             self._table, data, where, limit, order
         )  # type: ignore
         self._control()
-        cursor = self._exec(query, data)
-        rcount = cursor.rowcount
-        if not self.in_transaction:
-            self._sql.commit()
-        else:
-            self._dirty = True
-        return rcount
+        return self._write(query, data).rowcount
 
     def update_one(
         self,
@@ -374,16 +538,14 @@ class Table: # pylint: disable=too-many-instance-attributes
         just_a_column = (isinstance(what, tuple) and len(what) == 1) or (
             isinstance(what, str) and what != "*"
         )
-        with self._sql:
-            cursor = self._exec(query, data)
-            data = cursor.fetchall()
-            if just_a_column:
-                return [d[what] for d in data]
-            if flatten:
-                return crunch(data)
-            if isinstance(what, ParsedFn):
-                return data[0][what.parse_sql()[0]]
-            return data
+        data = self._read(query, data)
+        if just_a_column:
+            return [d[what] for d in data]
+        if flatten:
+            return crunch(data)
+        if isinstance(what, ParsedFn):
+            return data[0][what.parse_sql()[0]]
+        return data
 
     @overload
     def paginate_select(
@@ -459,18 +621,17 @@ class Table: # pylint: disable=too-many-instance-attributes
             query, data = build_select(
                 self._table, where, what, length, start, order
             )  # type: ignore
-            with self._sql:
-                cursor = self._exec(query, data)
-                fetched = cursor.fetchmany(length)
-                if len(fetched) == 0:
-                    return
-                if flatten and not just_a_column:
-                    fetched = crunch(fetched)
-                if len(fetched) != length:
-                    yield fetched
-                    return
+            with self._reading() as sql:
+                fetched = self._operation(query, data, sql=sql)
+            if len(fetched) == 0:
+                return
+            if flatten and not just_a_column:
+                fetched = crunch(fetched)
+            if len(fetched) != length:
                 yield fetched
-                start += length
+                return
+            yield fetched
+            start += length
 
     @overload
     def select_one(
@@ -520,27 +681,204 @@ class Table: # pylint: disable=too-many-instance-attributes
         query, data = build_select(
             self._table, where, what, 1, 0, order
         )  # type: ignore
-        with self._sql:
-            cursor = self._exec(query, data)
-            returned = cursor.fetchone()
-            if isinstance(what, ParsedFn):
-                print(returned)
-                return returned[what.parse_sql()[0]]
-            if not returned:
-                return Row()
-            if isinstance(what, tuple) and len(what) == 1:
-                return returned[what]
-            if isinstance(what, str) and what != "*":
-                return returned[what]
-            return returned
+        returned = self._read(query, data, "one")
+        if isinstance(what, ParsedFn):
+            print(returned)
+            return returned[what.parse_sql()[0]]
+        if not returned:
+            return Row()
+        if isinstance(what, tuple) and len(what) == 1:
+            return returned[what]
+        if isinstance(what, str) and what != "*":
+            return returned[what]
+        return returned
+
+    def _select_rows(
+        self,
+        where: Condition = None,
+        limit: int = 0,
+        offset: int = 0,
+        order: Optional[Orders] = None,
+    ) -> tuple[tuple[str, ...], list[tuple]]:
+        """Column names and plain tuple rows of a select, for callers building
+        their own objects. Cached rows are shared, don't modify them."""
+        self._control()
+        self._query_control()
+        query, data = build_select(self._table, where, "*", limit, offset, order)
+        return self._read(query, data, "rows")
+
+    def stream(
+        self,
+        where: Condition = None,
+        what: OnlyColumn = "*",
+        order: Optional[Orders] = None,
+        size: int = DEFAULT_CHUNK_SIZE,
+        prefetch: int = 2,
+    ):
+        """Stream selected rows in chunks instead of fetching everything at once.
+
+        Args:
+            where (Condition, optional): Conditions to use. Defaults to None.
+            what (OnlyColumn, optional): Select what you want. Defaults to "*".
+            order (Optional[Orders], optional): Selection order. Defaults to None.
+            size (int, optional): Rows per chunk. Defaults to 1000.
+            prefetch (int, optional): Chunks worker connections fetch ahead while
+                the current one is handled. Defaults to 2.
+
+        Yields:
+            Queries: Chunks of at most `size` rows
+        """
+        if size < 1:
+            raise ValueError("Chunk size must be at least 1")
+        self._control()
+        self._query_control()
+        query, data = build_select(self._table, where, what, 0, 0, order)  # type: ignore
+        if_debug_print(query, '\n', data)
+        stream = getattr(self._sql, "stream", None)
+        if stream is not None:
+            # Worker connections serialize fetches on their worker
+            chunks = stream(query, data, size, prefetch)
+        elif self._on_writer():
+            chunks = self._writer_chunks(query, data, size)
+        else:
+            chunks = self._reader_chunks(query, data, size)
+        try:
+            yield from chunks
+        except Error as exc:
+            raise self._failed(exc, query, data) from None
+        finally:
+            chunks.close()
+
+    def _writer_chunks(self, query: str, data: dict[str, Any], size: int):
+        """Chunks read on the writer, the write lock is only held per fetch so a
+        suspended stream doesn't hold up writers"""
+        lock = self._db._write_lock  # pylint: disable=protected-access
+        with lock:
+            cursor = self._sql.execute(query, data)
+        try:
+            while True:
+                with lock:
+                    chunk = cursor.fetchmany(size)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            with lock:
+                cursor.close()
+
+    def _reader_chunks(self, query: str, data: dict[str, Any], size: int):
+        """Chunks read on the snapshot of this context, or a reader of their own"""
+        pinned = _snapshots.get().get(self._db)
+        if pinned is not None:
+            yield from stream_rows(pinned, query, data, size)
+            return
+        with self._db._streaming() as sql:  # pylint: disable=protected-access
+            yield from stream_rows(sql, query, data, size)
+
+    def parallel_scan(  # pylint: disable=too-many-locals
+        self,
+        where: Condition = None,
+        workers: int = 4,
+        fn: Callable[[list[Query]], Any] = list,
+        reducer: Callable[[Any, Any], Any] = add,
+        what: OnlyColumn = "*",
+        backend: Literal["thread", "process"] = "thread",
+    ):
+        """Scan the table split into rowid ranges, each range on its own read-only connection.
+
+        Args:
+            where (Condition, optional): Conditions to use. Defaults to None.
+            workers (int, optional): Amount of ranges scanned at once. Defaults to 4.
+            fn (Callable, optional): Applied to the rows of each range. Defaults to list.
+            reducer (Callable, optional): Combines results of `fn` in rowid order.
+                Defaults to `operator.add` (concatenate rows, sum numbers).
+            what (OnlyColumn, optional): Select what you want. Defaults to "*".
+            backend (str, optional): "thread" or "process". Process backends need
+                picklable `fn` and a file database. Defaults to "thread".
+
+        In-memory databases and scans inside a transaction run range after range
+        on the writer, so uncommitted rows are included.
+
+        Returns:
+            Any: Reduced result, None if the table is empty
+        """
+        self._control()
+        self._query_control()
+        with self._reading() as sql:
+            bounds = sql.execute(
+                f"select min(_rowid_) as low, max(_rowid_) as high from {self._table}"
+            ).fetchone()
+        if bounds["low"] is None:
+            return None
+        conditions = list(where.items() if isinstance(where, dict) else (where or ()))
+        jobs = []
+        for low, high in _rowid_ranges(bounds["low"], bounds["high"], max(1, workers)):
+            jobs.append(
+                build_select(self._table, [*conditions, ("_rowid_", op.between(low, high))], what)
+            )
+
+        if backend == "process":
+            if self._db._memory:  # pylint: disable=protected-access
+                raise ValueError("Process scans require a file database")
+            if self._on_writer():
+                raise ValueError("Process scans cannot see uncommitted rows, commit first")
+            timeout = self._db._kwargs.get("timeout", 5.0)  # pylint: disable=protected-access
+            with ProcessPoolExecutor(workers) as pool:
+                results = list(
+                    pool.map(
+                        _scan_range, *zip(*((self._sql_path, timeout, *job, fn) for job in jobs))
+                    )
+                )
+            return reduce(reducer, results)
+
+        if self._db._memory or self._on_writer():  # pylint: disable=protected-access
+            with self._reading() as sql:
+                return reduce(reducer, (fn(self._exec(*job, sql=sql).fetchall()) for job in jobs))
+
+        def scan(job):
+            with self._db._scanning() as conn:  # pylint: disable=protected-access
+                return fn(self._exec(*job, sql=conn).fetchall())
+
+        with ThreadPoolExecutor(workers, thread_name_prefix=f"Scan[{self._table}]") as pool:
+            return reduce(reducer, pool.map(scan, jobs))
+
+    def submit(self, method: str, *args, **kwargs) -> Future:
+        """Queue a table operation and return its future right away, e.g.
+        `table.submit("insert", {...})`. Worker-backed tables run the whole
+        operation on the worker thread, so many writes can be queued and
+        waited for once. Tables of process workers raise TypeError.
+
+        Args:
+            method (str): Name of a public Table method
+        """
+        if method.startswith("_") or not callable(getattr(type(self), method, None)):
+            raise AttributeError(f"{type(self).__name__} has no operation named {method!r}")
+        return self._db.submit(getattr(self, method), *args, **kwargs)
+
+    def _schema(self, query: str):
+        with self._reading() as sql:
+            return self._operation(query, {"table": self._table}, sql=sql)
 
     def columns(self):
-        """Table columns"""
+        """Table columns, read from the database schema once when the table was
+        not given any"""
         if self._columns is None:
-            raise AttributeError("columns are undefined.")
+            self._control()
+            columns = to_columns(self._schema(COLUMNS_QUERY))
+            if not columns:
+                raise AttributeError("columns are undefined.")
+            self._columns = columns
+            self._db._remember(self._table, columns)  # pylint: disable=protected-access
 
         return tuple(self._columns)
 
+    def indexes(self) -> tuple[Index, ...]:
+        """Table indexes, read from the database schema once"""
+        if self._indexes is None:
+            self._control()
+            self._indexes = tuple(to_indexes(self._table, self._schema(INDEXES_QUERY)))
+        return self._indexes
+
     def add_column(self, column: Column | BuilderColumn):
         """Add column to table"""
         sql = self._sql
@@ -563,6 +901,8 @@ constraint is enabled."
         if self._columns is not None:
             self._columns.append(column)
         sql.execute(query)
+        self._db._forget(self._table, results=False)  # pylint: disable=protected-access
+        self._db._invalidate(self._table)  # pylint: disable=protected-access
 
     def subquery(self, where: Condition, columns: OnlyColumn | str, limit: int = 0) -> SubQuery:
         """Push subquery to current .select() of other table"""
@@ -577,15 +917,16 @@ constraint is enabled."
     def commit(self):
         """Commit changes"""
         self._sql.commit()
-        self._dirty = False
+        self._set_state(dirty=False)
 
     def rollback(self):
         """Rollback"""
         self._sql.rollback()
-        self._dirty = False
+        self._set_state(dirty=False)
 
-    def _begin_transaction(self):
-        """Start a transaction or savepoint depending on depth."""
+    def _begin_transaction(self, previous: str | None = None):
+        """Start a transaction or savepoint depending on depth. `previous` is the
+        isolation level restored once it ends."""
         stack = list(_tx_stack.get())  # copy since ContextVar values are immutable
         depth = len(stack)
 
@@ -595,7 +936,7 @@ constraint is enabled."
             savepoint_name = f"sp_{depth}"
             self._sql.execute(f"SAVEPOINT {savepoint_name}")
 
-        stack.append(True)
+        stack.append(previous)
         _tx_stack.set(stack)
 
     def _commit_transaction(self):
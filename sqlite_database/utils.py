@@ -3,13 +3,26 @@
 
 # This module must not import anything from this package except errors.
 
+from functools import cache
 from uuid import uuid4
 from re import Pattern
 from re import compile as re_compile
 from re import escape as re_escape
+from os.path import abspath
 from sqlite3 import Cursor, connect
 from string import punctuation
-from typing import Any, Generic, Iterable, Iterator, Mapping, TypeVar, TypeAlias
+from urllib.parse import quote
+from typing import (
+    Any,
+    Generic,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    NamedTuple,
+    TypeVar,
+    TypeAlias,
+)
 
 from .errors import SecurityError
 
@@ -212,8 +225,64 @@ def dict_factory(cursor, row):
     # return {key: value for key, value in zip(fields, row)}
 
 
+def open_reader(path: str, timeout: float = 5.0):
+    """Open a read-only connection to a database file"""
+    conn = connect(
+        f"file:{quote(abspath(path))}?mode=ro",
+        uri=True,
+        check_same_thread=False,
+        isolation_level=None,
+        timeout=timeout,
+    )
+    conn.row_factory = dict_factory
+    return conn
+
+
+class Status(NamedTuple):
+    """Outcome of a statement whose rows are not fetched"""
+
+    rowcount: int
+    lastrowid: int | None
+
+
+def run_operation(  # pylint: disable=too-many-arguments
+    conn,
+    query: str,
+    data: Any,
+    which: Literal["execute", "executemany"] = "execute",
+    fetch: Literal["all", "one", "rows", "status"] = "all",
+    commit: bool = False,
+):
+    """Execute a statement, fetch its result and optionally commit, all at once.
+    Workers run this as a single job. "rows" fetches `(column names, tuples)`."""
+    cursor = conn.execute(query, data) if which == "execute" else conn.executemany(query, data)
+    if fetch == "all":
+        result = cursor.fetchall()
+    elif fetch == "one":
+        result = cursor.fetchone()
+    elif fetch == "rows":
+        cursor.row_factory = None
+        result = (tuple(column[0] for column in cursor.description), cursor.fetchall())
+    else:
+        result = Status(cursor.rowcount, cursor.lastrowid)
+    if commit:
+        conn.commit()
+    return result
+
+
+def stream_rows(conn, query: str, data: Any, size: int):
+    """Yield the result of a query in chunks of `size` rows"""
+    cursor = conn.execute(query, data)
+    try:
+        while chunk := cursor.fetchmany(size):
+            yield chunk
+    finally:
+        cursor.close()
+
+
+@cache
 def sqlite_multithread_check():
-    """sqlite mulththread check"""
+    """sqlite mulththread check, compile options don't change so it only runs once"""
     thread_safe = {0: 0, 2: 1, 1: 3}
     conn = connect(":memory:", check_same_thread=False)
     data = conn.execute(
@@ -321,4 +390,7 @@ __all__ = [
     "NullObject",
     "sqlite_multithread_check",
     "NoopResource",
+    "Status",
+    "run_operation",
+    "stream_rows",
 ]
@@ -2,10 +2,17 @@
 
 # pylint: disable=ungrouped-imports,possibly-used-before-assignment,too-few-public-methods,no-name-in-module,no-member
 
+from collections import deque
+from concurrent.futures import Future
 from sqlite3 import Cursor
 from typing import Any
+
+from ..utils import Status, run_operation
+from .scheduler import BULK, job_options
 from .worker import Worker, WorkerType
 
+BULK_CHUNK_SIZE = 500
+
 def is_shutdown(worker: Worker):
     """Is shutdown?"""
     if worker.is_closed:
@@ -40,7 +47,7 @@ class WorkerConnection:
 
     def __getattr__(self, item):
         # print(self, item)
-        if item in ("_real", "cursor"):
+        if item in ("_real", "worker", "cursor", "submit", "operation", "stream"):
             return super().__getattribute__(item)
 
         if item in ("join",):
@@ -55,6 +62,11 @@ class WorkerConnection:
             return lambda *a, **kw: self._real.push(attr, "connection", *a, **kw)
         return attr
 
+    @property
+    def worker(self) -> Worker:
+        """Worker owning the connection"""
+        return self._real
+
     def cursor(self, *args, **kwargs):
         """Return cursor object"""
         real = self._real.push(
@@ -68,6 +80,52 @@ class WorkerConnection:
             return
         self._real.push(name, "connection", value=value)
 
+    def operation(self, query: str, data, which="execute", fetch="all", commit=False):
+        """Execute, fetch and commit as a single job, see `utils.run_operation`.
+        Large executemany calls in the bulk lane are split in chunks, each queued
+        as its own job, so other lanes get the worker in between. On the worker
+        thread (jobs given to `submit`), queued jobs of other lanes run between
+        chunks instead."""
+        if (
+            which == "executemany"
+            and job_options.get().priority == BULK
+            and len(data) > BULK_CHUNK_SIZE
+        ):
+            worker = self._real
+            rowcount = 0
+            for start in range(0, len(data), BULK_CHUNK_SIZE):
+                chunk = data[start : start + BULK_CHUNK_SIZE]
+                worker.yield_to(BULK)
+                status = worker.push(
+                    run_operation, "operation", worker.conn, query, chunk, which, "status", commit
+                )
+                rowcount += status.rowcount
+            return Status(rowcount, status.lastrowid)
+        return self._real.push(
+            run_operation, "operation", self._real.conn, query, data, which, fetch, commit
+        )
+
+    def stream(self, query: str, data, size: int, prefetch: int = 2):
+        """Yield the result in chunks of `size` rows. Up to `prefetch` chunks are
+        fetched ahead by the worker while the caller handles the current one."""
+        worker = self._real
+        cursor = worker.push(worker.conn.execute, "connection", query, data)
+        pending = deque(
+            worker.submit(cursor.fetchmany, "cursor", size) for _ in range(max(1, prefetch))
+        )
+        try:
+            while chunk := pending.popleft().result():
+                pending.append(worker.submit(cursor.fetchmany, "cursor", size))
+                yield chunk
+        finally:
+            # Queued behind the pending fetches, no need to wait for them
+            if not worker.is_closed:
+                worker.submit(cursor.close, "cursor")
+
+    def submit(self, fn, *args, **kwargs) -> Future:
+        """Run `fn` on the worker thread, returns its future right away"""
+        return self._real.submit(fn, "job", *args, **kwargs)
+
     def __enter__(self):
         return self.cursor()
 
@@ -0,0 +1,263 @@
+"""Writer coordinator, one process owns the write connection of a database file
+and runs the writes other processes send over a local socket"""
+
+# pylint: disable=broad-exception-caught
+
+from contextlib import suppress
+from multiprocessing.connection import AuthenticationError, Client, Listener
+from multiprocessing.connection import Connection as Channel
+from os import O_CREAT, O_EXCL, O_WRONLY, chmod, close as close_fd, open as open_fd, unlink, write
+from secrets import token_bytes
+from socket import AF_UNIX, SHUT_RDWR, SOCK_STREAM, fromfd
+from sqlite3 import Connection
+from threading import Lock, Thread
+from typing import Any, Iterable
+
+from ..database import Database
+from ..errors import Rejection
+from ..utils import run_operation
+from .process import _picklable
+from .worker import Worker
+
+FAMILY = "AF_UNIX"
+KEY_SUFFIX = ".key"
+
+__all__ = ["WriterCoordinator", "CoordinatedDatabase", "CoordinatedConnection"]
+
+
+def _key_path(address: str) -> str:
+    return f"{address}{KEY_SUFFIX}"
+
+
+def _write_key(path: str, authkey: bytes) -> str:
+    """Write a key file only its owner can read, replacing a stale one"""
+    with suppress(FileNotFoundError):
+        unlink(path)
+    fd = open_fd(path, O_WRONLY | O_CREAT | O_EXCL, 0o600)
+    try:
+        write(fd, authkey)
+    finally:
+        close_fd(fd)
+    return path
+
+
+def _read_key(address: str) -> bytes:
+    """Key written by the coordinator at `address`"""
+    with open(_key_path(address), "rb") as file:
+        return file.read()
+
+
+class WriterCoordinator:
+    """Only writer of a database file, serving `CoordinatedDatabase` clients over
+    a Unix domain socket at `address`.
+
+    Every request is a batch of statements queued as `Worker` jobs. Writes queued
+    back to back, from one client or several, share a transaction and a single
+    commit. Requests are pickled, so they are always authenticated: without an
+    `authkey`, a random one is written to `address` + ".key", readable by the
+    owner only, where clients of the same user find it. The socket is made
+    owner-only too. Other keyword arguments go to the `Worker`."""
+
+    def __init__(
+        self,
+        path: str,
+        address: str,
+        authkey: bytes | None = None,
+        timeout: float = 30,
+        **kwargs,
+    ) -> None:
+        self._worker = Worker(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False, **kwargs
+        )
+        self._worker.push(
+            run_operation,
+            "operation",
+            self._worker.conn,
+            "PRAGMA journal_mode=WAL",
+            (),
+            "execute",
+            "one",
+            False,
+        )
+        self._keyfile: str | None = None
+        if authkey is None:
+            authkey = token_bytes(32)
+            self._keyfile = _write_key(_key_path(address), authkey)
+        self._authkey = authkey
+        self._listener = Listener(address, FAMILY, authkey=authkey)
+        chmod(address, 0o600)
+        self._clients: dict[Channel, Thread] = {}
+        self._lock = Lock()
+        self._closed = False
+        self._acceptor = Thread(target=self._accept, name="WriterCoordinator", daemon=True)
+        self._acceptor.start()
+
+    @property
+    def address(self) -> str:
+        """Socket address clients connect to"""
+        return self._listener.address  # type: ignore
+
+    def _accept(self):
+        while not self._closed:
+            try:
+                channel = self._listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                continue
+            if self._closed:
+                channel.close()
+                break
+            thread = Thread(target=self._serve, args=(channel,), name="WriterCoordinator-client")
+            with self._lock:
+                self._clients[channel] = thread
+            thread.start()
+
+    def _run(self, batch: list[tuple]) -> list[tuple[bool, Any]]:
+        """Queue a batch on the worker and wait for all of it"""
+        futures = []
+        for query, data, which, fetch in batch:
+            try:
+                futures.append(
+                    self._worker.submit(
+                        run_operation,
+                        "operation",
+                        self._worker.conn,
+                        query,
+                        data,
+                        which,
+                        fetch,
+                        False,
+                    )
+                )
+            except Rejection as exc:
+                futures.append(exc)
+        replies = []
+        for fut in futures:
+            try:
+                if isinstance(fut, Exception):
+                    raise fut
+                replies.append((True, fut.result()))
+            except Exception as exc:
+                replies.append((False, _picklable(exc)))
+        return replies
+
+    def _serve(self, channel: Channel):
+        try:
+            while True:
+                try:
+                    batch = channel.recv()
+                except (EOFError, OSError):
+                    break
+                channel.send(self._run(batch))
+        finally:
+            with self._lock:
+                self._clients.pop(channel, None)
+            channel.close()
+
+    def telemetry(self):
+        """Writer worker telemetry, see `Worker.telemetry`"""
+        return self._worker.telemetry()
+
+    @property
+    def closed(self):
+        """Is the coordinator closed?"""
+        return self._closed
+
+    def close(self):
+        """Stop serving clients and close the writer"""
+        if self._closed:
+            return
+        self._closed = True
+        # accept() is not woken up by closing the listener, connect to it instead
+        with suppress(OSError, EOFError, AuthenticationError):
+            Client(self.address, FAMILY, authkey=self._authkey).close()
+        self._acceptor.join()
+        self._listener.close()
+        with self._lock:
+            clients = tuple(self._clients.items())
+        for channel, thread in clients:
+            # Shutting the socket down ends the client thread's pending recv()
+            with suppress(OSError):
+                sock = fromfd(channel.fileno(), AF_UNIX, SOCK_STREAM)
+                sock.shutdown(SHUT_RDWR)
+                sock.close()
+            thread.join()
+        self._worker.close()
+        if self._keyfile is not None:
+            with suppress(OSError):
+                unlink(self._keyfile)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+
+class CoordinatedConnection:
+    """Local connection whose autocommitted operations run on a coordinator.
+    Everything else, reads and explicit transactions included, stays local."""
+
+    __slots__ = ("_conn", "_channel", "_lock")
+
+    def __init__(self, conn: Connection, channel: Channel) -> None:
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_channel", channel)
+        object.__setattr__(self, "_lock", Lock())
+
+    def __getattr__(self, item):
+        return getattr(self._conn, item)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._conn, name, value)
+
+    def batch(self, statements: Iterable[tuple]) -> list[tuple[bool, Any]]:
+        """Send `(query, data, which, fetch)` statements to the coordinator in one
+        round trip, returns an `(ok, result or exception)` pair for each"""
+        with self._lock:
+            self._channel.send(list(statements))
+            return self._channel.recv()
+
+    def operation(self, query: str, data, which="execute", fetch="all", commit=False):
+        """See `utils.run_operation`, committing ones are sent to the coordinator"""
+        if not commit:
+            return run_operation(self._conn, query, data, which, fetch)
+        ((ok, value),) = self.batch([(query, data, which, fetch)])
+        if not ok:
+            raise value
+        return value
+
+    def close(self):
+        """Disconnect from the coordinator and close the local connection"""
+        self._channel.close()
+        self._conn.close()
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *args):
+        return self._conn.__exit__(*args)
+
+
+class CoordinatedDatabase(Database):
+    """Database client of a `WriterCoordinator` listening at `address`.
+
+    Table writes outside of transactions are run by the coordinator, so processes
+    don't fight over the write lock. Reads use the file directly (WAL mode), and
+    explicit transactions and schema changes still write through the local
+    connection. Without `authkey`, the key the coordinator generated is read
+    from `address` + ".key"."""
+
+    def __init__(self, path: str, address: str, authkey: bytes | None = None, **kwargs) -> None:
+        self._address = address
+        self._authkey = authkey
+        super().__init__(path, **kwargs)
+
+    def _create_connection(self):
+        super()._create_connection()
+        authkey = self._authkey if self._authkey is not None else _read_key(self._address)
+        self._database = CoordinatedConnection(
+            self._database, Client(self._address, FAMILY, authkey=authkey)
+        )
+
+    def _restore_options(self):
+        return super()._restore_options() | {"address": self._address, "authkey": self._authkey}
@@ -5,11 +5,22 @@ import warnings
 from sqlite_database.utils import dict_factory, NoopResource
 from sqlite_database.database import Database
 from sqlite_database.workers.connection import WorkerConnection, WorkerType
+from sqlite_database.workers.worker import Worker
+from sqlite_database.workers.scheduler import Lane
+from sqlite_database.workers.process import ProcessConnection, DEFAULT_SHM_THRESHOLD
 from sqlite_database.errors import VersionError
 
 
 class DatabaseWorker(Database):
-    """Database Worker"""
+    """Database Worker
+
+    Thread workers accept `max_queue` (0 is unbounded) and `overload`, what
+    happens when the queue is full: "block", "reject" or "drop". `on_telemetry`
+    receives a `telemetry()` snapshot every `telemetry_interval` seconds.
+
+    Process workers (`worker_type="process"`) have no job queue of their own:
+    `submit()`, `options()`, `telemetry()` and `wait_stats()` raise TypeError
+    for them."""
 
     def __init__(self, path: str, worker_type: WorkerType = "thread", **kwargs) -> None:
         self._worker_type: WorkerType = worker_type
@@ -27,13 +38,26 @@ class DatabaseWorker(Database):
         # )
         # conn.row_factory = dict_factory
         try:
-            self._database = WorkerConnection(
-                self._path,
-                worker_type=self._worker_type,
-                timeout=timeout,
-                isolation_level=self._kwargs.pop("isolation_level", None),
-                check_same_thread=self._kwargs.pop("check_same_thread", False)
-            )
+            if self._worker_type == "process":
+                self._database = ProcessConnection(
+                    self._path,
+                    timeout=timeout,
+                    isolation_level=self._kwargs.pop("isolation_level", None),
+                    check_same_thread=self._kwargs.pop("check_same_thread", False),
+                    shm_threshold=self._kwargs.pop("shm_threshold", DEFAULT_SHM_THRESHOLD),
+                )
+            else:
+                self._database = WorkerConnection(
+                    self._path,
+                    worker_type=self._worker_type,
+                    timeout=timeout,
+                    max_queue=self._kwargs.pop("max_queue", 0),
+                    overload=self._kwargs.pop("overload", "block"),
+                    on_telemetry=self._kwargs.pop("on_telemetry", None),
+                    telemetry_interval=self._kwargs.pop("telemetry_interval", 10.0),
+                    isolation_level=self._kwargs.pop("isolation_level", None),
+                    check_same_thread=self._kwargs.pop("check_same_thread", False)
+                )
             self._database.row_factory = dict_factory
             self._database.execute("PRAGMA journal_mode=WAL;")
             self._database.execute(f'PRAGMA busy_timeout={timeout * 1000};')
@@ -41,6 +65,42 @@ class DatabaseWorker(Database):
             self._database = NoopResource()
             raise
 
+    def __reduce__(self):
+        raise TypeError(
+            f"Cannot pickle {type(self).__name__}, its worker cannot be shared. "
+            "Open a database in the child process instead."
+        )
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue `fn` on the worker thread and return its future right away.
+        Calls made by `fn` to this database's connection don't hop threads again.
+
+        Thread workers only: the connection of a process worker lives in another
+        process, where `fn` and the tables it uses cannot be sent."""
+        self._thread_worker("submit()")
+        return self._database.submit(fn, *args, **kwargs)  # type: ignore
+
+    def _thread_worker(self, feature: str) -> Worker:
+        """Worker of a thread worker database, TypeError for process workers"""
+        if self._worker_type == "process":
+            raise TypeError(f'{feature} is not supported with worker_type="process"')
+        return self._database.worker  # type: ignore
+
+    def options(self, priority: int | Lane | None = None, timeout: float | None = None):
+        """Priority and queueing timeout of worker jobs submitted within the block,
+        see `Worker.options`. Thread workers only."""
+        self._thread_worker("options()")
+        return Worker.options(priority, timeout)
+
+    def telemetry(self):
+        """Worker telemetry snapshot, see `Worker.telemetry`. Thread workers only."""
+        return self._thread_worker("telemetry()").telemetry()
+
+    def wait_stats(self):
+        """Queue wait time of started jobs per priority lane, in seconds. Thread
+        workers only."""
+        return self._thread_worker("wait_stats()").queue.wait_stats()
+
     def close(self):
         self._database.close()
         self._database.join() # type: ignore
@@ -59,4 +119,4 @@ class DatabaseWorker(Database):
         )
 
     def __repr__(self) -> str:
-        return f"<{type(self).__name__} {self._database._real.name}>" # type: ignore
+        return f"<{type(self).__name__} {self._database.worker.name}>" # type: ignore
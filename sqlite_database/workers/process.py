@@ -0,0 +1,350 @@
+"""Worker process, the connection lives in a child process"""
+
+# pylint: disable=too-few-public-methods,broad-exception-caught
+
+from atexit import register as finalize
+from concurrent.futures import Future
+from collections import deque
+from itertools import count
+from multiprocessing import get_context
+from multiprocessing.connection import Connection as Pipe
+from multiprocessing.shared_memory import SharedMemory
+from os import getpid
+from pickle import HIGHEST_PROTOCOL, PicklingError, dumps, loads
+from queue import Empty, Queue
+from sqlite3 import Connection, Cursor, connect
+from threading import Lock, Thread
+from typing import Any, NamedTuple
+
+from ..errors import Rejection
+from ..utils import run_operation
+
+OP_CALL = 0
+OP_GET = 1
+OP_SET = 2
+OP_RELEASE = 3
+OP_CLOSE = 4
+OP_RUN = 5
+CONNECTION = 0
+FRAME_INLINE = b"I"
+FRAME_SHARED = b"S"
+DEFAULT_SHM_THRESHOLD = 1 << 20
+DEFAULT_BATCH_SIZE = 256
+
+__all__ = ["ProcessWorker", "ProcessConnection", "ProcessCursor"]
+
+
+class RemoteHandle(NamedTuple):
+    """Reference to an object kept alive in the worker process"""
+
+    ident: int
+
+
+def _encode(payload: Any, shm_threshold: int | None) -> bytes:
+    """Frame a payload, spilling large ones into shared memory"""
+    data = dumps(payload, HIGHEST_PROTOCOL)
+    if shm_threshold is None or len(data) < shm_threshold:
+        return FRAME_INLINE + data
+    shm = SharedMemory(create=True, size=len(data))
+    shm.buf[: len(data)] = data
+    name = shm.name
+    shm.close()
+    return FRAME_SHARED + dumps((name, len(data)), HIGHEST_PROTOCOL)
+
+
+def _decode(frame: bytes) -> Any:
+    """Read a frame written by `_encode`"""
+    if frame[:1] == FRAME_INLINE:
+        return loads(frame[1:])
+    name, size = loads(frame[1:])
+    shm = SharedMemory(name=name)
+    try:
+        return loads(shm.buf[:size])
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _picklable(exc: BaseException):
+    try:
+        dumps(exc)
+        return exc
+    except (PicklingError, TypeError, AttributeError):
+        return RuntimeError(f"{type(exc).__name__}: {exc!s}")
+
+
+def _dispatch(conn: Connection, cursors: dict[int, Cursor], request: tuple) -> Any:
+    """Run one request in the worker process, cursors are returned as handles"""
+    _, op, target, name, args, kwargs = request
+    obj = conn if target == CONNECTION else cursors[target]
+    result = None
+    if op == OP_CALL:
+        result = getattr(obj, name)(*args, **kwargs)
+    elif op == OP_GET:
+        result = getattr(obj, name)
+    elif op == OP_SET:
+        setattr(obj, name, args[0])
+    elif op == OP_RELEASE:
+        cursors.pop(target, None)
+    elif op == OP_RUN:
+        result = run_operation(conn, *args)
+    if isinstance(result, Cursor):
+        cursors[id(result)] = result
+        return RemoteHandle(id(result))
+    return result
+
+
+def _serve(pipe: Pipe, args: tuple, kwargs: dict, shm_threshold: int | None):
+    """Worker process main loop, one reply frame per request batch"""
+    conn = connect(*args, **kwargs)
+    cursors: dict[int, Cursor] = {}
+    running = True
+    while running:
+        try:
+            batch = _decode(pipe.recv_bytes())
+        except EOFError:
+            break
+        replies = []
+        for request in batch:
+            running = running and request[1] != OP_CLOSE
+            try:
+                reply = (request[0], True, _dispatch(conn, cursors, request))
+            except Exception as exc:
+                reply = (request[0], False, _picklable(exc))
+            if request[0] is not None:
+                replies.append(reply)
+        if replies:
+            pipe.send_bytes(_encode(replies, shm_threshold))
+    cursors.clear()
+    conn.close()
+    pipe.close()
+
+
+class ProcessWorker:
+    """Worker owning its connection in a child process. Requests are framed in
+    batches, and replies larger than `shm_threshold` bytes travel through shared
+    memory instead of the pipe. Set `shm_threshold` to None to disable it."""
+
+    def __init__(
+        self,
+        *args,
+        shm_threshold: int | None = DEFAULT_SHM_THRESHOLD,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        **kwargs,
+    ):
+        context = get_context("spawn")
+        self._pipe, child = context.Pipe()
+        self.process = context.Process(
+            target=_serve,
+            args=(child, args, kwargs, shm_threshold),
+            name="WorkerDB[process]",
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+        self._ids = count()
+        self._pending: dict[int, Future] = {}
+        self._pending_lock = Lock()
+        self.queue: Queue = Queue()
+        self._closing = False
+        self._dead = False
+        self._pid = getpid()
+        # Sender and receiver of the pipe
+        self._threads = (
+            Thread(
+                target=self._send_loop, args=(batch_size,), name=f"{self.name}-send", daemon=True
+            ),
+            Thread(target=self._recv_loop, name=f"{self.name}-recv", daemon=True),
+        )
+        for thread in self._threads:
+            thread.start()
+        finalize(self.close)
+
+    @property
+    def name(self):
+        """Name of the worker process"""
+        return self.process.name
+
+    def _send_loop(self, batch_size: int):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            batch = [item]
+            while len(batch) < batch_size:
+                try:
+                    item = self.queue.get_nowait()
+                except Empty:
+                    break
+                if item is None:
+                    self.queue.put(None)
+                    break
+                batch.append(item)
+            try:
+                self._pipe.send_bytes(_encode(batch, None))
+            except (OSError, ValueError):
+                break
+
+    def _recv_loop(self):
+        while True:
+            try:
+                replies = _decode(self._pipe.recv_bytes())
+            except (EOFError, OSError):
+                break
+            for req_id, ok, payload in replies:
+                with self._pending_lock:
+                    fut = self._pending.pop(req_id)
+                if ok:
+                    fut.set_result(payload)
+                else:
+                    fut.set_exception(payload)
+        with self._pending_lock:
+            self._dead = True
+            pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            fut.set_exception(Rejection("Worker process has exited"))
+
+    def submit(self, op: int, target: int, name: str, *args, **kwargs) -> Future:
+        """Queue a request, returns its future. `name` is the attribute or method
+        of the target, empty for operations that don't need one."""
+        if self._closing:
+            exc = Rejection("Cannot push during shutdown")
+            exc.add_note(f"Caller: {name}")
+            raise exc
+        fut: Future = Future()
+        req_id = next(self._ids)
+        with self._pending_lock:
+            if self._dead:
+                exc = Rejection("Worker process has exited")
+                exc.add_note(f"Caller: {name}")
+                raise exc
+            self._pending[req_id] = fut
+        self.queue.put((req_id, op, target, name, args, kwargs))
+        return fut
+
+    def push(self, op: int, target: int, name: str, *args, **kwargs):
+        """Push to worker and wait for the result"""
+        return self.submit(op, target, name, *args, **kwargs).result()
+
+    def post(self, op: int, target: int, name: str, *args, **kwargs):
+        """Push to worker without waiting for a reply"""
+        if not (self._closing or self._dead):
+            self.queue.put((None, op, target, name, args, kwargs))
+
+    @property
+    def is_closed(self):
+        """Return true if worker is closed or its process has exited"""
+        return self._closing or self._dead
+
+    def close(self):
+        """Close this worker"""
+        if self._closing or self._pid != getpid():
+            # Forked children share the pipe but not the threads serving it
+            return
+        try:
+            self.push(OP_CLOSE, CONNECTION, "")
+        except Rejection:
+            pass
+        self._closing = True
+        self.queue.put(None)
+        self.process.join()
+        for thread in self._threads:
+            thread.join()
+        self._pipe.close()
+
+    def join(self, timeout: float | None = None):
+        """Join this worker"""
+        if self._pid == getpid():
+            self.process.join(timeout)
+
+
+class ProcessCursor:
+    """Cursor living in the worker process"""
+
+    __slots__ = ("_worker", "_ident", "__weakref__")
+
+    def __init__(self, worker: ProcessWorker, ident: int):
+        self._worker = worker
+        self._ident = ident
+
+    def _wrap(self, result):
+        if isinstance(result, RemoteHandle):
+            if result.ident == self._ident:
+                return self
+            return ProcessCursor(self._worker, result.ident)
+        return result
+
+    def __getattr__(self, item):
+        if callable(getattr(Cursor, item, None)):
+            return lambda *a, **kw: self._wrap(
+                self._worker.push(OP_CALL, self._ident, item, *a, **kw)
+            )
+        return self._worker.push(OP_GET, self._ident, item)
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def __del__(self):
+        self._worker.post(OP_RELEASE, self._ident, "")
+
+
+class ProcessConnection:
+    """Connection living in the worker process"""
+
+    def __init__(self, *args, **kwargs):
+        self._real = ProcessWorker(*args, **kwargs)
+
+    @property
+    def worker(self) -> ProcessWorker:
+        """Worker owning the connection"""
+        return self._real
+
+    def _wrap(self, result):
+        if isinstance(result, RemoteHandle):
+            return ProcessCursor(self._real, result.ident)
+        return result
+
+    def __getattr__(self, item):
+        if item == "close":
+            return self._real.close
+        if item == "join":
+            return self._real.join
+        if callable(getattr(Connection, item, None)):
+            return lambda *a, **kw: self._wrap(self._real.push(OP_CALL, CONNECTION, item, *a, **kw))
+        return self._real.push(OP_GET, CONNECTION, item)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "_real":
+            super().__setattr__(name, value)
+            return
+        self._real.push(OP_SET, CONNECTION, name, value)
+
+    def operation(self, query: str, data, which="execute", fetch="all", commit=False):
+        """Execute, fetch and commit in one round trip, see `utils.run_operation`"""
+        return self._real.push(OP_RUN, CONNECTION, "", query, data, which, fetch, commit)
+
+    def stream(self, query: str, data, size: int, prefetch: int = 2):
+        """Yield the result in chunks of `size` rows, fetching up to `prefetch`
+        chunks ahead in the worker process."""
+        worker = self._real
+        handle = worker.push(OP_CALL, CONNECTION, "execute", query, data)
+        pending = deque(
+            worker.submit(OP_CALL, handle.ident, "fetchmany", size)
+            for _ in range(max(1, prefetch))
+        )
+        try:
+            while chunk := pending.popleft().result():
+                pending.append(worker.submit(OP_CALL, handle.ident, "fetchmany", size))
+                yield chunk
+        finally:
+            worker.post(OP_RELEASE, handle.ident, "")
+
+    def cursor(self, *args, **kwargs) -> ProcessCursor:
+        """Return cursor object"""
+        return self._wrap(self._real.push(OP_CALL, CONNECTION, "cursor", *args, **kwargs))
+
+    def __enter__(self):
+        return self.cursor()
+
+    def __exit__(self, _, exc, __):
+        pass
@@ -0,0 +1,206 @@
+"""Job queue of thread workers, bounded, split in priority lanes and aware of deadlines"""
+
+from collections import deque
+from contextvars import ContextVar
+from queue import Empty
+from threading import Condition, Lock
+from time import monotonic
+from typing import Literal, NamedTuple, TypeAlias
+
+from ..errors import DeadlineExceeded, Rejection
+from .telemetry import WorkerTelemetry
+
+OverloadPolicy: TypeAlias = Literal["block", "reject", "drop"]
+Lane: TypeAlias = Literal["interactive", "normal", "bulk"]
+INTERACTIVE = 0
+NORMAL = 1
+BULK = 2
+LANES: tuple[Lane, ...] = ("interactive", "normal", "bulk")
+# Seconds of queue wait worth one lane of priority
+DEFAULT_AGING = 1.0
+
+__all__ = [
+    "JobQueue",
+    "OverloadPolicy",
+    "Lane",
+    "LANES",
+    "INTERACTIVE",
+    "NORMAL",
+    "BULK",
+    "DEFAULT_AGING",
+]
+
+
+def lane_of(priority: int | Lane) -> int:
+    """Lane index of a priority given as index or name"""
+    if isinstance(priority, str):
+        return LANES.index(priority)
+    if not 0 <= priority < len(LANES):
+        raise ValueError(f"Unknown priority: {priority!r}")
+    return priority
+
+
+class JobOptions(NamedTuple):
+    """Options applied to jobs submitted in the current context"""
+
+    priority: int = NORMAL
+    timeout: float | None = None
+
+
+job_options: ContextVar[JobOptions] = ContextVar("job_options", default=JobOptions())
+
+
+class _Entry(NamedTuple):
+    job: tuple
+    priority: int
+    deadline: float | None
+    queued: float
+
+
+def _reject(job: tuple, exc: Rejection):
+    fut = job[4]
+    if not fut.done():
+        fut.set_exception(exc)
+
+
+class JobQueue:
+    """Worker jobs, one FIFO per priority lane. Interactive jobs are taken before
+    normal ones, and those before bulk ones. A job gains one lane of priority per
+    `aging` seconds spent queued, so less important lanes are never starved
+    (None keeps the order strict).
+
+    With `maxsize` set, a full queue either blocks the producer ("block"), raises
+    `Rejection` ("reject") or evicts the oldest of the least important jobs when
+    they're less important than the new one ("drop"). Jobs whose deadline passed
+    while queued fail with `DeadlineExceeded`."""
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        overload: OverloadPolicy = "block",
+        telemetry: WorkerTelemetry | None = None,
+        aging: float | None = DEFAULT_AGING,
+    ) -> None:
+        if overload not in ("block", "reject", "drop"):
+            raise ValueError(f"Unknown overload policy: {overload!r}")
+        self.maxsize = maxsize
+        self.overload = overload
+        self.aging = aging
+        self._lanes: tuple[deque[_Entry], ...] = tuple(deque() for _ in LANES)
+        self._size = 0
+        self.telemetry = telemetry or WorkerTelemetry(LANES)
+        self._lock = Lock()
+        self._not_empty = Condition(self._lock)
+        self._not_full = Condition(self._lock)
+        self._unfinished = 0
+
+    def _full(self):
+        return 0 < self.maxsize <= self._size
+
+    def _evict(self, priority: int):
+        """Remove the oldest of the least important entries below `priority`"""
+        for lane in reversed(self._lanes[priority + 1 :]):
+            if lane:
+                victim = lane.popleft()
+                break
+        else:
+            return False
+        self._size -= 1
+        self._unfinished -= 1
+        self.telemetry.refused["dropped"] += 1
+        _reject(victim.job, Rejection("Job was dropped, worker queue is full"))
+        return True
+
+    def put(self, job: tuple, priority: int = NORMAL, deadline: float | None = None, force=False):
+        """Queue a job, `force` skips the bound (used for close signals)"""
+        with self._not_full:
+            if not force and self._full():
+                if self.overload == "reject":
+                    self.telemetry.refused["rejected"] += 1
+                    raise Rejection("Worker queue is full")
+                if self.overload == "drop" and not self._evict(priority):
+                    self.telemetry.refused["rejected"] += 1
+                    raise Rejection("Worker queue is full of more important jobs")
+                while self._full():
+                    self._not_full.wait()
+            self._lanes[priority].append(_Entry(job, priority, deadline, monotonic()))
+            self._size += 1
+            self._unfinished += 1
+            self.telemetry.depth.add(self._size)
+            self._not_empty.notify()
+
+    def _next_lane(self, now: float) -> int:
+        """Lane to take from, the most important one once queue wait is counted"""
+        best, rank = -1, 0.0
+        for index, lane in enumerate(self._lanes):
+            if not lane:
+                continue
+            aged = index
+            if self.aging:
+                aged -= (now - lane[0].queued) // self.aging
+            if best == -1 or aged < rank:
+                best, rank = index, aged
+        return best
+
+    def _pop(self, lane: int | None = None):
+        """Pop the next live job, from `lane` only when given, caller holds the
+        lock. Returns the job and its lane, None if nothing is left."""
+        while self._size:
+            index = self._next_lane(monotonic()) if lane is None else lane
+            if not self._lanes[index]:
+                return None
+            entry = self._lanes[index].popleft()
+            self._size -= 1
+            self._not_full.notify()
+            now = monotonic()
+            if entry.deadline is not None and entry.deadline < now:
+                self._unfinished -= 1
+                self.telemetry.refused["expired"] += 1
+                _reject(entry.job, DeadlineExceeded("Job deadline passed while queued"))
+                continue
+            self.telemetry.wait[entry.priority].add(now - entry.queued)
+            return entry.job, entry.priority
+        return None
+
+    def get(self) -> tuple[tuple, int]:
+        """Wait for the next job, returns it with its lane"""
+        with self._not_empty:
+            while (popped := self._pop()) is None:
+                self._not_empty.wait()
+            return popped
+
+    def get_nowait(self, lane: int | None = None) -> tuple:
+        """Next job, of `lane` only when given. Raises `queue.Empty` if there's none"""
+        with self._lock:
+            popped = self._pop(lane)
+        if popped is None:
+            raise Empty
+        return popped[0]
+
+    def preempting(self, lane: int) -> int | None:
+        """Most important lane above `lane` with jobs queued, if any"""
+        with self._lock:
+            return next((index for index in range(lane) if self._lanes[index]), None)
+
+    def task_done(self):
+        """Mark a job returned by get as finished"""
+        with self._lock:
+            self._unfinished -= 1
+
+    @property
+    def unfinished(self):
+        """Jobs queued or being executed"""
+        return self._unfinished
+
+    def qsize(self):
+        """Amount of queued jobs"""
+        return self._size
+
+    def empty(self):
+        """Is the queue empty?"""
+        return not self._size
+
+    def wait_stats(self) -> dict[Lane, dict[str, float]]:
+        """Queue wait time of started jobs per lane, in seconds"""
+        with self._lock:
+            return {name: hist.snapshot() for name, hist in zip(LANES, self.telemetry.wait)}
@@ -0,0 +1,112 @@
+"""Worker telemetry, kept in power-of-two histograms"""
+
+from threading import Event, Thread
+from typing import Any, Callable
+
+BUCKETS = 48
+
+__all__ = ["Histogram", "WorkerTelemetry"]
+
+
+class Histogram:
+    """Histogram with power-of-two buckets of `unit`. Recording is a couple of
+    integer operations, percentiles are approximated by the bucket bounds."""
+
+    __slots__ = ("unit", "buckets", "count", "total", "max")
+
+    def __init__(self, unit: float = 1e-6) -> None:
+        self.unit = unit
+        self.buckets = [0] * BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        """Record a value"""
+        self.buckets[min(int(value / self.unit).bit_length(), BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the `fraction` percentile"""
+        if not self.count:
+            return 0.0
+        wanted = fraction * self.count
+        seen = 0
+        for index, amount in enumerate(self.buckets):
+            seen += amount
+            if seen >= wanted:
+                return min((1 << index) * self.unit, self.max)
+        return self.max
+
+    def snapshot(self) -> dict[str, float]:
+        """Plain dict copy of the current numbers"""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+        }
+
+
+class WorkerTelemetry:
+    """Queue depth, queue wait per lane, execution time per owner and operation,
+    commit time and the amount of jobs refused, dropped or expired.
+
+    Times are in seconds. `callback`, when given, receives a snapshot every
+    `interval` seconds from a daemon thread until `stop()` is called."""
+
+    def __init__(
+        self,
+        lanes: tuple[str, ...],
+        callback: Callable[[dict[str, Any]], Any] | None = None,
+        interval: float = 10.0,
+    ) -> None:
+        self.lanes = lanes
+        self.depth = Histogram(1)
+        self.wait = tuple(Histogram() for _ in lanes)
+        self.execution: dict[tuple[str, str], Histogram] = {}
+        self.commit = Histogram()
+        self.refused = {"rejected": 0, "dropped": 0, "expired": 0}
+        self._stopped = Event()
+        self._reporter: Thread | None = None
+        if callback is not None:
+            self._reporter = Thread(
+                target=self._report, args=(callback, interval), name="WorkerTelemetry", daemon=True
+            )
+            self._reporter.start()
+
+    def executed(self, owner: str, operation: str, elapsed: float):
+        """Record the execution time of a job"""
+        key = (owner, operation)
+        histogram = self.execution.get(key)
+        if histogram is None:
+            histogram = self.execution[key] = Histogram()
+        histogram.add(elapsed)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Plain dict copy of every metric"""
+        return {
+            "depth": self.depth.snapshot(),
+            "wait": {lane: hist.snapshot() for lane, hist in zip(self.lanes, self.wait)},
+            "execution": {
+                f"{owner}.{operation}": hist.snapshot()
+                for (owner, operation), hist in tuple(self.execution.items())
+            },
+            "commit": self.commit.snapshot(),
+            "refused": dict(self.refused),
+        }
+
+    def _report(self, callback: Callable[[dict[str, Any]], Any], interval: float):
+        while not self._stopped.wait(interval):
+            try:
+                callback(self.snapshot())
+            except Exception:  # pylint: disable=broad-exception-caught
+                pass
+
+    def stop(self):
+        """Stop the periodic callback"""
+        self._stopped.set()
@@ -2,33 +2,56 @@
 
 # pylint: disable=ungrouped-imports,possibly-used-before-assignment,too-few-public-methods,no-name-in-module,no-member
 
-from sys import version_info
 from concurrent.futures import Future
-from queue import Empty, Queue
+from contextlib import contextmanager, suppress
+from os import getpid
+from queue import Empty
 from sqlite3 import Connection
-from threading import Thread, Event as EventThread
-from typing import Literal, TypeAlias
+from threading import Thread, Event as EventThread, current_thread
+from time import monotonic, perf_counter
+from typing import Any, Callable, Literal, TypeAlias
 from atexit import register as finalize
 import warnings
 
 from ..errors import Rejection, ImplementationWarning
+from .scheduler import (
+    DEFAULT_AGING,
+    LANES,
+    JobOptions,
+    JobQueue,
+    Lane,
+    OverloadPolicy,
+    job_options,
+    lane_of,
+)
+from .telemetry import WorkerTelemetry
 
 WorkerType: TypeAlias = Literal["thread"] | Literal["process"]
 POSSIBLE_STACKTRACE_COUNT = 6
-FEATURE_MIN_VERSION = (3, 13)
+MAX_BATCH_SIZE = 1024
+WRITE_STATEMENTS = ("insert", "update", "delete", "replace")
 
-if version_info >= FEATURE_MIN_VERSION:
-    from queue import ShutDown  # type: ignore
-else:
-    class ShutDown(RuntimeError):
-        """Raised when put/get with shut-down queue."""
+class Worker:  # pylint: disable=too-many-instance-attributes
+    """Worker
 
-class Worker:
-    """Worker"""
+    `on_telemetry`, when given, receives `telemetry()` snapshots every
+    `telemetry_interval` seconds. Queued jobs gain one lane of priority per
+    `aging` seconds, see `JobQueue`."""
 
-    def __init__(self, *args, worker_type: WorkerType = "thread", **kwargs):
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *args,
+        worker_type: WorkerType = "thread",
+        max_queue: int = 0,
+        overload: OverloadPolicy = "block",
+        on_telemetry: Callable[[dict[str, Any]], Any] | None = None,
+        telemetry_interval: float = 10.0,
+        aging: float | None = DEFAULT_AGING,
+        **kwargs,
+    ):
         self.conn = Connection(*args, **kwargs)
-        self.queue = Queue()
+        self.metrics = WorkerTelemetry(LANES, on_telemetry, telemetry_interval)
+        self.queue = JobQueue(max_queue, overload, self.metrics, aging)
         self.name = f"WorkerDB[{worker_type}]"
         self.daemon = False
         if worker_type in ("thread", "process"):
@@ -37,11 +60,13 @@ class Worker:
 
         if worker_type == 'process':
             warnings.warn(
-                "Worker Process implementation is not supported, reverting back to threading.",
+                "Worker runs on a thread, use workers.process.ProcessWorker for a process.",
                 ImplementationWarning,
                 POSSIBLE_STACKTRACE_COUNT)
         self.accepting = self.event
         self._closing = False
+        self._stopping = False
+        self._pid = getpid()
         self.event.set()
         self.worker.start()
         finalize(self.close)
@@ -50,69 +75,258 @@ class Worker:
         """Recall remainding queues"""
         while True:
             try:
-                fn, _, args, kwargs, fut = self.queue.get_nowait()
+                job = self.queue.get_nowait()
             except Empty:
                 break
             try:
-                if callable(fn):
-                    res = fn(*args, **kwargs)
-                    fut.set_result(res)
+                if self._is_close(job):
+                    job[4].set_result(None)
                 else:
-                    fut.set_result(None)
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                fut.set_exception(e)
+                    self._execute(job)
             finally:
                 self.queue.task_done()
 
-    def _run(self):
-        while True:
+    def _drain(self, first, lane: int):
+        """Take everything already queued behind `first` in its lane"""
+        jobs = [first]
+        while len(jobs) < MAX_BATCH_SIZE:
             try:
-                fn, owner, args, kwargs, fut = self.queue.get(timeout=0.01)
+                jobs.append(self.queue.get_nowait(lane))
             except Empty:
-                if self._closing:
-                    break
-                continue
-            except ShutDown:
                 break
+        return jobs
 
-            # If close signal is received, finish all tasks and quit
-            if fn is None or (
-                getattr(fn, "__name__", "") == "close" and owner == "connection"
-            ):
-                fut.set_result(None)
-                self.queue.task_done()
+    @staticmethod
+    def _resolve(fut: Future, ok: bool, value):
+        """Resolve a future unless it already is"""
+        if fut.done():
+            return
+        if ok:
+            fut.set_result(value)
+        else:
+            fut.set_exception(value)
+
+    def _execute(self, job):
+        fn, owner, args, kwargs, fut = job
+        start = perf_counter()
+        try:
+            if callable(fn):
+                res = fn(*args, **kwargs)
+                self._resolve(fut, True, res)
+            else:
+                setattr(self.conn, fn, kwargs["value"])
+                self._resolve(fut, True, None)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self._resolve(fut, False, e)
+        finally:
+            self._record(owner, self._operation(job), perf_counter() - start)
+
+    def _record(self, owner: str, operation: str, elapsed: float):
+        self.metrics.executed(owner, operation, elapsed)
+        if operation == "commit":
+            self.metrics.commit.add(elapsed)
+
+    @staticmethod
+    def _operation(job) -> str:
+        """Name of what a job does, the statement verb for operation jobs"""
+        fn, owner, args, _, _ = job
+        if owner == "operation":
+            return args[1].lstrip().split(None, 1)[0].lower()
+        if callable(fn):
+            return getattr(fn, "__name__", "call")
+        return "setattr" if fn is not None else "close"
+
+    def _is_write(self, job):
+        """Is this job a DML statement that can share a transaction?"""
+        fn, owner, args, _, _ = job
+        if owner == "operation":
+            # (conn, query, data, which, fetch, commit), committing ones run alone
+            if args[5]:
+                return False
+            args = args[1:]
+        elif getattr(fn, "__name__", "") not in ("execute", "executemany"):
+            return False
+        return (
+            bool(args)
+            and isinstance(args[0], str)
+            and args[0].lstrip()[:7].lower().startswith(WRITE_STATEMENTS)
+        )
+
+    @staticmethod
+    def _is_close(job):
+        fn, owner = job[0], job[1]
+        return fn is None or (getattr(fn, "__name__", "") == "close" and owner == "connection")
+
+    @staticmethod
+    def _is_commit(job):
+        return getattr(job[0], "__name__", "") == "commit" and not job[2]
+
+    def _execute_writes(self, group):
+        """Run consecutive writes in one transaction, resolved after a single commit"""
+        results = []
+        try:
+            self.conn.execute("BEGIN")
+        except Exception:  # pylint: disable=broad-exception-caught
+            for job in group:
+                self._execute(job)
+            return
+        for job in group:
+            fn, owner, args, kwargs, _ = job
+            start = perf_counter()
+            try:
+                results.append((True, fn(*args, **kwargs)))
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                results.append((False, e))
+            self._record(owner, self._operation(job), perf_counter() - start)
+        start = perf_counter()
+        try:
+            self.conn.execute("COMMIT")
+            self.metrics.commit.add(perf_counter() - start)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            results = [(False, e)] * len(group)
+            with suppress(Exception):
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+        for job, (ok, value) in zip(group, results):
+            self._resolve(job[4], ok, value)
+
+    def _execute_commits(self, group):
+        """Consecutive commits only need to run once"""
+        self._execute(group[0])
+        for job in group[1:]:
+            self._resolve(job[4], True, None)
+
+    def _preempt(self, lane: int):
+        """Run one batch of a more important lane queued meanwhile, if any"""
+        above = self.queue.preempting(lane)
+        if above is None:
+            return
+        try:
+            first = self.queue.get_nowait(above)
+        except Empty:  # Expired meanwhile
+            return
+        self._stopping = self._process(self._drain(first, above), above) or self._stopping
+
+    def yield_to(self, lane: int):
+        """Let jobs of lanes more important than `lane` run, called by long jobs
+        between their steps. Only has effect on the worker thread."""
+        if current_thread() is self.worker and not self._stopping:
+            self._preempt(lane)
+
+    def _run_batch(self, jobs, lane: int):
+        """Execute a drained batch, returns True when a close signal was received.
+        Before each step, a batch of a more important lane queued meanwhile runs."""
+        index = 0
+        while index < len(jobs):
+            if lane:
+                self._preempt(lane)
+            if self._stopping:
+                for rest in jobs[index:]:
+                    self._execute(rest)
+                return True
+            job = jobs[index]
+            if self._is_close(job):
+                # If close signal is received, finish all tasks and quit
+                self._resolve(job[4], True, None)
                 self._closing = True
                 self.event.clear()
-                self.recall()  # Finish all remaining tasks
-                break
+                for rest in jobs[index + 1 :]:
+                    self._execute(rest)
+                self.recall()
+                return True
+            end = index + 1
+            coalesce, writes = None, False
+            if self._is_commit(job):
+                coalesce = self._is_commit
+            elif self._is_write(job) and self._autocommit():
+                coalesce, writes = self._is_write, True
+            while coalesce and end < len(jobs) and coalesce(jobs[end]):
+                end += 1
+            if end - index == 1:
+                self._execute(job)
+            elif writes:
+                self._execute_writes(jobs[index:end])
+            else:
+                self._execute_commits(jobs[index:end])
+            index = end
+        return False
 
-            try:
-                if callable(fn):
-                    res = fn(*args, **kwargs)
-                    fut.set_result(res)
+    def _autocommit(self):
+        return self.conn.isolation_level is None and not self.conn.in_transaction
+
+    def _process(self, jobs, lane: int):
+        """Run a batch and mark its jobs done, returns True when closing"""
+        closing = True
+        try:
+            closing = self._run_batch(jobs, lane)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # Never leave a caller waiting on a future nobody resolves
+            closing = False
+            for job in jobs:
+                if self._is_close(job):
+                    closing = True
+                    self._resolve(job[4], True, None)
                 else:
-                    setattr(self.conn, fn, kwargs["value"])
-                    fut.set_result(None)
-            except Exception as e:  # pylint: disable=broad-exception-caught
-                fut.set_exception(e)
-            finally:
+                    self._resolve(job[4], False, e)
+            if closing:
+                self.recall()
+        finally:
+            for _ in jobs:
                 self.queue.task_done()
+        return closing
+
+    def _run(self):
+        while True:
+            job, lane = self.queue.get()
+            if self._process(self._drain(job, lane), lane) or self._stopping:
+                break
         # Ensure connection is closed
         self.conn.close()
 
-    def push(self, fn, owner: str, *args, **kwargs):
-        """Push to worker"""
+    def submit(self, fn, owner: str, *args, **kwargs) -> Future:
+        """Queue a job without waiting for it, returns its future. Jobs submitted
+        from the worker thread itself run right away."""
+        if current_thread() is self.worker:
+            fut = Future()
+            self._execute((fn, owner, args, kwargs, fut))
+            return fut
         if not self.accepting.is_set() or self._closing:
+            self.metrics.refused["rejected"] += 1
             exc = Rejection("Cannot push during shutdown")
             exc.add_note(f"Caller: {fn}")
             raise exc
+        options = job_options.get()
+        deadline = None if options.timeout is None else monotonic() + options.timeout
         fut = Future()
+        self.queue.put((fn, owner, args, kwargs, fut), options.priority, deadline)
+        return fut
+
+    def push(self, fn, owner: str, *args, **kwargs):
+        """Push to worker"""
+        return self.submit(fn, owner, *args, **kwargs).result()  # blocks until worker finishes
+
+    @staticmethod
+    @contextmanager
+    def options(priority: int | Lane | None = None, timeout: float | None = None):
+        """Priority lane ("interactive", "normal" or "bulk") and queueing timeout of
+        jobs submitted within the block. Jobs still queued `timeout` seconds after
+        submission fail with `DeadlineExceeded`."""
+        current = job_options.get()
+        token = job_options.set(
+            JobOptions(
+                current.priority if priority is None else lane_of(priority),
+                current.timeout if timeout is None else timeout,
+            )
+        )
         try:
-            self.queue.put((fn, owner, args, kwargs, fut))
-        except ShutDown:
-            fut.set_result(None)
-            return fut.result()
-        return fut.result()  # blocks until worker finishes
+            yield
+        finally:
+            job_options.reset(token)
+
+    def telemetry(self):
+        """Snapshot of queue depth, queue wait per lane, execution time per owner
+        and operation, commit time and refused job counts. Times are in seconds."""
+        return self.metrics.snapshot()
 
     @property
     def is_closed(self):
@@ -121,14 +335,16 @@ class Worker:
 
     def close(self, push=True):
         """Close this worker"""
-        if self._closing:
+        if self._closing or self._pid != getpid():
+            # A forked child inherits no worker thread, there's nothing to stop
             return
         self._closing = True
         self.event.clear()
+        self.metrics.stop()
+        # Push a close signal to the queue, the worker blocks on it otherwise
+        fut = Future()
+        self.queue.put((None, "connection", (), {}, fut), force=True)
         if push:
-            # Push a close signal to the queue
-            fut = Future()
-            self.queue.put((lambda: None, "connection", (), {}, fut))
             fut.result()
         self.worker.join()
 
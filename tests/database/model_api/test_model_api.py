@@ -1,11 +1,14 @@
 """Model API tests"""
 
+from dataclasses import dataclass, field
+from typing import ClassVar
 from uuid import UUID, uuid4
 from pytest import raises
-from sqlite_database import Database, model, Primary, Unique, BaseModel
-from sqlite_database.models import hook, validate
+from sqlite_database import Database, model, Primary, Unique, Foreign, BaseModel, integer, text
+from sqlite_database.models import hook, validate, IdentityMap, unit_of_work
 from sqlite_database.models.mixin import ScopeMixin, ChunkableMixin
 from sqlite_database.models.errors import ValidationError, NoDataReturnedError
+from sqlite_database.models.query_builder import MGR_REQ
 
 from ..setup import setup_model_api
 
@@ -262,3 +265,223 @@ def test_model_api_custom_id():
         username: str
 
     assert Users.create(uid="1", username='admin')
+
+
+def test_model_identity_map():
+    """Test Model API identity map"""
+
+    db = Database(":memory:")
+    db.foreign_pragma("ON")
+
+    Users, Posts = setup_model_api(db)
+    Users.__identity__ = Posts.__identity__ = identities = IdentityMap(size=2)
+    admin = Users.create(id="0", username="admin")
+    post = Posts.create(id="0", user_id="0", title="Hello", content="World")
+
+    assert Users.first(id="0") is admin
+    assert Posts.belongs_to(post, Users) is admin
+    assert identities.stats()["hits"] == 2
+    assert Users.where(username="admin").fetch_one() is admin
+    assert Users.all() == [admin] and Users.all()[0] is admin
+
+    admin.update(username="root")
+    assert Users.first(id="0") is admin and admin.username == "root"
+    Users.where(id="0").patch(username="admin")
+    assert Users.first(id="0") is not admin
+    assert Users.first(id="0").username == "admin"  # type: ignore
+
+    Users.create(id="1", username="guest")
+    Users.create(id="2", username="other")
+    assert len(identities) == 2
+
+    Users.first(id="0").delete()  # type: ignore
+    assert len(identities) == 0
+    assert Users.first(id="0") is None
+    assert Posts.first(id="0") is None, "Cascaded delete must not be served from memory"
+
+    Users.__identity__ = None
+    with unit_of_work() as unit:
+        guest = Users.first(id="1")
+        assert Users.first(id="1") is guest
+        assert guest in unit
+    assert Users.first(id="1") is not guest
+
+
+def test_model_eager_loading():
+    """Test Model API eager loading"""
+
+    db = Database(":memory:")
+
+    Users, Posts = setup_model_api(db)
+
+    @model(db)
+    class Profiles(BaseModel):
+        __schema__ = (
+            Primary("id"),
+            Unique("owner"),
+            Foreign("owner", Users).named("account").inverse("profile"),
+        )
+        id: str
+        owner: str
+        bio: str
+
+    Users.bulk_create([{"id": str(i), "username": f"user{i}"} for i in range(3)])
+    Posts.bulk_create([
+        {"id": str(i), "user_id": str(i % 2), "title": f"Post {i}", "content": ""}
+        for i in range(5)
+    ])
+    Profiles.create(id="0", owner="0", bio="Admin")
+
+    statements = []
+    db.sql.set_trace_callback(statements.append)
+    posts = Posts.query().with_("user.posts", "user.profile").fetch()
+    assert len(statements) == 4, "One query for posts, one per relation"
+    assert all(post.user.id == post.user_id for post in posts)  # type: ignore
+    assert [post.id for post in posts[0].user.posts] == ["0", "2", "4"]  # type: ignore
+    assert posts[0].user.profile.bio == "Admin"  # type: ignore
+    assert posts[1].user.profile is None  # type: ignore
+
+    user = Users.where(id="2").with_("posts", "profile").fetch_one()
+    assert user.posts == [] and user.profile is None  # type: ignore
+    profile = Profiles.query().with_("account").fetch_one()
+    assert profile.account.username == "user0"  # type: ignore
+    db.sql.set_trace_callback(None)
+
+    assert Users.first(id="0").has_one(Profiles) == profile  # type: ignore
+    with raises(ValueError):
+        Users.query().with_("comments").fetch()
+
+
+def test_model_aggregates():
+    """Test Model API relationship aggregates"""
+
+    db = Database(":memory:")
+
+    Users, Posts = setup_model_api(db)
+
+    @model(db)
+    class Orders(BaseModel):
+        __schema__ = (Primary("id"), Foreign("user_id", Users))
+        id: int
+        user_id: str
+        amount: int
+
+    Users.bulk_create([{"id": str(i), "username": f"user{i}"} for i in range(3)])
+    Posts.bulk_create([
+        {"id": str(i), "user_id": "0", "title": f"Post {i}", "content": ""} for i in range(3)
+    ])
+    Orders.bulk_create([{"id": i, "user_id": str(i % 2), "amount": 10 * i} for i in range(4)])
+
+    statements = []
+    db.sql.set_trace_callback(statements.append)
+    users = (
+        Users.query()
+        .with_count(Posts)
+        .with_sum("orders", "amount", alias="spent")
+        .order_by("id")
+        .fetch()
+    )
+    assert len(statements) == 1
+    assert [(user.posts_count, user.spent) for user in users] == [(3, 20), (0, 40), (0, 0)]  # type: ignore
+    db.sql.set_trace_callback(None)
+
+    top = Users.query().with_count(Posts).order_by("posts_count", True).fetch_one()
+    assert top.id == "0" and top.posts_count == 3  # type: ignore
+    with raises(ValueError):
+        Posts.query().with_count(Users)
+
+
+def test_model_hydration():
+    """Test Model API hydration from tuple rows"""
+
+    db = Database(":memory:")
+
+    @model(db)
+    @dataclass(slots=True)
+    class Items(BaseModel):
+        __schema__ = (Primary("id"),)
+        id: int
+        name: str
+
+        def __post_init__(self):
+            self.name = self.name.title()
+
+    db.table("items").insert_many([{"id": i, "name": f"item {i}"} for i in range(3)])
+    items = Items.query().order_by("id").fetch()
+    assert [item.name for item in items] == ["Item 0", "Item 1", "Item 2"]
+    assert Items.first(id=2) == Items(id=2, name="item 2")
+
+    db.create_table("legacy", [integer("id").primary(), text("name")])
+    db.table("legacy").insert({"id": 1, "name": "old"})
+
+    @model(db)
+    class Legacy(BaseModel):
+        __table_name__ = "legacy"
+        __schema__ = (Primary("id"),)
+        id: int
+        name: str
+        tags: list = field(default_factory=list)
+
+    legacy = Legacy.first(id=1)
+    assert legacy.tags == [] and legacy.tags is not Legacy(id=2, name="").tags  # type: ignore
+
+    @model(db)
+    class Broken(BaseModel):
+        __table_name__ = "legacy"
+        __schema__ = (Primary("id"),)
+        id: int
+        name: str
+        note: str
+
+    with raises(TypeError) as exc:
+        Broken.all()
+    assert MGR_REQ in exc.value.__notes__
+
+
+def test_model_dirty_tracking():
+    """Test Model API dirty tracking and save()"""
+
+    db = Database(":memory:")
+
+    Users, _ = setup_model_api(db)
+    Users.create(id="0", username="admin")
+    user = Users.first(id="0")
+    assert not user.is_dirty() and user.changes() == {}  # type: ignore
+
+    statements = []
+    db.sql.set_trace_callback(statements.append)
+    user.save()  # type: ignore
+    user.update(username="admin")  # type: ignore
+    assert not statements, "Nothing changed, nothing to write"
+
+    user.username = "root"  # type: ignore
+    assert user.is_dirty("username") and not user.is_dirty("is_active")  # type: ignore
+    assert user.changes() == {"username": "root"}  # type: ignore
+    user.save()  # type: ignore
+    assert statements[1] == "update users set username='root' where id='0'"
+    assert not user.is_dirty()  # type: ignore
+    db.sql.set_trace_callback(None)
+    assert Users.first(id="0").username == "root"  # type: ignore
+
+    user.id = "1"  # type: ignore
+    user.save()  # type: ignore
+    assert Users.first(id="0") is None and Users.first(id="1") == user
+
+    guest = Users(id="2", username="guest")
+    assert guest.is_dirty()
+    guest.save()
+    assert not guest.is_dirty() and Users.first(id="2") == guest
+
+    @model(db)
+    class Notes(BaseModel):  # pylint: disable=unused-variable
+        """Notes, with a class variable that is no column"""
+
+        __schema__ = (Primary("id"),)
+        kind: ClassVar[str] = "note"
+        id: str
+        body: str
+
+    note = Notes(id="1", body="a")
+    assert note.changes() == {"id": "1", "body": "a"}
+    note.save()
+    assert Notes.first(id="1") == note
@@ -1,14 +1,26 @@
 """Test other features"""
 
-from sqlite3 import OperationalError
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.connection import AuthenticationError
+from pickle import dumps, loads
+from sqlite3 import IntegrityError, OperationalError
 from random import randint
+from threading import Event, Thread
+from time import sleep
 
-from pytest import raises
+from pytest import mark, raises
 from sqlite_database import Database, integer, text
+from sqlite_database.errors import DatabaseMissingError, DeadlineExceeded, Rejection
+from sqlite_database.operators import op
 from sqlite_database.workers import DatabaseWorker
+from sqlite_database.workers.coordinator import CoordinatedDatabase, WriterCoordinator
+from sqlite_database.workers.scheduler import BULK, INTERACTIVE, JobQueue
 from sqlite_database.index import Index
+from sqlite_database.pool import PooledDatabase
 
-from ..setup import setup_database_fns, setup_database, count
+from ..setup import setup_database_fns, setup_database, count, temp_dir
 
 
 def test_function_count():
@@ -91,3 +103,494 @@ def test_index():
                            index.index_columns) is None, "Index should be created"
     t.select_one()
     assert db.delete_index(index) is None, "Index should be destroyed"
+
+
+def test_pooled_database():
+    """Test pooled database routes reads to readers"""
+    db = PooledDatabase(temp_dir / "pooled.db", readers=2)  # type: ignore
+    t = db.create_table("t", [integer("a")])
+    t.insert_many([{"a": a} for a in range(100)])
+
+    def worker(_):
+        return len(t.select())
+
+    with ThreadPoolExecutor(4) as pool:
+        assert list(pool.map(worker, range(8))) == [100] * 8
+    assert db.readers is not None and 0 < db.readers.opened <= 2
+
+    with t:
+        t.insert({"a": 100})
+        assert t.count() == 101
+    assert t.count() == 101
+    db.close()
+
+
+def test_pooled_thread_readers():
+    """Per-thread readers, transactions don't hold up other threads' reads"""
+    db = PooledDatabase(temp_dir / "pooled-thread.db", readers="thread")  # type: ignore
+    t = db.create_table("t", [integer("a")])
+    t.insert_many([{"a": a} for a in range(100)])
+
+    with ThreadPoolExecutor(4) as pool:
+        assert list(pool.map(lambda _: len(t.select()), range(16))) == [100] * 16
+        assert db.readers is not None and 1 <= db.readers.opened <= 4
+        with t:
+            t.insert({"a": 100})
+            assert pool.submit(t.count).result(timeout=5) == 100
+            assert t.count() == 101
+    assert t.count() == 101
+    db.close()
+
+
+def test_pooled_readers_released():
+    """Readers of ended threads are closed, scans don't use pooled readers"""
+    db = PooledDatabase(temp_dir / "pooled-released.db", readers="thread")  # type: ignore
+    t = db.create_table("t", [integer("a")])
+    t.insert_many([{"a": a} for a in range(100)])
+    threads = [Thread(target=t.select) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert db.readers is not None and db.readers.opened == 0
+    for _ in range(10):
+        assert t.parallel_scan(workers=2, fn=len) == 100
+    assert db.readers.opened == 1  # Of this thread, which plans the scans
+    db.close()
+
+
+def test_handle_state_per_thread():
+    """auto_commit and uncommitted writes of a handle stay in their thread"""
+    db = PooledDatabase(temp_dir / "handle-state.db", readers=2)  # type: ignore
+    t = db.create_table("t", [integer("a")])
+    t.auto_commit = False
+    t.insert({"a": 1})
+    with ThreadPoolExecutor(1) as pool:
+        assert pool.submit(lambda: t.auto_commit).result() is True
+        assert pool.submit(t.count).result() == 0
+    assert t.auto_commit is False and t.count() == 1
+    t.commit()
+    t.auto_commit = True
+    db.close()
+
+
+def test_pooled_transaction_isolation():
+    """Selects from other threads never commit a running transaction"""
+    db = PooledDatabase(temp_dir / "pooled-tx.db", readers=2)  # type: ignore
+    t = db.create_table("t", [integer("a")])
+    t.insert_many([{"a": a} for a in range(100)])
+    started = Event()
+    seen = []
+
+    def reader():
+        started.wait()
+        seen.append(len(t.select()))
+
+    thread = Thread(target=reader)
+    thread.start()
+    with raises(ZeroDivisionError):
+        with t:
+            t.insert({"a": 100})
+            started.set()
+            sleep(0.1)
+            raise ZeroDivisionError
+    thread.join()
+    assert seen == [100]
+    assert t.count() == 100
+    db.close()
+
+
+def test_table_handle_cache():
+    """Known tables skip the schema queries until a write, handles are not shared"""
+    db = Database(temp_dir / "handles.db")  # type: ignore
+    t = db.create_table("t", [integer("a"), text("b")])
+    queries = []
+    db.sql.set_trace_callback(queries.append)
+    handle = db.table("t")
+    assert handle is not t and handle.columns() == t.columns()
+    assert not queries
+    handle.auto_commit = False
+    assert db.table("t").auto_commit is True
+    handle.auto_commit = True
+    assert [column.name for column in db.table("t", t.columns()[:1]).columns()] == ["a"]
+    assert len(db.table("t").columns()) == 2
+    t.insert({"a": 1, "b": "x"})
+    queries.clear()
+    db.table("t")
+    assert queries == ["PRAGMA schema_version"]
+    db.sql.set_trace_callback(None)
+    t.add_column(integer("c").allow_null())
+    assert len(db.table("t").columns()) == 3
+    db.rename_table("t", "u")
+    with raises(DatabaseMissingError):
+        db.table("t")
+    other = Database(temp_dir / "handles.db")  # type: ignore
+    other.create_table("v", [integer("a")])
+    assert [table.name for table in db.tables()] == ["u", "v"]
+    db.delete_table("u")
+    assert [table.name for table in db.tables()] == ["v"]
+    with raises(DatabaseMissingError):
+        db.table("u")
+    other.close()
+    db.close()
+
+
+def test_snapshot():
+    """Selects within a snapshot see one state, writers are not blocked"""
+    db = PooledDatabase(temp_dir / "snapshot.db", readers=2)  # type: ignore
+    t = db.create_table("t", [integer("a")])
+    t.insert_many([{"a": a} for a in range(10)])
+    with db.snapshot():
+        assert t.count() == 10
+        t.insert({"a": 10})
+        with ThreadPoolExecutor(1) as pool:
+            assert pool.submit(t.count).result() == 11
+        with db.snapshot():
+            assert t.count() == 10
+        assert len(t.select()) == 10
+        with t:
+            assert t.count() == 11
+    assert t.count() == 11
+    with raises(ValueError):
+        with Database(":memory:").snapshot():
+            pass
+    db.close()
+
+
+def test_worker_submit():
+    """Submitted operations are queued and waited for once"""
+    db = DatabaseWorker(":memory:")
+    t = db.create_table("t", [integer("a")])
+    futures = [t.submit("insert", {"a": a}) for a in range(200)]
+    assert [fut.result() for fut in futures] == list(range(1, 201))
+    assert db.submit(lambda: t.count()).result() == 200
+    with raises(AttributeError):
+        t.submit("_write")
+    assert Database(":memory:").create_table("t", [integer("a")]).submit("count").result() == 0
+    db.close()
+
+
+def test_worker_single_hop():
+    """Table operations reach the worker as a single job"""
+    db = DatabaseWorker(":memory:")
+    t = db.create_table("t", [integer("a")])
+    worker = db.sql._real  # pylint: disable=protected-access
+    submit = worker.submit
+    jobs = []
+
+    def spy(fn, owner, *args, **kwargs):
+        jobs.append(owner)
+        return submit(fn, owner, *args, **kwargs)
+
+    worker.submit = spy
+    try:
+        t.insert({"a": 1})
+        t.commit()
+        jobs.clear()
+        assert t.select_one({"a": 1}).a == 1
+        assert t.select() == [{"a": 1}]
+        assert t.insert({"a": 2}) == 2
+        assert jobs == ["operation"] * 3
+    finally:
+        worker.submit = submit
+        db.close()
+
+
+def test_worker_stream():
+    """Worker-backed streaming yields bounded chunks"""
+    db = DatabaseWorker(":memory:")
+    t = db.create_table("t", [integer("a")])
+    t.insert_many([{"a": a} for a in range(1050)])
+    chunks = list(t.stream(size=100))
+    assert [len(chunk) for chunk in chunks] == [100] * 10 + [50]
+    assert [row.a for chunk in chunks for row in chunk] == list(range(1050))
+
+    stream = t.stream({"a": op < 300}, size=100)
+    assert len(next(stream)) == 100
+    assert t.insert({"a": -1}) == 1051  # the worker isn't held up by the stream
+    stream.close()
+    with raises(OperationalError):
+        next(t.stream({"nothing": None}))
+    db.close()
+
+    memory = Database(":memory:").create_table("t", [integer("a")])
+    memory.insert_many([{"a": a} for a in range(10)])
+    assert [len(chunk) for chunk in memory.stream(size=4)] == [4, 4, 2]
+
+
+def test_pooled_stream_holds_nothing():
+    """A suspended stream holds neither the write lock nor a pooled reader"""
+    db = PooledDatabase(temp_dir / "pooled-stream.db", readers=1)  # type: ignore
+    t = db.create_table("t", [integer("a")])
+    t.insert_many([{"a": a} for a in range(100)])
+    with ThreadPoolExecutor(1) as pool:
+        stream = t.stream(size=10)
+        assert len(next(stream)) == 10
+        assert pool.submit(t.count).result(timeout=5) == 100
+        t.auto_commit = False  # Reads now go to the writer
+        t.insert({"a": 100})
+        writer_stream = t.stream(size=10)
+        assert len(next(writer_stream)) == 10
+        assert pool.submit(t.insert, {"a": 101}).result(timeout=5) == 102
+        writer_stream.close()
+        assert sum(map(len, stream)) == 90
+        t.commit()
+        t.auto_commit = True
+    assert t.count() == 102
+    db.close()
+
+
+def test_worker_overload():
+    """Bounded worker queues reject, drop and expire jobs"""
+    db = DatabaseWorker(":memory:", max_queue=2, overload="drop")
+    t = db.create_table("t", [integer("a")])
+    gate = Event()
+    blocked = db.submit(gate.wait)
+    while not db.sql._real.queue.empty():  # pylint: disable=protected-access
+        sleep(0.001)
+
+    try:
+        with db.options(priority=BULK):
+            dropped = t.submit("insert", {"a": 0})
+        kept = t.submit("insert", {"a": 1})
+        with db.options(timeout=0.01):
+            expired = t.submit("insert", {"a": 2})  # evicts the low priority job
+        with raises(Rejection):
+            t.submit("insert", {"a": 3})
+        sleep(0.02)
+    finally:
+        gate.set()
+    assert blocked.result() is True
+    assert isinstance(dropped.exception(), Rejection)
+    assert kept.result() == 1
+    assert isinstance(expired.exception(), DeadlineExceeded)
+    assert t.select(what="a") == [1]
+    db.close()
+
+
+def test_worker_lanes():
+    """Interactive jobs overtake queued bulk work"""
+    db = DatabaseWorker(":memory:")
+    t = db.create_table("t", [integer("a")])
+    gate = Event()
+    db.submit(gate.wait)
+    try:
+        with db.options(priority="bulk"):
+            bulk = [t.submit("insert_many", [{"a": a} for a in range(1200)]) for _ in range(3)]
+        with db.options(priority="interactive"):
+            lookup = t.submit("count")
+    finally:
+        gate.set()
+    assert lookup.result() == 0
+    assert [fut.result() for fut in bulk] == [None] * 3
+    assert t.count() == 3600
+    stats = db.wait_stats()
+    assert stats["interactive"]["count"] == 1 and stats["bulk"]["count"] >= 3
+    db.close()
+
+
+def test_worker_lanes_preempt_batch():
+    """Interactive jobs queued during a bulk batch run before the rest of it"""
+    db = DatabaseWorker(":memory:")
+    order, first, started, second = [], Event(), Event(), Event()
+    db.submit(first.wait)
+    with db.options(priority="bulk"):
+        bulk = [db.submit(lambda: started.set() or second.wait() and order.append("bulk"))]
+        bulk += [db.submit(order.append, "bulk") for _ in range(2)]
+    first.set()
+    started.wait()
+    with db.options(priority="interactive"):
+        lookup = db.submit(order.append, "interactive")
+    second.set()
+    lookup.result()
+    for fut in bulk:
+        fut.result()
+    assert order == ["bulk", "interactive", "bulk", "bulk"]
+    db.close()
+
+
+def test_worker_lanes_aging():
+    """Queued bulk jobs gain priority while waiting"""
+    queue = JobQueue(aging=0.05)
+    bulk, interactive = (None, "job", (), {}, None), (None, "job", (), {}, None)
+    queue.put(bulk, BULK)
+    sleep(0.15)
+    queue.put(interactive, INTERACTIVE)
+    assert queue.get() == (bulk, BULK)
+    strict = JobQueue(aging=None)
+    strict.put(bulk, BULK)
+    sleep(0.01)
+    strict.put(interactive, INTERACTIVE)
+    assert strict.get() == (interactive, INTERACTIVE)
+
+
+def test_worker_telemetry():
+    """Worker telemetry snapshots"""
+    reports = []
+    db = DatabaseWorker(":memory:", on_telemetry=reports.append, telemetry_interval=0.01)
+    t = db.create_table("t", [integer("a")])
+    t.insert_many([{"a": a} for a in range(10)])
+    t.commit()
+    assert t.select_one({"a": 1}).a == 1
+    snapshot = db.telemetry()
+    assert snapshot["execution"]["operation.insert"]["count"] == 1
+    assert snapshot["execution"]["operation.select"]["count"] == 1
+    assert snapshot["commit"]["count"] >= 1
+    assert snapshot["depth"]["count"] >= 3
+    assert snapshot["wait"]["normal"]["count"] >= 3
+    assert snapshot["refused"] == {"rejected": 0, "dropped": 0, "expired": 0}
+    hist = snapshot["execution"]["operation.select"]
+    assert 0 < hist["p50"] <= hist["p99"] <= hist["max"]
+    sleep(0.05)
+    db.close()
+    assert reports and set(reports[-1]) == set(snapshot)
+
+
+def test_worker_process():
+    """Test process based worker"""
+
+    db = DatabaseWorker(":memory:", worker_type="process", shm_threshold=1024)
+    t = db.create_table("t", [integer("a"), text("b")])
+    t.insert_many([{"a": a, "b": "x" * 32} for a in range(200)])
+    t.commit()
+    assert t.select_one({"a": 1}).b == "x" * 32
+    assert len(t.select()) == 200  # travels through shared memory
+    assert [len(chunk) for chunk in t.stream(size=64)] == [64, 64, 64, 8]
+    assert db.foreign_pragma() == {"foreign_keys": 0}
+    with raises(OperationalError):
+        t.select({"nothing": None})
+    for unsupported in (db.telemetry, db.wait_stats, db.options):
+        with raises(TypeError):
+            unsupported()
+    with raises(TypeError):
+        t.submit("count")
+    db.close()
+
+
+def test_worker_process_exited():
+    """Requests to a dead worker process are rejected instead of hanging"""
+    db = DatabaseWorker(":memory:", worker_type="process")
+    t = db.create_table("t", [integer("a")])
+    db.sql.worker.process.kill()
+    db.sql.worker.process.join()
+    db.sql.worker._threads[1].join(5)  # The receiver, pylint: disable=protected-access
+    with raises(Rejection):
+        t.count()
+    db.close()
+
+
+def test_worker_coalescing():
+    """Bursts of writes share transactions, failures stay per job"""
+    db = DatabaseWorker(temp_dir / "worker-coalesce.db")  # type: ignore
+    t = db.create_table("t", [integer("a").primary()])
+    t.insert({"a": -1})
+
+    def writer(offset):
+        failed = 0
+        for a in range(50):
+            try:
+                t.insert({"a": offset * 50 + a})
+            except IntegrityError:
+                failed += 1
+        # A duplicate key only fails its own insert
+        with raises(IntegrityError):
+            t.insert({"a": -1})
+        return failed
+
+    with ThreadPoolExecutor(8) as pool:
+        assert sum(pool.map(writer, range(8))) == 0
+    assert t.count() == 401
+    db.close()
+
+
+def _insert_rows(table, start):
+    table.insert_many([{"a": a} for a in range(start, start + 10)])
+    return table.count()
+
+
+def test_pickle_table():
+    """Tables pickle as path and options, and reconnect in pool processes"""
+    db = PooledDatabase(temp_dir / "pickled.db", readers=2)  # type: ignore
+    t = db.create_table("t", [integer("a")])
+    t.insert({"a": -1})
+    copy = loads(dumps(t))
+    assert copy._db is not db  # pylint: disable=protected-access
+    assert loads(dumps(t))._db is copy._db  # pylint: disable=protected-access
+    assert copy.count() == 1
+    with raises(TypeError):
+        dumps(Database(":memory:"))
+
+    with ProcessPoolExecutor(2, mp_context=get_context("spawn")) as pool:
+        counts = list(pool.map(_insert_rows, [t] * 3, range(0, 30, 10)))
+    assert sorted(counts)[-1] == 31
+    assert t.count() == 31
+    copy._db.close()  # pylint: disable=protected-access
+    db.close()
+
+
+def _forked_insert(table, done):
+    table.insert({"a": 1})
+    done.put(table.count())
+
+
+@mark.skipif(not hasattr(os, "fork"), reason="fork() is not available")
+def test_fork_reconnects():
+    """A forked child opens its own connections instead of the parent's"""
+    db = PooledDatabase(temp_dir / "forked.db", readers=2)  # type: ignore
+    t = db.create_table("t", [integer("a")])
+    t.insert({"a": 0})
+    assert t.count() == 1
+    context = get_context("fork")
+    done = context.Queue()
+    process = context.Process(target=_forked_insert, args=(t, done))
+    process.start()
+    assert done.get(timeout=10) == 2
+    process.join(10)
+    assert process.exitcode == 0
+    assert t.count() == 2
+    db.close()
+
+
+def test_writer_coordinator_default_key():
+    """Without an authkey, clients of the same user use a generated one"""
+    path = temp_dir / "coordinated-key.db"
+    address = str(temp_dir / "coordinated-key.sock")
+    with WriterCoordinator(path, address):  # type: ignore
+        assert os.stat(address).st_mode & 0o777 == 0o600
+        assert os.stat(f"{address}.key").st_mode & 0o777 == 0o600
+        client = CoordinatedDatabase(path, address)  # type: ignore
+        client.create_table("t", [integer("a")]).insert({"a": 1})
+        assert client.table("t").count() == 1
+        with raises(AuthenticationError):
+            CoordinatedDatabase(path, address, b"wrong")  # type: ignore
+        client.close()
+    assert not os.path.exists(f"{address}.key")
+
+
+def _coordinated_insert(table, start):
+    table.insert_many([{"a": a} for a in range(start, start + 10)])
+    return table.count()
+
+
+def test_writer_coordinator():
+    """Writes of several clients and processes are run by a single coordinator"""
+    path = temp_dir / "coordinated.db"
+    with WriterCoordinator(path, str(temp_dir / "coordinated.sock"), b"secret") as coordinator:  # type: ignore
+        clients = [CoordinatedDatabase(path, coordinator.address, b"secret") for _ in range(2)]  # type: ignore
+        t = clients[0].create_table("t", [integer("a").primary()])
+        tables = [client.table("t") for client in clients]
+
+        def writer(offset):
+            for a in range(20):
+                tables[offset % 2].insert({"a": offset * 20 + a})
+
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(writer, range(4)))
+        assert t.count() == tables[1].count() == 80
+        with raises(IntegrityError):
+            t.insert({"a": 0})
+        with ProcessPoolExecutor(2, mp_context=get_context("spawn")) as pool:
+            assert max(pool.map(_coordinated_insert, [t] * 2, (100, 200))) == 100
+        assert coordinator.telemetry()["execution"]["operation.insert"]["count"] >= 81
+        for client in clients:
+            client.close()
@@ -1,5 +1,6 @@
 """Test Table API select"""
 
+from pytest import raises
 from sqlite_database import Database, text, integer
 from sqlite_database.operators import op, eq
 
@@ -100,3 +101,75 @@ def test_paginate_select():
 
     for i in nums.paginate_select():
         assert i
+
+
+def test_parallel_scan():
+    """Test parallel rowid range scans"""
+    db = Database(temp_dir / "test-scan.db")  # type: ignore
+    items = db.create_table("items", [text("name"), integer("quantity")])
+    items.insert_many([{"name": "a", "quantity": a} for a in range(1000)])
+
+    rows = items.parallel_scan(workers=4)
+    assert [row.quantity for row in rows] == list(range(1000))
+    assert items.parallel_scan({"quantity": op >= 500}, workers=3, fn=len) == 500
+    total = items.parallel_scan(
+        workers=4, what=("quantity",), fn=lambda rows: sum(row.quantity for row in rows)
+    )
+    assert total == sum(range(1000))
+    assert items.parallel_scan(workers=2, fn=len, backend="process") == 1000
+    assert Database(":memory:").create_table("t", [integer("a")]).parallel_scan() is None
+
+    with items:
+        items.insert({"name": "b", "quantity": 1000})
+        assert items.parallel_scan(workers=4, fn=len) == 1001
+        with raises(ValueError):
+            items.parallel_scan(backend="process")
+    assert items.parallel_scan(workers=4, fn=len) == 1001
+
+    memory = Database(":memory:").create_table("t", [integer("a")])
+    memory.insert_many([{"a": a} for a in range(100)])
+    assert [row.a for row in memory.parallel_scan(workers=3)] == list(range(100))
+
+
+def test_result_cache():
+    """Cached results are dropped by local writes and commits of other connections"""
+    db = Database(temp_dir / "result-cache.db")  # type: ignore
+    t = db.create_table("cached", [integer("id").primary(), text("name")])
+    t.insert_many([{"id": i, "name": f"n{i}"} for i in range(10)])
+    cache = t.enable_cache(size=2)
+
+    assert len(t.select({"id": op < 5})) == 5
+    assert t.select_one({"id": 1}).name == "n1"
+    assert db.table("cached").select({"id": op < 5}) == t.select({"id": op < 5})
+    assert cache.stats()["hits"] == 2
+
+    t.update({"id": 1}, {"name": "one"})
+    assert t.select_one({"id": 1}).name == "one"
+    other = Database(temp_dir / "result-cache.db")  # type: ignore
+    other.table("cached").update({"id": 1}, {"name": "uno"})
+    assert t.select_one({"id": 1}).name == "uno"
+    with t:
+        t.delete({"id": 1})
+        assert not t.select_one({"id": 1})
+    assert len(t.select()) == 9
+    assert cache.stats()["hits"] == 2
+    t.disable_cache()
+    other.close()
+    db.close()
+
+
+def test_result_cache_cascade():
+    """Writes empty the result caches of other tables, reached by cascades"""
+    db = Database(":memory:")
+    db.foreign_pragma("ON")
+    parents = db.create_table("parents", [integer("id").primary()])
+    children = db.create_table(
+        "children", [integer("id").primary(), integer("pid").foreign("parents/id")]
+    )
+    parents.insert({"id": 1})
+    children.insert({"id": 1, "pid": 1})
+    children.enable_cache()
+    assert len(children.select()) == 1
+    parents.delete({"id": 1})
+    assert not children.select()
+    db.close()
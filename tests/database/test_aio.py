@@ -0,0 +1,77 @@
+"""Test asyncio API"""
+
+from asyncio import run, sleep, wait_for, TimeoutError as AsyncTimeoutError
+
+from pytest import raises
+from sqlite_database import integer, model, BaseModel, Primary
+from sqlite_database.aio import AsyncDatabase
+
+
+def test_async_table():
+    """Test awaitable Table CRUD and async pagination"""
+
+    async def main():
+        async with AsyncDatabase(":memory:") as db:
+            t = await db.create_table("t", [integer("a")])
+            await t.insert_many([{"a": a} for a in range(25)])
+            assert await t.count() == 25
+            assert (await t.select_one({"a": 3})).a == 3
+            pages = [page async for page in t.paginate_select(length=10)]
+            assert [len(page) for page in pages] == [10, 10, 5]
+            early = t.paginate_select(length=10)
+            assert len(await anext(early)) == 10
+            await early.aclose()  # Closes the table's generator too
+            assert await t.delete({"a": 0}) == 1
+
+    run(main())
+
+
+def test_async_several_loops():
+    """The same database can be awaited from consecutive event loops"""
+    db = AsyncDatabase(":memory:", max_pending=1)
+    t = run(db.create_table("t", [integer("a")]))
+    run(t.insert({"a": 1}))
+    assert run(t.count()) == 1
+    run(db.close())
+    assert db.closed
+
+
+def test_async_model():
+    """Test async model queries"""
+
+    async def main():
+        db = AsyncDatabase(":memory:")
+
+        @model(db.database)
+        class Items(BaseModel):  # pylint: disable=unused-variable
+            """Items"""
+            __schema__ = (Primary("id"),)
+            id: int
+            name: str
+
+        Items.bulk_create([{"id": i, "name": f"item{i}"} for i in range(5)])
+        fetched = await db.where(Items, name="item2").fetch_one()
+        assert fetched is not None and fetched.id == 2
+        assert len(await db.query(Items).fetch()) == 5
+        last = await db.query(Items).order_by("id", descending=True).limit(2).fetch()
+        assert [item.id for item in last] == [4, 3]
+        assert await db.where(Items, id=4).count() == 1
+        await db.close()
+
+    run(main())
+
+
+def test_async_cancel_interrupts():
+    """Cancelling a running statement interrupts it"""
+
+    async def main():
+        db = AsyncDatabase(":memory:")
+        slow = ("with recursive c(x) as (select 1 union all select x + 1 from c) "
+                "select count(*) from c")
+        with raises(AsyncTimeoutError):
+            await wait_for(db.run(db.database.sql.execute, slow), 0.2)
+        await sleep(0.05)
+        assert await db.check_table("sqlite_master")
+        await db.close()
+
+    run(main())
@@ -0,0 +1,81 @@
+"""Test database manager"""
+
+from threading import Event, Thread
+
+from pytest import raises
+from sqlite_database import Database, integer
+from sqlite_database.manager import DatabaseManager
+
+from .setup import temp_dir
+
+
+def test_manager_lru():
+    """Tenants open on demand, the least recently used one is closed past the limit"""
+    manager = DatabaseManager(str(temp_dir / "tenant-{tenant}.db"), max_open=2)
+    first = manager.get("a")
+    first.create_table("t", [integer("a")]).insert({"a": 1})
+    assert manager.get("a") is first
+    manager.get("b")
+    manager.get("c")
+    assert first.closed and "a" not in manager and len(manager) == 2
+
+    reopened = manager["a"]
+    assert reopened is not first and reopened.table("t").count() == 1
+    assert manager.stats() == {
+        "open": 2,
+        "hits": 1,
+        "misses": 4,
+        "evictions": 2,
+        "expired": 0,
+        "hit_rate": 0.2,
+    }
+    with raises(ValueError):
+        manager.get("../a")
+    manager.close()
+    assert reopened.closed
+    with raises(ConnectionError):
+        manager.get("a")
+
+
+def test_manager_leases():
+    """Leased databases are kept open, idle ones are closed"""
+    manager = DatabaseManager(str(temp_dir / "lease-{tenant}.db"), max_open=1)
+    with manager.lease("a") as leased:
+        other = manager.get("b")
+        assert not leased.closed and not other.closed
+        manager.get("c")
+        assert other.closed and not leased.closed and len(manager) == 2
+    manager.get("d")
+    assert leased.closed
+    assert manager.close_idle() == 1 and len(manager) == 0
+    assert manager.stats()["expired"] == 1
+
+    with DatabaseManager(str(temp_dir / "idle-{tenant}.db"), idle_timeout=0) as idle:
+        first = idle.get("a")
+        idle.get("b")
+        assert first.closed and len(idle) == 1
+
+
+def test_manager_concurrent_open():
+    """Callers of one tenant share a single open, made without the manager lock"""
+    opening = Event()
+
+    class SlowDatabase(Database):
+        """Database whose open waits until `opening` is set"""
+
+        def __init__(self, path, **kwargs):
+            opening.wait(5)
+            super().__init__(path, **kwargs)
+
+    manager = DatabaseManager(str(temp_dir / "slow-{tenant}.db"), database_class=SlowDatabase)
+    found = []
+    threads = [Thread(target=lambda: found.append(manager.get("a"))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert manager.stats()["open"] == 0  # Not blocked by the opens in progress
+    opening.set()
+    for thread in threads:
+        thread.join()
+    assert len(found) == 3 and found[0] is found[1] is found[2]
+    assert manager.stats()["misses"] == 1 and manager.stats()["hits"] == 2
+    manager.close()
@@ -0,0 +1,60 @@
+"""Test sharded database"""
+
+from pytest import raises
+from sqlite_database import integer, model, BaseModel, Primary
+from sqlite_database.functions import Function
+from sqlite_database.operators import in_
+from sqlite_database.shard import ShardedDatabase
+
+from .setup import temp_dir
+
+SUM = Function("SUM")
+AVG = Function("AVG")
+
+
+def test_sharded_table():
+    """Test routing, fan-out and merging"""
+    db = ShardedDatabase([temp_dir / f"shard{i}.db" for i in range(3)])  # type: ignore
+    items = db.create_table("items", [integer("id").primary(), integer("quantity")])
+    items.insert_many([{"id": i, "quantity": i % 10} for i in range(100)])
+
+    assert all(shard.table("items").count() < 100 for shard in db.shards)
+    assert items.count() == 100
+    assert items.select_one({"id": 42}).quantity == 2
+    assert items.select(what=SUM("quantity")) == sum(i % 10 for i in range(100))
+    assert items.select(what=AVG("quantity")) == 4.5
+    with raises(ValueError):
+        items.select(what=Function("GROUP_CONCAT")("quantity"))
+
+    ordered = items.select(order=("id", "desc"), limit=5, offset=2)
+    assert [row.id for row in ordered] == [97, 96, 95, 94, 93]
+    assert items.select({"id": in_([1, 2, 3])}, "quantity", order=("id", "asc")) == [1, 2, 3]
+    assert [len(page) for page in items.paginate_select(length=40)] == [40, 40, 20]
+
+    assert items.update({"quantity": 0}, {"quantity": 99}) == 10
+    assert items.delete_one({"quantity": 99}) == 1
+    with raises(ValueError):
+        items.delete_one({"quantity": 99}, order=("id", "desc"))
+    assert items.count() == 99
+    db.close()
+
+
+def test_sharded_model():
+    """Test Model API on a sharded database"""
+    db = ShardedDatabase([":memory:", ":memory:"], ranges=[50])
+
+    @model(db)  # type: ignore
+    class Notes(BaseModel):
+        """Notes"""
+        __schema__ = (Primary("id"),)
+        id: int
+        body: str
+
+    Notes.bulk_create([{"id": i, "body": f"note {i}"} for i in range(100)])
+    assert db.shards[0].table("notes").count() == 50
+    note = Notes.first(id=75)
+    assert note is not None and note.body == "note 75"
+    note.update(body="edited")
+    assert Notes.first(id=75).body == "edited"  # type: ignore
+    assert Notes.count() == 100
+    db.close()
@@ -0,0 +1,51 @@
+"""Read scaling benchmark, run it directly: python tests/manual_test_scaling.py
+
+Runs point selects on a PooledDatabase with a reader per thread, for 1, 2, 4 and 8
+threads. On free-threaded builds (3.13t and later) throughput should grow with
+threads, with the GIL it stays roughly flat."""
+# pylint: disable=all
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from os.path import realpath, join
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+sys.path.insert(0, realpath(join(__file__, "../..")))
+
+from sqlite_database import integer, text
+from sqlite_database.pool import PooledDatabase
+
+ROWS = 10_000
+QUERIES = 20_000
+
+
+def run(threads: int, table) -> float:
+    per_thread = QUERIES // threads
+
+    def work(offset: int):
+        for i in range(per_thread):
+            table.select_one({"id": (offset + i) % ROWS})
+
+    start = perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(work, range(threads)))
+    return per_thread * threads / (perf_counter() - start)
+
+
+def main():
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    with TemporaryDirectory() as tmp:
+        db = PooledDatabase(join(tmp, "scaling.db"), readers="thread")
+        table = db.create_table("items", [integer("id").primary(), text("name")])
+        table.insert_many([{"id": i, "name": f"item {i}"} for i in range(ROWS)])
+        base = None
+        for threads in (1, 2, 4, 8):
+            rate = run(threads, table)
+            base = base or rate
+            print(f"{threads} thread(s): {rate:>10.0f} selects/s ({rate / base:.2f}x)")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
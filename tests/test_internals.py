@@ -1,4 +1,7 @@
 # pylint: disable=all
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlite_database.query_builder import build_select
 from sqlite_database.query_builder.table_creation import extract_table
 
 SQL = "CREATE TABLE tbl (row1 text not null, row2 text not null, foreign key (row2) references tbl (row1) on delete cascade on update cascade)"
@@ -11,3 +14,33 @@ def test_query_builder_table_01():
         if col.name == "row2":
             assert col.raw_source == "tbl/row1"
 
+
+
+def test_builder_cache_per_thread():
+    built = build_select("tbl", {"row1": "x"})
+    assert build_select("tbl", {"row1": "x"})[1] is built[1]
+    with ThreadPoolExecutor(1) as pool:
+        other = pool.submit(build_select, "tbl", {"row1": "x"}).result()
+    assert other[1] is not built[1] and list(other[1].values()) == ["x"]
+
+
+def test_schema_introspection():
+    from sqlite_database import Database
+
+    db = Database(":memory:")
+    db.sql.executescript(
+        "create table p (id integer primary key, code text unique);"
+        "create table t (a varchar(20) not null default 'it''s', b integer references p,"
+        " c real default 1.5, e text references p(code) on delete set null, unique(a, c));"
+        "create index ix on t (a, b);"
+    )
+    a, b, c, e = db.table("t").columns()
+    assert (a.type, a.nullable, a.default, a.primary) == ("text", False, "it's", False)
+    assert b.foreign and b.raw_source == "p/id" and b.on_delete == "no action"
+    assert (c.default, e.raw_source, e.on_delete) == (1.5, "p/code", "null")
+    assert [(col.primary, col.unique) for col in db.table("p").columns()] == [(True, False), (False, True)]
+    indexes = {index.index_name: index for index in db.table("t").indexes()}
+    assert indexes["ix"].index_columns == ("a", "b") and not indexes["ix"].index_unique
+    assert any(index.index_columns == ("a", "c") and index.index_unique for index in indexes.values())
+    db.create_index("ix_c", "t", ("c",))
+    assert "ix_c" in [index.index_name for index in db.table("t").indexes()]